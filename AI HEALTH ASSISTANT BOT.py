@@ -1,49 +1,41 @@
-import pandas as pd
-import os
-from thefuzz import process
 from spellchecker import SpellChecker
+from symptom_matcher import SymptomMatcher
+from remedy_store import RemedyStore
 
 CSV_FILE = "health_recommendations.csv"
 
 required_columns = ["Condition","Detected_Disease","Home_Remedy","Meal","What_Not_To_Eat","Sleep","Doctor_Advice , "]
 
-#  Load dataset or create if not exists
-if os.path.exists(CSV_FILE):
-    df = pd.read_csv(CSV_FILE)
-    # Fix missing columns
-    for col in required_columns:
-        if col not in df.columns:
-            df[col] = ""
-else:
-    df = pd.DataFrame(columns=required_columns)
-    df.to_csv(CSV_FILE, index=False)
+#  Load dataset (plus any journaled learned rows) or create if not exists
+store = RemedyStore(CSV_FILE, required_columns)
+df = store.df
 
 # Spell checker
 spell = SpellChecker()
 
+# Condition index, built once; rows are matched by position in df
+matcher = SymptomMatcher(df["Condition"].astype(str).tolist(), spell)
+
 def clean_text(text):
-    words = text.split()
-    corrected = [spell.correction(word) if word not in spell else word for word in words]
-    return " ".join(corrected)
+    return matcher.correct(text)
 
 def chatbot():
-    global df
     print("🤖 AI Health Assistant Ready! Type 'exit' to quit.\n")
 
     while True:
         user_input = input("You: ").strip().lower()
         if user_input == "exit":
+            store.compact()
             print("Bot: Take care! 💙 Goodbye.")
             break
 
         # Auto correct input
         cleaned_input = clean_text(user_input)
 
-        choices = df["Condition"].astype(str).tolist()
-        match, score = process.extractOne(cleaned_input, choices)
+        hit = matcher.lookup(cleaned_input)
 
-        if score > 70:
-            row = df[df["Condition"] == match].iloc[0]
+        if hit is not None:
+            row = df.iloc[hit[0]]
             print(f"\nBot: Based on what you said, it looks like *{row['Detected_Disease']}* 🌿")
             print(f"👉 Home Remedy: {row['Home_Remedy']}")
             print(f"👉 Meal Advice: {row['Meal']}")
@@ -69,8 +61,8 @@ def chatbot():
                     "Sleep": sleep,
                     "Doctor_Advice": doctor
                 }
-                df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-                df.to_csv(CSV_FILE, index=False)
+                store.append(new_row)  # updates df in place
+                matcher.add(cleaned_input)
                 print("Bot: Thanks! I’ll remember this from now on 🌟\n")
             if add == "no":
                 print("Bot: Okay, maybe next time 💡\n")
@@ -0,0 +1,188 @@
+import bisect
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from food_search import FoodSearchIndex
+from instrumentation import timed
+from text_index import IndexCache, tokens
+
+
+# Search over the Compendium of Physical Activities for the Fitness page.
+# Descriptions are tokenized once into an inverted index (token -> sorted
+# row ids) with a sorted token list for prefix lookups, so a query is a few
+# bisects and array intersections instead of a str.contains over every row.
+# Category is a facet: rows carry an integer category code, filters are a
+# mask, and facet counts come from one bincount. Misspelled queries fall
+# back to the trigram index the food search uses.
+#
+# Burn estimates follow the app's formula, MET x hours x body weight (kg),
+# computed for all matches at once. For "how long to burn N kcal", rows are
+# also kept sorted by MET: the activities that take between min and max
+# minutes form one contiguous MET range, found with two searchsorted calls.
+
+MIN_MINUTES = 10
+MAX_MINUTES = 120
+
+
+def burn_kcal(met, minutes, weight):
+    return np.asarray(met, dtype=np.float64) * (minutes / 60.0) * weight
+
+
+class ActivityIndex:
+    def __init__(self, df_ex):
+        self.descriptions = df_ex["Description"].fillna("").astype(str).to_numpy()
+        self.met = pd.to_numeric(df_ex["MET Value"], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+        self.codes = df_ex["Activity Code"].to_numpy() if "Activity Code" in df_ex.columns else np.arange(len(df_ex))
+        categories = df_ex["Category"].fillna("Other").astype(str)
+        self.categories = sorted(categories.unique())
+        self.category_ids = categories.map({c: i for i, c in enumerate(self.categories)}).to_numpy(dtype=np.int32)
+        self.size = len(df_ex)
+
+        postings = defaultdict(list)
+        for i, text in enumerate(self.descriptions):
+            for tok in set(tokens(text)):
+                postings[tok].append(i)
+        self.token_keys = sorted(postings)
+        self.postings = [np.array(postings[t], dtype=np.int32) for t in self.token_keys]
+        # rarer tokens say more about a match
+        df = np.array([len(p) for p in self.postings], dtype=np.float64)
+        self.idf = np.log1p(self.size / df)
+        self.length = np.array([len(t) for t in self.descriptions], dtype=np.float64)
+        self._fuzzy = None
+
+        self.by_met = np.argsort(self.met, kind="stable")
+        self.met_sorted = self.met[self.by_met]
+
+    # ---------------- search ---------------- #
+    def _token_hits(self, token, prefix):
+        """Row ids containing `token` (or a token starting with it) and the best idf among them."""
+        if not prefix:
+            j = bisect.bisect_left(self.token_keys, token)
+            if j < len(self.token_keys) and self.token_keys[j] == token:
+                return self.postings[j], self.idf[j]
+            return np.empty(0, dtype=np.int32), 0.0
+        lo = bisect.bisect_left(self.token_keys, token)
+        hi = bisect.bisect_left(self.token_keys, token + "\uffff")
+        if lo == hi:
+            return np.empty(0, dtype=np.int32), 0.0
+        ids = np.unique(np.concatenate(self.postings[lo:hi]))
+        return ids, float(self.idf[lo:hi].max())
+
+    def category_mask(self, categories):
+        if not categories:
+            return None
+        wanted = [self.categories.index(c) for c in categories if c in self.categories]
+        return np.isin(self.category_ids, wanted)
+
+    def search(self, query, categories=(), k=50):
+        """Row positions matching every word of `query` (as a word or a word
+        prefix, exact words scoring higher), within the given categories, best first. An empty query
+        lists the category's activities. Falls back to fuzzy matching when
+        no row has all the words."""
+        mask = self.category_mask(categories)
+        words = tokens(query)
+        if not words:
+            ids = np.arange(self.size) if mask is None else np.flatnonzero(mask)
+            return ids[:k].tolist()
+
+        scores = np.zeros(self.size, dtype=np.float64)
+        matched = np.zeros(self.size, dtype=np.int32)
+        for word in words:
+            exact, weight = self._token_hits(word, prefix=False)
+            scores[exact] += weight
+            matched[exact] += 1
+            ids, weight = self._token_hits(word, prefix=True)
+            ids = np.setdiff1d(ids, exact, assume_unique=True)
+            scores[ids] += 0.8 * weight
+            matched[ids] += 1
+
+        ok = matched == len(words)
+        if mask is not None:
+            ok &= mask
+        found = np.flatnonzero(ok)
+        if found.size == 0:
+            return self._fuzzy_search(query, mask, k)
+        # descriptions that are mostly the query rank above long ones that merely contain it
+        ranked = scores[found] - self.length[found] / 1000.0
+        order = np.argsort(-ranked, kind="stable")[:k]
+        return found[order].tolist()
+
+    def _fuzzy_search(self, query, mask, k):
+        if self._fuzzy is None:
+            self._fuzzy = FoodSearchIndex(self.descriptions.tolist())
+        hits = self._fuzzy.search(query, k=self.size if mask is not None else k)
+        if mask is not None:
+            hits = [i for i in hits if mask[i]]
+        return hits[:k]
+
+    def facet_counts(self, positions):
+        """{category: matches} over `positions`, for labelling the filter."""
+        counts = np.bincount(self.category_ids[positions], minlength=len(self.categories))
+        return {c: int(n) for c, n in zip(self.categories, counts) if n}
+
+    # ---------------- burn ---------------- #
+    def minutes_to_burn(self, kcal, weight, categories=(), min_minutes=MIN_MINUTES,
+                        max_minutes=MAX_MINUTES, k=10):
+        """Activities that burn `kcal` in min..max minutes, quickest first,
+        with the minutes each one needs."""
+        if kcal <= 0 or weight <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        # minutes = kcal * 60 / (MET * weight), so the minute range is a MET range
+        lo_met = kcal * 60.0 / (weight * max_minutes)
+        hi_met = kcal * 60.0 / (weight * min_minutes)
+        lo = np.searchsorted(self.met_sorted, lo_met, side="left")
+        hi = np.searchsorted(self.met_sorted, hi_met, side="right")
+        rows = self.by_met[lo:hi][::-1]  # highest MET (fewest minutes) first
+        mask = self.category_mask(categories)
+        if mask is not None:
+            rows = rows[mask[rows]]
+        rows = rows[:k]
+        return rows, kcal * 60.0 / (self.met[rows] * weight)
+
+
+_index_cache = IndexCache(ActivityIndex)
+
+
+def get_activity_index(df_ex):
+    return _index_cache.get(df_ex)
+
+
+@timed("activity_search.search")
+def search_activities(df_ex, query, categories=(), minutes=30, weight=70.0, k=50):
+    """Matching activities, best first, with the kcal each burns in `minutes`."""
+    if df_ex is None or df_ex.empty:
+        return pd.DataFrame()
+    index = get_activity_index(df_ex)
+    rows = np.asarray(index.search(query, categories, k=k), dtype=np.int64)
+    return pd.DataFrame({
+        "Activity": index.descriptions[rows],
+        "Category": np.asarray(index.categories)[index.category_ids[rows]],
+        "MET": index.met[rows],
+        "Calories Burnt": np.round(burn_kcal(index.met[rows], minutes, weight), 0),
+        "Activity Code": index.codes[rows],
+    })
+
+
+@timed("activity_search.minutes_to_burn")
+def activities_to_burn(df_ex, kcal, weight, categories=(), max_minutes=MAX_MINUTES, k=10):
+    """The `k` quickest ways to burn `kcal`, as Activity / Category / MET / Minutes."""
+    if df_ex is None or df_ex.empty:
+        return pd.DataFrame()
+    index = get_activity_index(df_ex)
+    rows, minutes = index.minutes_to_burn(kcal, weight, categories, max_minutes=max_minutes, k=k)
+    return pd.DataFrame({
+        "Activity": index.descriptions[rows],
+        "Category": np.asarray(index.categories)[index.category_ids[rows]],
+        "MET": index.met[rows],
+        "Minutes": np.ceil(minutes).astype(int),
+    })
+
+
+def activity_facets(df_ex, query=""):
+    """{category: matches} for `query` across all categories."""
+    if df_ex is None or df_ex.empty:
+        return {}
+    index = get_activity_index(df_ex)
+    return index.facet_counts(np.asarray(index.search(query, k=index.size), dtype=np.int64))
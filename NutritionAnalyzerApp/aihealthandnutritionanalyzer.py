@@ -1,10 +1,6 @@
 import streamlit as st
-import pandas as pd
-import json
-import plotly.express as px
-import plotly.graph_objects as go
-import numpy as np
-from new_backend import FILES,initialize_databases, load_profile, save_profile, get_daily_stats, load_all_databases, show_food_log,show_hydration, show_health_advisor,show_fitness, show_analytics_ad,show_settings,generate_nutrition_plan,show_dashboard
+from new_backend import initialize_databases, load_profile, save_profile
+import views
 
 initialize_databases()
 if "user" not in st.session_state:
@@ -35,11 +31,8 @@ if user is None:
                 st.rerun()
             else:
                 st.error("Please enter your name.")
-else: #Load Databases
-
-    df_food, df_ex, df_sym = load_all_databases()
-
-
+else:
+    # each page loads its own databases when it renders
     st.markdown("""
         <style>
             body {
@@ -61,87 +54,5 @@ else: #Load Databases
     """, unsafe_allow_html=True)
 
 
-    page = st.sidebar.radio(
-        "Navigate",
-        ["🏠 Home", "📝 Input Meal Logs", "📊 Nutrition Plan","🩺 Health Advisor",
-         "💧 Hydration Tracker", "🏋 Exercise Tracker", "📅 Meal Forecasting", "💡 Smart Tips","📊 Analytics","⚙️ Settings"]
-    )
-
-    if page == "🏠 Home":
-        st.title("🤖🩺 AI Health & Nutrition Analyzer")
-        st.write("Personalized health, diet, hydration and exercise recommendations.")
-
-        st.header(f"Welcome! 👋")
-        st.write("""
-        Our AI system generates personalized nutrition plans, hydration tracking,
-        workout suggestions and weekly meal planning based on your profile.
-        PROJECT BY : GROUP 1 SHARFIA, AKASH, AHANA, NOVESH, HARSH.
-        """)
-        st.divider()
-        show_dashboard(user)
-    if page == "📝 Input Meal Logs":
-        show_food_log(df_food)
-
-    if page == "📊 Nutrition Plan":
-        st.header("Your AI-Powered Nutrition Plan")
-        if 'user' not in st.session_state:
-            st.warning("⚠ Please enter your data in Input Page First.")
-        else:
-            plan = generate_nutrition_plan()
-            df = pd.DataFrame({
-                "Nutrient": ["Calories", "Protein (g)", "Carbs (g)", "Fats (g)"],
-                "Target": [plan["Calories"], plan["Protein (g)"], plan["Carbs (g)"], plan["Fats (g)"]]
-            })
-            st.table(df)
-            st.subheader("Personalized Tips")
-            for tip in plan["Tips"]:
-                st.info("💡 " + tip)
-
-    if page =="🩺 Health Advisor":
-        show_health_advisor(user,df_sym)
-
-    if page == "💧 Hydration Tracker":
-        show_hydration(user)
-    if page == "🏋 Exercise Tracker":
-        show_fitness(user, df_ex)
-
-    if page == "📅 Meal Forecasting":
-        st.header("Weekly Balanced Diet & Meal Schedule")
-        schedule = pd.DataFrame({
-            "Day": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
-            "Meals": ["High protein", "Balanced carbs", "Hydration focus", "Fiber rich",
-                      "Lean meat/Paneer", "Cheat lite day", "Fruit + Salad Day"]
-        })
-        st.table(schedule)
-
-    if page == "💡 Smart Tips":
-        st.header("AI Smart Recommendations")
-        tips = [
-            "Drink 2–3 liters of water daily.",
-            "Sleep 7–8 hours for recovery.",
-            "Combine cardio & strength training.",
-            "Avoid sugary drinks.",
-            "Eat whole grains & fresh vegetables."
-        ]
-        for t in tips:
-            st.success("✅ " + t)
-
-
-    if page == "📊 Nutrition Plan":  
-        st.subheader("Search Foods")
-        food_query = st.text_input("Search for a food:", key="food_search")
-        if food_query:
-            results = df_food[df_food["Dish Name"].str.contains(food_query, case=False, na=False)]
-            if results.empty:
-                st.info("No foods found matching your query.")
-            else:
-                st.dataframe(results)
-    if page=="📊 Analytics":
-        show_analytics_ad()
-    if page=="⚙️ Settings":
-        show_settings(user)
-
-
-
-
-
+    page = st.sidebar.radio("Navigate", list(views.PAGES))
+    views.render(page, user)
@@ -0,0 +1,279 @@
+import csv
+import hashlib
+import os
+import re
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import add_bytes, timed
+from reference_data import arrays_to_frame, file_signature, write_npz_table
+from text_index import stem, tokens
+
+
+# Full-text search over the yoga asana corpus (data/final_asan1_1.csv). The
+# CSV has multi-line quoted records and is only a few hundred asanas, so it
+# is parsed once with the csv module, offline, into asana_index.npz: the
+# records plus two inverted indexes in CSR form (sorted terms, offsets,
+# doc ids, term frequencies), one over Benefits and one over
+# Contraindications. The app loads that file the first time someone
+# searches and keeps it for the life of the process.
+#
+#   python asana_index.py build    # rebuild after editing the CSV
+#   python asana_index.py check    # is the committed index current?
+#
+# Benefits are ranked with BM25. Contraindications are a filter: "no high
+# blood pressure" drops every asana whose contraindications mention all of
+# high, blood and pressure. Level is a facet.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(APP_DIR)
+SOURCE_PATH = os.path.join(ROOT, "data", "final_asan1_1.csv")
+INDEX_PATH = os.path.join(APP_DIR, "asana_index.npz")
+
+COLUMNS = ["AID", "Name", "Level", "Description", "Benefits", "Contraindications", "Breathing"]
+FIELDS = ("Benefits", "Contraindications")
+LEVELS = ("Beginner", "Intermediate", "Advanced", "Unspecified")
+_LEVEL_ALIASES = {"beginner": "Beginner", "beginners": "Beginner", "begineer": "Beginner",
+                  "intermediate": "Intermediate", "advanced": "Advanced"}
+
+K1 = 1.2
+B = 0.75
+
+_STOP = frozenset("a an and are as at be by for from in into is it its of on or that the this to with "
+                  "who which should not can may those people".split())
+_NEGATIONS = ("no ", "not ", "without ", "avoid ", "avoiding ")
+
+
+def terms(text):
+    return [stem(t) for t in tokens(text) if t not in _STOP]
+
+
+def clean(text):
+    """Undo the PDF extraction: words hyphenated across lines, hard wraps, blank
+    lines and stray control characters (soft hyphens came through as \\x02)."""
+    text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f]", "", text or "")
+    text = re.sub(r"-\s*\n\s*", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def normalize_level(level):
+    return _LEVEL_ALIASES.get(level.strip().lower(), "Unspecified")
+
+
+# ---------------- build ---------------- #
+def read_asanas(path=SOURCE_PATH):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    records = []
+    for row in rows:
+        name = clean(row["AName"])
+        if not name:
+            continue
+        records.append({"AID": int(row["AID"]), "Name": name.title() if name.isupper() else name,
+                        "Level": normalize_level(row["Level"]), "Description": clean(row["Description"]),
+                        "Benefits": clean(row["Benefits"]), "Contraindications": clean(row["Contraindications"]),
+                        "Breathing": clean(row["Breathing"])})
+    return pd.DataFrame(records, columns=COLUMNS)
+
+
+def invert(texts):
+    """CSR inverted index: sorted terms, offsets into docs/tf, and doc lengths."""
+    postings = {}
+    lengths = np.zeros(len(texts), dtype=np.int32)
+    for doc, text in enumerate(texts):
+        toks = terms(text)
+        lengths[doc] = len(toks)
+        counts = {}
+        for t in toks:
+            counts[t] = counts.get(t, 0) + 1
+        for t, n in counts.items():
+            postings.setdefault(t, []).append((doc, n))
+    vocab = sorted(postings)
+    indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(postings[t]) for t in vocab])
+    pairs = [p for t in vocab for p in postings[t]]
+    docs = np.array([d for d, _ in pairs], dtype=np.int32)
+    tf = np.array([n for _, n in pairs], dtype=np.int16)
+    return {"terms": np.array(vocab, dtype=str), "indptr": indptr, "docs": docs, "tf": tf, "len": lengths}
+
+
+def source_digest(path=SOURCE_PATH):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def write_index(path=INDEX_PATH, source=SOURCE_PATH):
+    df = read_asanas(source)
+    extra = {"__source__": np.array(source_digest(source))}
+    for field in FIELDS:
+        for key, arr in invert(df[field].tolist()).items():
+            extra[f"{field}.{key}"] = arr
+    write_npz_table(path, df, **extra)
+    return df
+
+
+def is_current(path=INDEX_PATH, source=SOURCE_PATH):
+    if not os.path.exists(path):
+        return False
+    with np.load(path, allow_pickle=False) as npz:
+        return "__source__" in npz.files and str(npz["__source__"]) == source_digest(source)
+
+
+# ---------------- search ---------------- #
+class FieldIndex:
+    def __init__(self, arrays):
+        self.terms = arrays["terms"].tolist()
+        self._pos = {t: i for i, t in enumerate(self.terms)}
+        self.indptr = arrays["indptr"]
+        self.docs = arrays["docs"]
+        self.tf = arrays["tf"].astype(np.float64)
+        self.length = arrays["len"].astype(np.float64)
+        n = len(self.length)
+        df = np.diff(self.indptr)
+        self.idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        avg = self.length.mean() if n and self.length.mean() else 1.0
+        self.norm = K1 * (1 - B + B * self.length / avg)
+
+    def postings(self, term):
+        i = self._pos.get(term)
+        if i is None:
+            return None
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return i, self.docs[lo:hi], self.tf[lo:hi]
+
+    def bm25(self, query_terms, size):
+        scores = np.zeros(size, dtype=np.float64)
+        for t in dict.fromkeys(query_terms):
+            hit = self.postings(t)
+            if hit is None:
+                continue
+            i, docs, tf = hit
+            scores[docs] += self.idf[i] * tf * (K1 + 1) / (tf + self.norm[docs])
+        return scores
+
+    def containing_all(self, query_terms, size):
+        """Mask of docs that contain every term."""
+        mask = np.ones(size, dtype=bool)
+        for t in set(query_terms):
+            hit = self.postings(t)
+            if hit is None:
+                return np.zeros(size, dtype=bool)
+            present = np.zeros(size, dtype=bool)
+            present[hit[1]] = True
+            mask &= present
+        return mask
+
+
+class AsanaIndex:
+    def __init__(self, arrays):
+        self.records = arrays_to_frame(arrays)
+        self.size = len(self.records)
+        self.fields = {f: FieldIndex({k.split(".", 1)[1]: v for k, v in arrays.items() if k.startswith(f + ".")})
+                       for f in FIELDS}
+        self.levels = self.records["Level"].to_numpy(dtype=object)
+
+    def search(self, benefit="", levels=(), avoid=(), k=10):
+        """Row positions ranked by BM25 of `benefit` over Benefits, restricted to
+        `levels`, minus asanas contraindicated for any condition in `avoid`. An
+        empty `benefit` lists the remaining asanas in corpus order."""
+        ok = np.ones(self.size, dtype=bool)
+        if levels:
+            ok &= np.isin(self.levels, list(levels))
+        contra = self.fields["Contraindications"]
+        for condition in avoid:
+            cond = terms(condition)
+            if cond:
+                ok &= ~contra.containing_all(cond, self.size)
+        query = terms(benefit)
+        if not query:
+            return np.flatnonzero(ok)[:k]
+        scores = self.fields["Benefits"].bm25(query, self.size)
+        found = np.flatnonzero(ok & (scores > 0))
+        order = np.argsort(-scores[found], kind="stable")[:k]
+        return found[order]
+
+    def facet_counts(self, positions):
+        """{level: asanas} over `positions`, in LEVELS order."""
+        counts = pd.Series(self.levels[positions]).value_counts()
+        return {lv: int(counts[lv]) for lv in LEVELS if lv in counts}
+
+
+def parse_query(text):
+    """Split "back pain, beginner, no high blood pressure" into
+    (benefit text, levels, conditions to avoid)."""
+    benefit, levels, avoid = [], [], []
+    for part in re.split(r"[,;]", text.lower()):
+        part = part.strip()
+        if not part:
+            continue
+        if part in _LEVEL_ALIASES:
+            levels.append(_LEVEL_ALIASES[part])
+        elif part.startswith(_NEGATIONS):
+            cond = part.split(" ", 1)[1]
+            cond = re.sub(r"\bcontra[- ]?indications?\b|\bcontraindicated\b|\bproblems?\b", "", cond).strip()
+            if cond:
+                avoid.append(cond)
+        else:
+            benefit.append(part)
+    return " ".join(benefit), levels, avoid
+
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+@timed("asana_index.load")
+def _read(path):
+    with np.load(path, allow_pickle=False) as npz:
+        arrays = {k: npz[k] for k in npz.files}
+    add_bytes("asana_index.load", os.path.getsize(path))
+    return AsanaIndex(arrays)
+
+
+def get_asana_index(path=INDEX_PATH):
+    """The index, loaded on first use (and built first if the file is missing)."""
+    with _lock:
+        if not os.path.exists(path):
+            write_index(path)
+        signature = file_signature(path)
+        hit = _loaded.get(path)
+        if hit is None or hit[0] != signature:
+            hit = _loaded[path] = (signature, _read(path))
+        return hit[1]
+
+
+@timed("asana_index.search")
+def search_asanas(text, levels=(), avoid=(), k=10, path=INDEX_PATH):
+    """Asanas for a free-text query; explicit `levels`/`avoid` add to what the
+    text asks for. Returns (results frame with a Score column, level facets)."""
+    index = get_asana_index(path)
+    benefit, text_levels, text_avoid = parse_query(text)
+    levels = list(dict.fromkeys([*text_levels, *levels]))
+    avoid = [*text_avoid, *avoid]
+    facets = index.facet_counts(index.search(benefit, avoid=avoid, k=index.size))
+    rows = index.search(benefit, levels, avoid, k=k)
+    out = index.records.iloc[rows].reset_index(drop=True)
+    if benefit:
+        out.insert(0, "Score", np.round(index.fields["Benefits"].bm25(terms(benefit), index.size)[rows], 2))
+    return out, facets
+
+
+if __name__ == "__main__":
+    import sys
+
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if cmd == "build":
+        t0 = time.perf_counter()
+        df = write_index()
+        print(f"{len(df)} asanas -> {INDEX_PATH} "
+              f"({os.path.getsize(INDEX_PATH) / 1024:.0f} KiB, {time.perf_counter() - t0:.2f}s)")
+    elif cmd == "check":
+        ok = is_current()
+        print("asana index is current" if ok else "asana index is stale; run: python asana_index.py build")
+        sys.exit(0 if ok else 1)
+    else:
+        print("usage: python asana_index.py [build|check]")
+        sys.exit(1)
@@ -0,0 +1,276 @@
+import hashlib
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from reference_data import load_artifact, write_npz_table
+
+
+# Offline build of the food catalogue: every food table in the repo, mapped
+# onto the app's food columns in one set of units, near-duplicate names
+# merged, written as one compressed .npz (food_catalogue.npz). The app only
+# loads that file.
+#
+#   python food_catalogue.py build    # rebuild after editing a source CSV
+#   python food_catalogue.py check    # is the committed catalogue current?
+#
+# Values are per 100 g, except for sources marked per serving (no serving
+# weight), where they describe one serving as the source lists it.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(APP_DIR)
+CATALOGUE_PATH = os.path.join(APP_DIR, "food_catalogue.npz")
+
+NUTRIENT_COLUMNS = ["Calories (kcal)", "Carbohydrates (g)", "Protein (g)", "Fats (g)", "Free Sugar (g)",
+                    "Fibre (g)", "Sodium (mg)", "Calcium (mg)", "Iron (mg)", "Vitamin C (mg)", "Folate (µg)",
+                    "Cholesterol (mg)"]
+SERVING_COLUMNS = ["Serving Unit", "Serving Weight (g)", "Calories per Serving", "Protein per Serving (g)"]
+COLUMNS = ["Food ID", "Dish Name"] + NUTRIENT_COLUMNS + SERVING_COLUMNS + ["Source"]
+
+CUSTOM_ID_BIT = 1 << 52  # catalogue ids are below this
+
+MASS = {"g": 1.0, "mg": 1e-3, "µg": 1e-6, "ug": 1e-6, "mcg": 1e-6}
+ENERGY = {"kcal": 1.0, "kJ": 1 / 4.184}
+
+# (path, name column, {source column: (catalogue column, unit in the source)}, per serving?)
+# Units are given explicitly where a header is wrong: foods.csv labels folate
+# "mg" but holds the same µg values as the processed table, the fruit & veg
+# tables label sodium "g" but hold mg, and the world table has no units at all.
+_INDIAN = {c: (c, re.search(r"\(([^)]+)\)$", c).group(1)) for c in NUTRIENT_COLUMNS}
+_FRUIT_VEG = {"energy (kcal/kJ)": ("Calories (kcal)", "kcal/kJ"), "protein (g)": ("Protein (g)", "g"),
+              "total fat (g)": ("Fats (g)", "g"), "carbohydrates (g)": ("Carbohydrates (g)", "g"),
+              "fiber (g)": ("Fibre (g)", "g"), "sugars (g)": ("Free Sugar (g)", "g"),
+              "calcium (mg)": ("Calcium (mg)", "mg"), "iron (mg)": ("Iron (mg)", "mg"),
+              "sodium (g)": ("Sodium (mg)", "mg"), "vitamin C (mg)": ("Vitamin C (mg)", "mg")}
+SOURCES = [
+    ("NutritionAnalyzerApp/Enhanced_Indian_Food_Nutrition.csv", "Dish Name", _INDIAN, False),
+    ("Indian_Food_Nutrition_Processed.csv", "Dish Name", _INDIAN, False),
+    ("data/foods.csv", "Dish Name",
+     dict(_INDIAN, **{"Folate (mg)": ("Folate (µg)", "µg")}), False),
+    ("data/foods2.csv", "Fruit and Veggie", _FRUIT_VEG, False),
+    ("food_nutrition (1).csv", "name", _FRUIT_VEG, False),
+    ("data/MORE FOOD NUTIRITION ACROSS THE WORLD(EXTENDED).csv", "Food Name",
+     {"Caloric Value": ("Calories (kcal)", "kcal"), "Carbohydrates": ("Carbohydrates (g)", "g"),
+      "Protein": ("Protein (g)", "g"), "Fat": ("Fats (g)", "g"), "Sugars": ("Free Sugar (g)", "g"),
+      "Dietary Fiber": ("Fibre (g)", "g"), "Sodium": ("Sodium (mg)", "g"),
+      "Calcium": ("Calcium (mg)", "mg"), "Iron": ("Iron (mg)", "mg"), "Vitamin C": ("Vitamin C (mg)", "mg"),
+      "Vitamin B11": ("Folate (µg)", "mg"), "Cholesterol": ("Cholesterol (mg)", "mg")}, True),
+]
+
+
+# ---------------- units ---------------- #
+def _unit(column):
+    return re.search(r"\(([^)]+)\)$", column).group(1)
+
+
+def convert(values, unit, target):
+    """Convert a numeric Series from `unit` to `target` (mass or energy)."""
+    if unit == "kcal/kJ":
+        return parse_energy(values)
+    if unit == target:
+        return values
+    if unit in MASS and target in MASS:
+        return values * (MASS[unit] / MASS[target])
+    if unit in ENERGY and target in ENERGY:
+        return values * (ENERGY[unit] / ENERGY[target])
+    raise ValueError(f"can't convert {unit} to {target}")
+
+
+def parse_energy(values):
+    """kcal from "kcal/kJ" strings like "48/200"; a lone kJ value is converted."""
+    parts = values.astype(str).str.extract(r"^\s*([\d.]+)?\s*(?:/\s*([\d.]+))?")
+    kcal = pd.to_numeric(parts[0], errors="coerce")
+    kj = pd.to_numeric(parts[1], errors="coerce")
+    return kcal.fillna(kj * ENERGY["kJ"])
+
+
+# ---------------- names ---------------- #
+def normalize_name(name):
+    name = re.sub(r"\bnutrition facts\b", " ", str(name).lower())
+    return " ".join(re.findall(r"[a-z0-9]+", name))
+
+
+def base_name(name):
+    """Normalized name without parenthesised parts ("Hot tea (Garam Chai)" -> "hot tea")."""
+    return normalize_name(re.sub(r"\([^)]*\)", " ", str(name)))
+
+
+def food_id(key):
+    """Stable 52-bit id from the normalized name (exact as a JSON number)."""
+    return int(hashlib.sha1(key.encode()).hexdigest()[:13], 16)
+
+
+def custom_food_id(key):
+    """Id for a user's custom food: bit 52 set, so it can't equal a catalogue
+    id and is still exact as a JSON number."""
+    return CUSTOM_ID_BIT | food_id(key)
+
+
+def _variant(x, y):
+    # "cookie"/"cookies", "radish"/"radishes", "tartar"/"tartare"; not "with"/"without", "gin"/"gingo"
+    short, long = sorted((x, y), key=len)
+    return len(short) >= 3 and long[:len(short)] == short and long[len(short):] in ("s", "es", "e")
+
+
+def similar_names(a, b):
+    """Near-identical normalized names: the same words up to plurals or
+    spacing ("chicken chowmein" / "chicken chow mein")."""
+    ta, tb = a.split(), b.split()
+    if "".join(ta) == "".join(tb):
+        return True
+    return len(ta) == len(tb) and all(x == y or _variant(x, y) for x, y in zip(ta, tb))
+
+
+def group_names(keys):
+    """Map each normalized name to the first near-identical name seen.
+
+    Only names sharing a first letter are compared, which keeps the
+    pairwise checks to small blocks.
+    """
+    canonical = {}
+    blocks = {}
+    for key in keys:
+        if key in canonical:
+            continue
+        block = blocks.setdefault(key[:1], [])
+        canonical[key] = next((k for k in block if similar_names(key, k)), key)
+        if canonical[key] == key:
+            block.append(key)
+    return canonical
+
+
+def attach_bare_names(names, sources, canonical):
+    """Point a name without a parenthesised part at the one food from another
+    source whose name only adds one ("Hot tea" -> "Hot tea (Garam Chai)").
+    Left alone when several foods share that base ("White sauce (thin)" /
+    "(thick)"), or when the source itself lists both ("Chicken sandwich" /
+    "Chicken sandwich (toasted)")."""
+    by_base = {}
+    bare = {}
+    for name, source in zip(names, sources):
+        if "(" in name:
+            groups = by_base.setdefault(base_name(name), {})
+            groups.setdefault(canonical[normalize_name(name)], set()).add(source)
+        else:
+            bare.setdefault(normalize_name(name), set()).add(source)
+    for key, bare_sources in bare.items():
+        groups = by_base.get(key, {})
+        if len(groups) == 1 and canonical[key] == key and bare_sources.isdisjoint(*groups.values()):
+            target = next(iter(groups))
+            for k, g in canonical.items():
+                if g == key:
+                    canonical[k] = target
+    return canonical
+
+
+# ---------------- build ---------------- #
+def read_source(path, name_col, mapping, per_serving):
+    raw = pd.read_csv(os.path.join(ROOT, path))
+    df = pd.DataFrame({"Dish Name": raw[name_col].astype(str).str.strip()})
+    df["Dish Name"] = df["Dish Name"].str.replace(r"\s*nutrition facts$", "", regex=True)
+    df["Dish Name"] = df["Dish Name"].str[:1].str.upper() + df["Dish Name"].str[1:]
+    for src, (dst, unit) in mapping.items():
+        if src not in raw:
+            continue
+        values = raw[src] if unit == "kcal/kJ" else pd.to_numeric(raw[src], errors="coerce")
+        df[dst] = convert(values, unit, _unit(dst))
+    for col in NUTRIENT_COLUMNS:
+        if col not in df:
+            df[col] = np.nan
+    if "Serving Weight (g)" in raw:
+        for col in SERVING_COLUMNS:
+            df[col] = raw[col]
+    elif per_serving:
+        df["Serving Unit"] = "1 serving"
+        df["Serving Weight (g)"] = np.nan
+    else:
+        df["Serving Unit"] = "100 g"
+        df["Serving Weight (g)"] = 100.0
+    if "Calories per Serving" not in df:
+        factor = (df["Serving Weight (g)"] / 100.0).fillna(1.0)
+        df["Calories per Serving"] = (df["Calories (kcal)"] * factor).round(1)
+        df["Protein per Serving (g)"] = (df["Protein (g)"] * factor).round(1)
+    df["Source"] = os.path.basename(path)
+    df["per_serving"] = per_serving
+    return df[df["Dish Name"].str.len() > 0]
+
+
+def build_catalogue(sources=SOURCES):
+    """One row per food across all sources, earlier sources winning ties.
+
+    A merged food takes each missing value from the next source that has
+    it, as long as that source uses the same basis (per 100 g vs per serving).
+    """
+    frames = [read_source(*spec) for spec in sources if os.path.exists(os.path.join(ROOT, spec[0]))]
+    df = pd.concat(frames, ignore_index=True)
+    df["key"] = df["Dish Name"].map(normalize_name)
+    df = df[df["key"] != ""]
+    canonical = attach_bare_names(df["Dish Name"].tolist(), df["Source"].tolist(),
+                                  group_names(df["key"].tolist()))
+    df["group"] = df["key"].map(canonical)
+    df["order"] = np.arange(len(df))
+
+    merged = df.groupby(["group", "per_serving"], sort=False).first()
+    merged = merged.sort_values("order").reset_index()
+    merged = merged.drop_duplicates("group", keep="first")
+    merged["Food ID"] = merged["group"].map(food_id).astype(np.int64)
+    if merged["Food ID"].duplicated().any():
+        raise ValueError("food id collision")
+    merged["Serving Weight (g)"] = merged["Serving Weight (g)"].astype(float)
+    return merged[COLUMNS].reset_index(drop=True)
+
+
+def source_digests(sources=SOURCES):
+    out = []
+    for spec in sources:
+        path = os.path.join(ROOT, spec[0])
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                out.append(f"{spec[0]}:{hashlib.sha1(f.read()).hexdigest()}")
+    return np.array(out, dtype=str)
+
+
+def write_catalogue(path=CATALOGUE_PATH, sources=SOURCES):
+    df = build_catalogue(sources)
+    write_npz_table(path, df, __sources__=source_digests(sources))
+    return df
+
+
+def is_current(path=CATALOGUE_PATH, sources=SOURCES):
+    if not os.path.exists(path):
+        return False
+    with np.load(path, allow_pickle=False) as npz:
+        stored = npz["__sources__"].tolist() if "__sources__" in npz.files else []
+    return stored == source_digests(sources).tolist()
+
+
+def load_catalogue(path=CATALOGUE_PATH):
+    """The catalogue as a DataFrame (shared; copy before mutating).
+
+    Builds it first if the artifact is missing, e.g. in a fresh checkout
+    where it was deleted.
+    """
+    if not os.path.exists(path):
+        write_catalogue(path)
+    return load_artifact(path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if cmd == "build":
+        t0 = time.perf_counter()
+        df = write_catalogue()
+        print(f"{len(df)} foods from {df['Source'].nunique()} sources -> {CATALOGUE_PATH} "
+              f"({os.path.getsize(CATALOGUE_PATH) / 1024:.0f} KiB, {time.perf_counter() - t0:.2f}s)")
+    elif cmd == "check":
+        ok = is_current()
+        print("catalogue is current" if ok else "catalogue is stale; run: python food_catalogue.py build")
+        sys.exit(0 if ok else 1)
+    else:
+        print("usage: python food_catalogue.py [build|check]")
+        sys.exit(1)
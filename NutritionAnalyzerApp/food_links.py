@@ -0,0 +1,235 @@
+import hashlib
+import math
+import os
+import re
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from food_catalogue import CATALOGUE_PATH, load_catalogue
+from nutrient_index import serving_macros
+from reference_data import load_artifact, write_npz_table
+from text_index import IndexCache
+
+
+# Offline fuzzy join from the symptom database's free-text meal advice to
+# the food catalogue. "Vegetable khichdi with cucumber raita" is split into
+# dishes ("Vegetable khichdi", "cucumber raita"); each dish, and each item of
+# Foods to Avoid, is matched to catalogue Food IDs. The result, with a 0-100
+# confidence and per-serving macros, is written to food_links.npz, so the
+# Health Advisor only does dictionary lookups.
+#
+#   python food_links.py build [--jobs N]   # after rebuilding the catalogue
+#   python food_links.py check              # is the committed file current?
+#
+# Blocking keeps scoring cheap: a phrase is only compared with catalogue
+# names that share one of its rarer words (catalogue names carry alternate
+# names in brackets, "Cucumber raita (Kheere ka raita)", and all of them are
+# indexed). The shortlisted pairs are scored with thefuzz, spread over worker
+# processes, and the score is scaled by how much of the phrase's idf weight
+# the name covers, so "Vegetable daliya" does not settle for "Vegetable
+# salad". thefuzz is only needed to build, not to run the app.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+LINKS_PATH = os.path.join(APP_DIR, "food_links.npz")
+SYMPTOM_PATH = os.path.join(APP_DIR, "symptom_database.csv")
+
+FIELDS = {"Preferred Indian Meal": "meal", "Foods to Avoid": "avoid"}
+COLUMNS = ["Symptom", "Field", "Phrase", "Component", "Rank", "Food ID", "Dish Name", "Score",
+           "Calories", "Protein", "Carbs", "Fats"]
+TOP_K = 3
+SHORTLIST = 40
+MIN_CONFIDENCE = 90  # below this a link is kept in the file but not offered in the app
+
+_TOKEN_RE = re.compile(r"[a-z]+")
+_SPLIT_RE = re.compile(r"\s+with\s+|\s+and\s+|,|\+")
+# cooking words and Hindi connectives: they say nothing about which dish it is
+_WEAK = frozenset("a of the with and ka ki ke aur in on plain soft steamed boiled lightly light spiced fresh "
+                  "homemade simple mixed excess food foods".split())
+
+
+def _words(text):
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _WEAK and len(t) > 1]
+
+
+def components(phrase):
+    """'Vegetable khichdi with cucumber raita' -> ['Vegetable khichdi', 'cucumber raita']."""
+    return [p.strip() for p in _SPLIT_RE.split(str(phrase)) if p.strip()]
+
+
+def name_variants(name):
+    """A catalogue name and the alternates in its brackets / after slashes."""
+    out = [re.sub(r"\([^)]*\)", " ", name)]
+    out += re.findall(r"\(([^)]*)\)", name)
+    out += [v for part in list(out) if "/" in part for v in part.split("/")]
+    return [" ".join(v.split()) for v in out if v.strip()]
+
+
+def source_digests(paths):
+    out = []
+    for path in paths:
+        with open(path, "rb") as f:
+            out.append(f"{os.path.basename(path)}:{hashlib.sha1(f.read()).hexdigest()}")
+    return np.array(out, dtype=str)
+
+
+# ---------------- build ---------------- #
+class Blocker:
+    """Word -> catalogue rows, with idf, for picking the shortlist to score."""
+
+    def __init__(self, names):
+        self.names = names
+        self.variants = [[_words(v) for v in name_variants(n)] for n in names]
+        # among equal overlaps, prefer the name with the fewest other words
+        self.size = [min((len(v) for v in variants), default=0) for variants in self.variants]
+        postings = defaultdict(set)
+        for i, variants in enumerate(self.variants):
+            for v in variants:
+                for w in v:
+                    postings[w].add(i)
+        self.postings = {w: np.fromiter(ids, dtype=np.int32) for w, ids in postings.items()}
+        self.idf = {w: math.log(len(names) / len(ids)) for w, ids in self.postings.items()}
+
+    def shortlist(self, words, k=SHORTLIST):
+        score = defaultdict(float)
+        for w in set(words):
+            for i in self.postings.get(w, ()):
+                score[int(i)] += self.idf[w]
+        return sorted(score, key=lambda i: (-score[i], self.size[i]))[:k]
+
+    def coverage(self, words, variant):
+        total = sum(self.idf.get(w, 0.0) for w in words)
+        return sum(self.idf.get(w, 0.0) for w in words if w in variant) / total if total else 0.0
+
+
+_worker = {}
+
+
+def _init_worker(names):
+    from thefuzz import fuzz
+    _worker["blocker"] = Blocker(names)
+    _worker["fuzz"] = fuzz
+
+
+def _match(text):
+    """Top catalogue rows for `text` as [(row, score)]."""
+    blocker, fuzz = _worker["blocker"], _worker["fuzz"]
+    words = _words(text)
+    if not words:
+        return []
+    query = " ".join(words)
+    scored = []
+    for i in blocker.shortlist(words):
+        best = 0.0
+        for v in blocker.variants[i]:
+            name = " ".join(v)
+            similarity = (fuzz.token_sort_ratio(query, name) + fuzz.token_set_ratio(query, name)) / 2
+            best = max(best, similarity * (0.6 + 0.4 * blocker.coverage(words, v)))
+        scored.append((i, round(best)))
+    scored.sort(key=lambda p: (-p[1], blocker.size[p[0]]))
+    return scored[:TOP_K]
+
+
+def _match_all(texts):
+    return [_match(t) for t in texts]
+
+
+def build_links(df_sym, df_food, jobs=None):
+    """One row per (symptom, field, component, rank) with the matched food."""
+    names = df_food["Dish Name"].astype(str).tolist()
+    todo = []  # (symptom, field, phrase, component)
+    for rec in df_sym.to_dict("records"):
+        for column, field in FIELDS.items():
+            value = rec.get(column)
+            if not isinstance(value, str):
+                continue
+            parts = components(value) if field == "meal" else [p.strip() for p in value.split(",") if p.strip()]
+            todo += [(rec["Symptom"], field, value, part) for part in parts]
+
+    texts = list(dict.fromkeys(t[3] for t in todo))
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        _init_worker(names)
+        results = _match_all(texts)
+    else:
+        chunks = [texts[i::jobs] for i in range(jobs)]
+        with Pool(jobs, initializer=_init_worker, initargs=(names,)) as pool:
+            parts = pool.map(_match_all, chunks)
+        results = [None] * len(texts)
+        for j, chunk in enumerate(parts):
+            results[j::jobs] = chunk
+    matches = dict(zip(texts, results))
+
+    macros = serving_macros(df_food)
+    rows = []
+    for symptom, field, phrase, part in todo:
+        for rank, (i, score) in enumerate(matches[part]):
+            m = macros.iloc[i]
+            rows.append([symptom, field, phrase, part, rank, int(df_food["Food ID"].iat[i]), names[i], score,
+                         float(m["Calories"]), float(m["Protein"]), float(m["Carbs"]), float(m["Fats"])])
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def write_links(path=LINKS_PATH, symptom_path=SYMPTOM_PATH, catalogue_path=CATALOGUE_PATH, jobs=None):
+    df = build_links(pd.read_csv(symptom_path), load_catalogue(catalogue_path), jobs)
+    write_npz_table(path, df, __sources__=source_digests([symptom_path, catalogue_path]))
+    return df
+
+
+def is_current(path=LINKS_PATH, symptom_path=SYMPTOM_PATH, catalogue_path=CATALOGUE_PATH):
+    if not os.path.exists(path):
+        return False
+    with np.load(path, allow_pickle=False) as npz:
+        stored = npz["__sources__"].tolist() if "__sources__" in npz.files else []
+    return stored == source_digests([symptom_path, catalogue_path]).tolist()
+
+
+# ---------------- lookup ---------------- #
+def _group_links(df):
+    best = df[(df["Rank"] == 0) & (df["Score"] >= MIN_CONFIDENCE)]
+    links = defaultdict(list)
+    for rec in best.to_dict("records"):
+        links[(rec["Symptom"], rec["Field"])].append(rec)
+    return dict(links)
+
+
+_links_cache = IndexCache(_group_links)
+
+
+def get_links(path=LINKS_PATH):
+    """{(symptom, field): rows} of confident links, best match per component.
+    Empty if the file has not been built."""
+    if not os.path.exists(path):
+        return {}
+    return _links_cache.get(load_artifact(path))
+
+
+def meal_links(symptom, path=LINKS_PATH):
+    return get_links(path).get((symptom, "meal"), [])
+
+
+def avoid_links(symptom, path=LINKS_PATH):
+    return get_links(path).get((symptom, "avoid"), [])
+
+
+if __name__ == "__main__":
+    import sys
+
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if cmd == "build":
+        jobs = int(sys.argv[sys.argv.index("--jobs") + 1]) if "--jobs" in sys.argv else None
+        t0 = time.perf_counter()
+        df = write_links(jobs=jobs)
+        best = df[df["Rank"] == 0]
+        print(f"{best['Component'].nunique()} phrases, {(best['Score'] >= MIN_CONFIDENCE).mean():.0%} linked "
+              f"-> {LINKS_PATH} ({time.perf_counter() - t0:.2f}s)")
+    elif cmd == "check":
+        ok = is_current()
+        print("food links are current" if ok else "food links are stale; run: python food_links.py build")
+        sys.exit(0 if ok else 1)
+    else:
+        print("usage: python food_links.py [build [--jobs N]|check]")
+        sys.exit(1)
@@ -0,0 +1,105 @@
+import bisect
+from collections import defaultdict
+
+import numpy as np
+
+from instrumentation import timed
+from text_index import IndexCache, tokens, trigrams
+
+
+# Dish-name search shared by the food logger and the Nutrition Plan page.
+# The index is built once per food table: a trigram inverted index (for
+# substring and typo-tolerant matching) plus a sorted token list that acts
+# as a prefix trie via bisect.
+
+class FoodSearchIndex:
+    def __init__(self, names):
+        self.names = ["" if n is None else str(n) for n in names]
+        self.lower = [n.lower() for n in self.names]
+        self.size = len(self.names)
+
+        postings = defaultdict(list)
+        gram_counts = np.zeros(self.size, dtype=np.int32)
+        pairs = []
+        for i, name in enumerate(self.lower):
+            grams = trigrams(name)
+            gram_counts[i] = len(grams)
+            for g in grams:
+                postings[g].append(i)
+            pairs.extend((tok, i) for tok in set(tokens(name)))
+        self.postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+        self.gram_counts = gram_counts
+        # shorter names rank first among otherwise equal matches
+        self.length_penalty = np.array([len(n) for n in self.lower], dtype=np.float32) / 1000.0
+
+        pairs.sort()
+        self.token_keys = [tok for tok, _ in pairs]
+        self.token_ids = np.array([i for _, i in pairs], dtype=np.int32)
+
+    def _gram_hits(self, grams):
+        lists = [self.postings[g] for g in grams if g in self.postings]
+        if not lists:
+            return np.zeros(self.size, dtype=np.int32)
+        return np.bincount(np.concatenate(lists), minlength=self.size).astype(np.int32)
+
+    def _prefix_ids(self, prefix):
+        lo = bisect.bisect_left(self.token_keys, prefix)
+        hi = bisect.bisect_left(self.token_keys, prefix + "\uffff")
+        return np.unique(self.token_ids[lo:hi])
+
+    def search(self, query, k=20, min_similarity=0.15):
+        """Return up to `k` row positions, best match first.
+
+        Exact substrings rank above token-prefix hits, which rank above
+        fuzzy (trigram similarity) matches.
+        """
+        q = " ".join(tokens(query))
+        if not q or self.size == 0:
+            return []
+
+        scores = np.zeros(self.size, dtype=np.float32)
+        q_tokens = q.split()
+        prefix = self._prefix_ids(q_tokens[-1])
+        scores[prefix] += 0.5
+
+        if len(q) >= 3:
+            grams = trigrams(q)
+            hits = self._gram_hits(grams)
+            # Jaccard over the two trigram sets: a close spelling of a short
+            # name beats a long name that happens to contain the same grams
+            similarity = hits / (len(grams) + self.gram_counts - hits)
+            fuzzy = similarity >= min_similarity
+            scores[fuzzy] += similarity[fuzzy]
+
+            # every substring match contains all of the query's inner trigrams
+            inner = trigrams(q, padded=False)
+            need = self._gram_hits(inner)
+            for i in np.flatnonzero(need == len(inner)):
+                name = self.lower[i]
+                if q in name:
+                    scores[i] += 2.0 if name.startswith(q) else 1.5
+
+        found = np.flatnonzero(scores > 0)
+        if found.size == 0:
+            return []
+        ranked = scores[found] - self.length_penalty[found]
+        if found.size > k:
+            top = np.argpartition(-ranked, k - 1)[:k]
+            found, ranked = found[top], ranked[top]
+        return found[np.argsort(-ranked, kind="stable")].tolist()
+
+
+_index_cache = IndexCache(lambda df_food: FoodSearchIndex(df_food["Dish Name"].tolist()))
+
+
+def get_food_index(df_food):
+    return _index_cache.get(df_food)
+
+
+@timed("food_search.search")
+def search_foods(df_food, query, k=20):
+    """Ranked rows of `df_food` whose dish name matches `query`."""
+    if df_food is None or df_food.empty:
+        return df_food
+    positions = get_food_index(df_food).search(query, k=k)
+    return df_food.iloc[positions]
@@ -0,0 +1,193 @@
+import bisect
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+
+# Opt-in timing of the hot paths: table loads, log writes, searches,
+# aggregations, page renders and BLE work. Every instrumented name gets a
+# call count, an error count, a latency histogram (fixed buckets, as in
+# Prometheus) and optionally a bytes-read counter.
+#
+# Recording is off unless HEALTH_APP_METRICS=1 is set or it is switched on
+# from the Settings diagnostics panel. While it is off a timed function costs
+# one flag check on top of the call, and timer() hands back a shared no-op
+# context manager.
+
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds; +Inf is implicit
+PREFIX = "health_app"
+
+_NULL = nullcontext()
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimated like Prometheus' histogram_quantile: linear within the bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lo = BUCKETS[i - 1] if i else 0.0
+                if i == len(BUCKETS):
+                    return lo
+                return lo + (BUCKETS[i] - lo) * (rank - seen) / n
+            seen += n
+        return BUCKETS[-1]
+
+
+class Metric:
+    def __init__(self):
+        self.hist = Histogram()
+        self.errors = 0
+        self.bytes = 0
+        self.events = 0
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # BaseExceptions (st.rerun, task cancellation) are control flow, not errors
+        error = exc_type is not None and issubclass(exc_type, Exception)
+        self.registry.observe(self.name, time.perf_counter() - self.start, error=error)
+        return False
+
+
+class Registry:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _metric(self, name):
+        m = self._metrics.get(name)
+        if m is None:
+            m = self._metrics.setdefault(name, Metric())
+        return m
+
+    # ---------------- recording ---------------- #
+    def observe(self, name, seconds, error=False):
+        with self._lock:
+            m = self._metric(name)
+            m.hist.observe(seconds)
+            m.errors += error
+
+    def add_bytes(self, name, n):
+        if self.enabled:
+            with self._lock:
+                self._metric(name).bytes += n
+
+    def count(self, name, n=1):
+        """Count an event that has no duration (dropped packet, reconnect, ...)."""
+        if self.enabled:
+            with self._lock:
+                self._metric(name).events += n
+
+    def timer(self, name):
+        """Context manager timing its block under `name`."""
+        return _Timer(self, name) if self.enabled else _NULL
+
+    def timed(self, name=None):
+        """Decorator timing every call; works on plain and async functions."""
+        def decorate(fn):
+            label = name or f"{fn.__module__}.{fn.__qualname__}"
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await fn(*args, **kwargs)
+                    with _Timer(self, label):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Timer(self, label):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+    # ---------------- export ---------------- #
+    def snapshot(self):
+        """{name: {calls, errors, total_s, p50_ms, p95_ms, p99_ms, bytes, events, buckets}}."""
+        with self._lock:
+            items = {n: (list(m.hist.counts), m.hist.sum, m.hist.count, m.errors, m.bytes, m.events)
+                     for n, m in self._metrics.items()}
+        out = {}
+        for name in sorted(items):
+            counts, total, calls, errors, nbytes, events = items[name]
+            h = Histogram()
+            h.counts, h.sum, h.count = counts, total, calls
+            p50, p95, p99 = (h.quantile(q) for q in (0.5, 0.95, 0.99))
+            out[name] = {"calls": calls, "errors": errors, "total_s": round(total, 6),
+                         "p50_ms": _ms(p50), "p95_ms": _ms(p95), "p99_ms": _ms(p99),
+                         "bytes": nbytes, "events": events, "buckets": counts}
+        return out
+
+    def to_json(self):
+        return json.dumps({"enabled": self.enabled, "buckets_s": BUCKETS, "metrics": self.snapshot()}, indent=2)
+
+    def to_prometheus(self):
+        snap = self.snapshot()
+        lines = [f"# HELP {PREFIX}_call_seconds Latency of instrumented calls.",
+                 f"# TYPE {PREFIX}_call_seconds histogram"]
+        for name, s in snap.items():
+            if not s["calls"]:
+                continue
+            cumulative = 0
+            for bound, n in zip(BUCKETS + ("+Inf",), s["buckets"]):
+                cumulative += n
+                lines.append(f'{PREFIX}_call_seconds_bucket{{name="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{PREFIX}_call_seconds_sum{{name="{name}"}} {s["total_s"]}')
+            lines.append(f'{PREFIX}_call_seconds_count{{name="{name}"}} {s["calls"]}')
+        for metric, key, help_text in (("errors_total", "errors", "Instrumented calls that raised."),
+                                       ("bytes_read_total", "bytes", "Bytes read from disk."),
+                                       ("events_total", "events", "Counted events.")):
+            rows = [(n, s[key]) for n, s in snap.items() if s[key]]
+            if rows:
+                lines += [f"# HELP {PREFIX}_{metric} {help_text}", f"# TYPE {PREFIX}_{metric} counter"]
+                lines += [f'{PREFIX}_{metric}{{name="{n}"}} {v}' for n, v in rows]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Registry(enabled=os.environ.get("HEALTH_APP_METRICS") == "1")
+
+timed = metrics.timed
+timer = metrics.timer
+add_bytes = metrics.add_bytes
+count = metrics.count
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+from log_store import ROLLUP_COLUMNS
+
+
+# Chart data for the Analytics page. Nothing here reads raw food events:
+# per-day sums already live in the store's daily_totals table (kept up to
+# date by every append), so one small query gives a date-indexed frame of
+# food days, parsed once. Weekly and monthly totals are resampled from it
+# and the three frames are cached under the store's version(), which moves
+# with every append or clear. Reruns that only change a widget (e.g. the
+# date picker) are dictionary lookups.
+
+CACHE_SIZE = 16
+
+_cache = OrderedDict()
+
+
+class LogAggregates:
+    def __init__(self, daily):
+        self.daily = daily
+        self.weekly = daily.resample("W").sum()
+        self.monthly = daily.resample("MS").sum()
+
+    @classmethod
+    @timed("log_analytics.rebuild")
+    def from_store(cls, store):
+        totals = store.daily()
+        # daily_totals also has water- or exercise-only days; the charts are
+        # about food, so keep the days with at least one food entry
+        totals = totals[totals["day"].isin(store.days("food_log"))]
+        daily = totals.set_index(pd.to_datetime(totals["day"], format="%Y-%m-%d"))[list(ROLLUP_COLUMNS)]
+        daily.index.name = "Date"
+        return cls(daily.astype("float64"))
+
+    @property
+    def empty(self):
+        return self.daily.empty
+
+    def day(self, date):
+        """(protein, carbs, fats) eaten on `date`, or None if nothing was logged."""
+        ts = pd.Timestamp(date).normalize()
+        if ts not in self.daily.index:
+            return None
+        row = self.daily.loc[ts]
+        return float(row["protein"]), float(row["carbs"]), float(row["fats"])
+
+    def calories(self, period="daily"):
+        """Date and Calories columns for the daily, weekly or monthly chart."""
+        frame = getattr(self, period)
+        return pd.DataFrame({"Date": frame.index, "Calories": frame["eaten"].to_numpy()})
+
+
+@timed("log_analytics.get_aggregates")
+def get_aggregates(store):
+    key = store.path
+    version = store.version()
+    hit = _cache.get(key)
+    if hit is not None and hit[0] == version:
+        _cache.move_to_end(key)
+        return hit[1]
+    agg = LogAggregates.from_store(store)
+    _cache[key] = (version, agg)
+    _cache.move_to_end(key)
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return agg
+
+
+_exports = OrderedDict()
+
+
+@timed("log_analytics.export_csv")
+def export_csv(store, kind):
+    """The full `kind` log as CSV bytes, rebuilt only when the store's version moves."""
+    key = (store.path, kind)
+    version = store.version()
+    hit = _exports.get(key)
+    if hit is not None and hit[0] == version:
+        _exports.move_to_end(key)
+        return hit[1]
+    data = store.export_csv(kind)
+    _exports[key] = (version, data)
+    if len(_exports) > CACHE_SIZE:
+        _exports.popitem(last=False)
+    return data
+
+
+def calendar_grid(first, counts, start=None):
+    """Lay per-day counts out as a GitHub-style calendar: a 7 x weeks matrix
+    (Monday first, NaN outside the range) and the Monday of each week.
+    `start` trims the history to the days from that date on."""
+    if first is None:
+        return np.zeros((7, 0)), []
+    if start is not None and start > first:
+        counts = counts[(start - first).days:]
+        first = start
+    pad = first.weekday()
+    weeks = (pad + len(counts) + 6) // 7
+    grid = np.full(weeks * 7, np.nan)
+    grid[pad:pad + len(counts)] = counts
+    monday = first - timedelta(days=pad)
+    return grid.reshape(weeks, 7).T, [monday + timedelta(weeks=w) for w in range(weeks)]
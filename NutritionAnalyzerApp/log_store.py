@@ -0,0 +1,401 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+
+import pandas as pd
+
+from instrumentation import add_bytes, count, metrics, timed, timer
+from log_writer import GroupCommit
+
+# Append-only store for the user logs (food, water, exercise, weight).
+# Every logged row is one event in SQLite (WAL mode), indexed by
+# (kind, day) so "today" style queries only touch that day's rows.
+# Per-day totals are kept in daily_totals, updated in the same transaction
+# as the events they summarise. Commits are fsync'd; appends from concurrent
+# threads are group-committed so they share one transaction.
+#
+# Which days have a food / water / exercise entry is also kept as one bitmap
+# per kind (bit i = origin + i days, origin being the earliest logged day),
+# together with the longest run of set bits and the run ending at the latest
+# day. Setting a bit only has to look at the run it joins, so streak queries
+# are a single row read and the dashboard calendar never touches the events.
+
+LOG_KINDS = ("food_log", "water_log", "exercise_log", "weight_log")
+
+# column names written by older versions of the app
+LEGACY_COLUMNS = {
+    "food_log": {"Qunatity": "Quantity"},
+    "water_log": {"Volume": "Volume_ml", "Effective_volume": "Effective_Hydration_ml"},
+    "weight_log": {"weight": "Weight"},
+}
+
+# event column -> daily_totals column
+ROLLUP_FIELDS = {
+    "food_log": {"Calories": "eaten", "Protein": "protein", "Carbs": "carbs", "Fats": "fats"},
+    "exercise_log": {"Calories Burnt": "burnt"},
+    "water_log": {"Effective_Hydration_ml": "hydration"},
+}
+ROLLUP_COLUMNS = ("eaten", "protein", "carbs", "fats", "burnt", "hydration")
+
+BITMAP_KINDS = ("food_log", "water_log", "exercise_log")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id      INTEGER PRIMARY KEY,
+    kind    TEXT NOT NULL,
+    day     TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_kind_day ON events (kind, day, id);
+CREATE TABLE IF NOT EXISTS daily_totals (
+    day       TEXT PRIMARY KEY,
+    eaten     REAL NOT NULL DEFAULT 0,
+    protein   REAL NOT NULL DEFAULT 0,
+    carbs     REAL NOT NULL DEFAULT 0,
+    fats      REAL NOT NULL DEFAULT 0,
+    burnt     REAL NOT NULL DEFAULT 0,
+    hydration REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS day_bitmaps (
+    kind     TEXT PRIMARY KEY,
+    origin   TEXT NOT NULL,
+    bits     BLOB NOT NULL,
+    last_run INTEGER NOT NULL,
+    longest  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def normalize_row(kind, row):
+    renames = LEGACY_COLUMNS.get(kind, {})
+    return {renames.get(k, k): v for k, v in row.items()}
+
+
+def _json_value(v):
+    if hasattr(v, "item"):
+        v = v.item()
+    if isinstance(v, float) and v != v:
+        return None
+    return v
+
+
+def _number(v):
+    try:
+        v = float(v)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if v != v else v
+
+
+def _parse_day(day):
+    try:
+        return date.fromisoformat(day)
+    except (TypeError, ValueError):
+        return None
+
+
+def _run_through(bits, i):
+    """(first, last) bit of the run of set bits that contains bit i."""
+    upper = bits >> i
+    last = i + ((~upper & (upper + 1)).bit_length() - 2)
+    below = ~bits & ((1 << i) - 1)
+    return below.bit_length(), last
+
+
+def set_days(state, days):
+    """Add `days` (dates) to a bitmap state (origin, bits, last_run, longest);
+    returns the new state."""
+    origin, bits, last_run, longest = state
+    for d in sorted(set(days)):
+        if origin is None:
+            origin, bits, last_run, longest = d, 0, 0, 0
+        if d < origin:
+            bits <<= (origin - d).days
+            origin = d
+        i = (d - origin).days
+        if bits >> i & 1:
+            continue
+        bits |= 1 << i
+        first, last = _run_through(bits, i)
+        longest = max(longest, last - first + 1)
+        if last == bits.bit_length() - 1:
+            last_run = last - first + 1
+    return origin, bits, last_run, longest
+
+
+def rollup_deltas(kind, rows):
+    """{day: {total column: amount}} contributed by `rows` of one log kind."""
+    fields = ROLLUP_FIELDS.get(kind)
+    deltas = {}
+    if not fields:
+        return deltas
+    for day, row in rows:
+        acc = deltas.setdefault(day, dict.fromkeys(fields.values(), 0.0))
+        for src, dst in fields.items():
+            acc[dst] += _number(row.get(src))
+    return deltas
+
+
+class LogStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._conns = []  # every thread's connection, so close() can reach them all
+        self._conns_lock = threading.Lock()
+        self._writer = GroupCommit(self._flush)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        # stores created before daily_totals / day_bitmaps existed need one backfill
+        if self.get_meta("totals_built") is None:
+            self.rebuild_totals()
+            self.set_meta("totals_built", 1)
+        if self.get_meta("bitmaps_built") is None:
+            self.rebuild_bitmaps()
+            self.set_meta("bitmaps_built", 1)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # each connection is still used by one thread; this only lets close() run elsewhere
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            with self._conns_lock:
+                self._conns.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close the connections of all threads; a later call reconnects."""
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            self._local = threading.local()
+        for conn in conns:
+            conn.close()
+
+    # ---------------- writes ---------------- #
+    @timed("log_store.append")
+    def append(self, kind, rows):
+        """Insert rows (a dict or a list of dicts); returns once they are committed."""
+        return self._writer.submit((kind, rows))
+
+    def _flush(self, batch):
+        conn = self._connect()
+        with timer("log_store.commit"), conn:
+            counts = [self._insert(conn, kind, rows) for kind, rows in batch]
+        count("log_store.rows_written", sum(counts))
+        return counts
+
+    def _insert(self, conn, kind, rows):
+        if isinstance(rows, dict):
+            rows = [rows]
+        cleaned = []
+        for row in rows:
+            row = {k: _json_value(v) for k, v in normalize_row(kind, row).items()}
+            cleaned.append((str(row["Date"])[:10], row))
+        conn.executemany("INSERT INTO events (kind, day, payload) VALUES (?, ?, ?)",
+                         [(kind, day, json.dumps(row)) for day, row in cleaned])
+        self._add_totals(conn, rollup_deltas(kind, cleaned))
+        if kind in BITMAP_KINDS:
+            self._set_days(conn, kind, [_parse_day(day) for day, _ in cleaned])
+        return len(cleaned)
+
+    def _add_totals(self, conn, deltas):
+        for day, acc in deltas.items():
+            cols = ", ".join(acc)
+            marks = ", ".join("?" for _ in acc)
+            updates = ", ".join(f"{c} = {c} + excluded.{c}" for c in acc)
+            conn.execute(f"INSERT INTO daily_totals (day, {cols}) VALUES (?, {marks}) "
+                         f"ON CONFLICT (day) DO UPDATE SET {updates}", [day, *acc.values()])
+
+    def _bitmap(self, conn, kind):
+        row = conn.execute("SELECT origin, bits, last_run, longest FROM day_bitmaps WHERE kind = ?",
+                           (kind,)).fetchone()
+        if row is None:
+            return None, 0, 0, 0
+        return date.fromisoformat(row[0]), int.from_bytes(row[1], "little"), row[2], row[3]
+
+    def _set_days(self, conn, kind, days):
+        days = [d for d in days if d is not None]
+        if not days:
+            return
+        origin, bits, last_run, longest = set_days(self._bitmap(conn, kind), days)
+        blob = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        conn.execute("INSERT OR REPLACE INTO day_bitmaps (kind, origin, bits, last_run, longest) "
+                     "VALUES (?, ?, ?, ?, ?)", (kind, origin.isoformat(), blob, last_run, longest))
+
+    def rebuild_bitmaps(self):
+        """Recompute the day bitmaps from the (kind, day) index."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM day_bitmaps")
+            for kind in BITMAP_KINDS:
+                self._set_days(conn, kind, [_parse_day(d) for d in self.days(kind)])
+
+    def rebuild_totals(self):
+        """Recompute daily_totals from the raw events (after imports or edits)."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM daily_totals")
+            for kind in ROLLUP_FIELDS:
+                cur = conn.execute("SELECT day, payload FROM events WHERE kind = ?", (kind,))
+                rows = ((day, json.loads(p)) for day, p in cur)
+                self._add_totals(conn, rollup_deltas(kind, rows))
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM events")
+            conn.execute("DELETE FROM daily_totals")
+            conn.execute("DELETE FROM day_bitmaps")
+            conn.execute("DELETE FROM meta WHERE key NOT IN ('totals_built', 'bitmaps_built', 'generation')")
+            # event ids restart after a clear, so version() needs a counter too
+            conn.execute("INSERT INTO meta (key, value) VALUES ('generation', 1) "
+                         "ON CONFLICT (key) DO UPDATE SET value = value + 1")
+
+    # ---------------- reads ---------------- #
+    def _frame(self, rows):
+        if not rows:
+            return pd.DataFrame()
+        if metrics.enabled:
+            add_bytes("log_store.read", sum(len(p) for (p,) in rows))
+        return pd.DataFrame([json.loads(p) for (p,) in rows])
+
+    @timed("log_store.day")
+    def day(self, kind, day):
+        rows = self._connect().execute(
+            "SELECT payload FROM events WHERE kind = ? AND day = ? ORDER BY id", (kind, day)).fetchall()
+        return self._frame(rows)
+
+    @timed("log_store.history")
+    def history(self, kind, start=None, end=None):
+        sql = "SELECT payload FROM events WHERE kind = ?"
+        args = [kind]
+        if start is not None:
+            sql += " AND day >= ?"
+            args.append(start)
+        if end is not None:
+            sql += " AND day <= ?"
+            args.append(end)
+        rows = self._connect().execute(sql + " ORDER BY id", args).fetchall()
+        return self._frame(rows)
+
+    @timed("log_store.totals")
+    def totals(self, day):
+        """Precomputed totals for one day (zeros when nothing was logged)."""
+        row = self._connect().execute(
+            f"SELECT {', '.join(ROLLUP_COLUMNS)} FROM daily_totals WHERE day = ?", (day,)).fetchone()
+        return dict(zip(ROLLUP_COLUMNS, row or (0.0,) * len(ROLLUP_COLUMNS)))
+
+    def daily(self):
+        """Every row of daily_totals as a frame, oldest day first."""
+        rows = self._connect().execute(
+            f"SELECT day, {', '.join(ROLLUP_COLUMNS)} FROM daily_totals ORDER BY day").fetchall()
+        return pd.DataFrame(rows, columns=["day", *ROLLUP_COLUMNS])
+
+    def version(self):
+        """Changes whenever events are added or cleared; two indexed lookups."""
+        return self._connect().execute(
+            "SELECT (SELECT MAX(id) FROM events), "
+            "(SELECT value FROM meta WHERE key = 'generation')").fetchone()
+
+    def days(self, kind):
+        """Distinct logged days, answered from the (kind, day) index."""
+        rows = self._connect().execute(
+            "SELECT DISTINCT day FROM events WHERE kind = ? ORDER BY day", (kind,)).fetchall()
+        return [d for (d,) in rows]
+
+    def streak(self, kind, today=None):
+        """(current, longest) runs of consecutive logged days. The current run
+        ends today, or yesterday if nothing is logged yet today; days logged
+        ahead of today don't count towards it."""
+        origin, bits, last_run, longest = self._bitmap(self._connect(), kind)
+        if origin is None:
+            return 0, 0
+        t = ((today or date.today()) - origin).days
+        for end in (t, t - 1):
+            if end >= 0 and bits >> end & 1:
+                return end - _run_through(bits, end)[0] + 1, longest
+        return 0, longest
+
+    def activity(self, kinds=BITMAP_KINDS):
+        """(first day, counts): counts[i] is how many of `kinds` have an entry on
+        first day + i. (None, empty) if nothing was logged."""
+        rows = [self._bitmap(self._connect(), kind) for kind in kinds]
+        rows = [(o, b) for o, b, _, _ in rows if o is not None]
+        if not rows:
+            return None, np.zeros(0, dtype=np.int8)
+        first = min(o for o, _ in rows)
+        last = max(o + timedelta(days=b.bit_length() - 1) for o, b in rows)
+        counts = np.zeros((last - first).days + 1, dtype=np.int8)
+        for o, b in rows:
+            raw = np.frombuffer(b.to_bytes((b.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+            flags = np.unpackbits(raw, bitorder="little")[:b.bit_length()]
+            start = (o - first).days
+            counts[start:start + len(flags)] += flags.astype(np.int8)
+        return first, counts
+
+    def count(self, kind):
+        return self._connect().execute("SELECT COUNT(*) FROM events WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def export_csv(self, kind):
+        return self.history(kind).to_csv(index=False).encode("utf-8")
+
+    # ---------------- migration ---------------- #
+    def get_meta(self, key):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def migrate_csv(self, kind, csv_path):
+        """One-shot import of a legacy CSV log. Returns the number of rows imported."""
+        key = f"migrated:{kind}"
+        if self.get_meta(key) is not None or not os.path.exists(csv_path):
+            return 0
+        try:
+            df = pd.read_csv(csv_path)
+        except pd.errors.EmptyDataError:
+            df = pd.DataFrame()
+        n = 0
+        conn = self._connect()
+        with conn:
+            # rows and the "migrated" marker commit together
+            if not df.empty and "Date" in df.columns:
+                n = self._insert(conn, kind, df.to_dict("records"))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, csv_path))
+        return n
+
+
+def migrate_csv_logs(store, csv_files):
+    """Import every legacy CSV in {kind: path} that has not been imported yet."""
+    return {kind: store.migrate_csv(kind, path) for kind, path in csv_files.items()}
+
+
+if __name__ == "__main__":
+    import sys
+    from new_backend import FILES, get_log_store
+
+    command = sys.argv[1:]
+    if command == ["migrate"]:
+        counts = migrate_csv_logs(get_log_store(), {k: FILES[k] for k in LOG_KINDS})
+        for kind, n in counts.items():
+            print(f"{kind}: {n} rows imported")
+    elif command == ["rebuild"]:
+        get_log_store().rebuild_totals()
+        get_log_store().rebuild_bitmaps()
+        print("daily totals and day bitmaps rebuilt")
+    else:
+        print("usage: python log_store.py migrate|rebuild")
+        sys.exit(1)
@@ -0,0 +1,135 @@
+import os
+import threading
+
+import pandas as pd
+
+from instrumentation import timed
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+
+# Serialized, batched writes for files shared between Streamlit sessions,
+# API workers and other processes.
+#
+# FileLock holds a per-path thread lock plus an flock on <path>.lock, so only
+# one writer in any process touches the file at a time. GroupCommit lets
+# concurrent callers share one commit: whoever arrives while no write is in
+# flight becomes the leader and flushes everything queued so far in a single
+# transaction / fsync, then wakes the callers it wrote for.
+
+_thread_locks = {}
+_registry_lock = threading.Lock()
+
+
+class FileLock:
+    def __init__(self, path):
+        self.path = os.path.abspath(path) + ".lock"
+        self._lock = None
+        self._fd = None
+
+    def __enter__(self):
+        with _registry_lock:
+            lock = _thread_locks.setdefault(self.path, threading.Lock())
+        lock.acquire()
+        self._lock = lock
+        if fcntl is not None:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                self._release()
+                raise
+        return self
+
+    def __exit__(self, *exc):
+        self._release()
+
+    def _release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._lock.release()
+
+
+class _Pending:
+    __slots__ = ("item", "result", "error", "done")
+
+    def __init__(self, item):
+        self.item = item
+        self.result = None
+        self.error = None
+        self.done = False
+
+
+class GroupCommit:
+    """Batches concurrent submit() calls into one flush(items) -> results call.
+
+    A failed flush fails every item in its batch, since they shared a commit.
+    """
+
+    def __init__(self, flush):
+        self.flush = flush
+        self.commits = 0
+        self.items = 0
+        self._cond = threading.Condition()
+        self._queue = []
+        self._flushing = False
+
+    def submit(self, item):
+        pending = _Pending(item)
+        with self._cond:
+            self._queue.append(pending)
+            while self._flushing and not pending.done:
+                self._cond.wait()
+            if not pending.done:
+                # leader: take everything queued so far, ours included
+                self._flushing = True
+                batch, self._queue = self._queue, []
+        if not pending.done:
+            try:
+                results, error = self.flush([p.item for p in batch]), None
+            except BaseException as e:
+                results, error = [None] * len(batch), e
+            with self._cond:
+                for p, r in zip(batch, results):
+                    p.result, p.error, p.done = r, error, True
+                self.commits += 1
+                self.items += len(batch)
+                self._flushing = False
+                self._cond.notify_all()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+
+# ---------------- CSV appends ---------------- #
+_csv_writers = {}
+
+
+def _flush_csv(path, frames):
+    with FileLock(path):
+        header = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            for df in frames:
+                df.to_csv(f, header=header, index=False)
+                header = False
+            f.flush()
+            os.fsync(f.fileno())
+    return [len(df) for df in frames]
+
+
+@timed("log_writer.append_csv")
+def append_csv(path, rows):
+    """Append rows (a DataFrame, a dict or a list of dicts) to a CSV, writing
+    the header if the file is new. Returns once the rows are on disk."""
+    df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame([rows] if isinstance(rows, dict) else rows)
+    path = os.path.abspath(path)
+    with _registry_lock:
+        writer = _csv_writers.get(path)
+        if writer is None:
+            writer = _csv_writers[path] = GroupCommit(lambda frames: _flush_csv(path, frames))
+    return writer.submit(df)
@@ -0,0 +1,352 @@
+import hashlib
+import json
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+
+# Weekly meal plans from data/meals_dataset.csv. Every day gets a breakfast,
+# lunch, dinner and snack, each a meal of that type at 0.5-2 servings (in
+# quarter steps), so the day lands on the user's calorie and macro targets.
+# It is solved as a local search: start from a random (seeded) plan, then
+# repeatedly re-pick the best meal and portion for one slot with the rest of
+# the week fixed, until no slot improves; the best of a few seeded restarts
+# is kept. Days still off target then get pair moves, re-picking two slots
+# at once. Each move scores all its candidates at once with NumPy; a week
+# takes about 0.1-0.3 s (up to ~1 s when targets are barely reachable), and
+# plan_week caches it.
+#
+# The cost is the squared relative miss per nutrient plus a penalty for
+# whatever falls outside the tolerances. The calorie penalty dwarfs every
+# macro term, so calories are held within tolerance whenever the meals
+# allow it and the macros get as close as they can inside that. Targets the
+# meals can't reach (too many calories for the filters, a protein split no
+# mix of these meals has) are reported in the plan's notes rather than
+# traded against calories; a note only says so when unreachable() proves
+# it, and otherwise points at the repeat limit.
+#
+# Variety: a meal appears at most `max_repeats` times a week and never twice
+# on the same day.
+
+SLOTS = ("breakfast", "lunch", "dinner", "snack")
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+SERVINGS = np.arange(0.5, 2.01, 0.25)
+MACROS = ("calories", "protein_g", "carbs_g", "fat_g")
+
+CALORIE_TOLERANCE = 0.10   # a day is "on target" within +-10% kcal ...
+MACRO_TOLERANCE = 0.20     # ... and +-20% of each macro
+MAX_REPEATS = 2
+MAX_ROUNDS = 20
+RESTARTS = 4
+PAIR_SLACK = 0.05          # relative kcal beyond the band that pair moves still consider
+# per squared relative miss outside the tolerance: calories are effectively a
+# hard constraint, the macros a preference
+OUTSIDE_PENALTY = np.array([1e8, 200.0, 200.0, 200.0])  # kcal, protein, carbs, fat
+CACHE_SIZE = 128
+# target combinations checked for reachability: all four, calories alone,
+# and calories with each macro (see unreachable)
+ALL_TARGETS = (0, 1, 2, 3)
+REACH_CHECKS = (ALL_TARGETS, (0,), (0, 1), (0, 2), (0, 3))
+SWEEP = np.linspace(0.0, 2.0 * np.pi, 360, endpoint=False)
+
+
+def load_meals(path):
+    """meals_dataset.csv with numeric macros and tag sets.
+
+    A few rows are malformed (e.g. "50g)" in carbs_g, stray numbers in the
+    tags), so numbers are taken from the leading digits and numeric tags
+    are dropped.
+    """
+    df = pd.read_csv(path)
+    for col in MACROS:
+        df[col] = pd.to_numeric(df[col].astype(str).str.extract(r"(\d+(?:\.\d+)?)")[0], errors="coerce")
+    df = df.dropna(subset=list(MACROS)).reset_index(drop=True)
+    df["meal_type"] = df["meal_type"].str.strip().str.lower()
+    df["tags"] = [frozenset(t.strip().lower() for t in str(tags).split(",")
+                            if t.strip() and not t.strip().replace(".", "").isdigit())
+                  for tags in df["tags"].fillna("")]
+    return df
+
+
+def day_targets(profile):
+    """Per-day (kcal, protein g, carbs g, fat g) from the profile's targets."""
+    t = profile["Targets"]
+    kcal = float(t["Calories"])
+    carb_pct, prot_pct, fat_pct = t["Macros_split"]
+    return np.array([kcal, kcal * prot_pct / 400.0, kcal * carb_pct / 400.0, kcal * fat_pct / 900.0])
+
+
+class MealPlanner:
+    def __init__(self, meals):
+        self.meals = meals
+        self.values = meals[list(MACROS)].to_numpy(dtype=np.float64)
+
+    def _pool(self, slot, include, exclude):
+        ok = (self.meals["meal_type"] == slot).to_numpy().copy()
+        if include:
+            ok &= np.array([include <= t for t in self.meals["tags"]], dtype=bool)
+        if exclude:
+            ok &= np.array([not (exclude & t) for t in self.meals["tags"]], dtype=bool)
+        return np.flatnonzero(ok)
+
+    @timed("meal_planner.solve")
+    def solve(self, targets, include=(), exclude=(), max_repeats=MAX_REPEATS, seed=0, restarts=RESTARTS):
+        """Plan for 7 days; returns {"days": [...], "met": [...], "calories_met": [...],
+        "cost": float, "missing_slots": [...], "notes": [...]}.
+
+        `targets` is the per-day (kcal, protein, carbs, fat) vector. Slots
+        with no meal left after the tag filters are listed in missing_slots;
+        targets the plan misses are explained in notes.
+        """
+        include, exclude = frozenset(include), frozenset(exclude)
+        targets = np.asarray(targets, dtype=np.float64)
+        scale = np.maximum(targets, 1.0)
+        tolerance = np.array([CALORIE_TOLERANCE] + [MACRO_TOLERANCE] * 3)
+        # inside the tolerances too, calories matter most
+        weights = np.array([10.0, 1.0, 1.0, 1.0])
+
+        def cost(totals):
+            miss = np.abs(totals - targets) / scale
+            outside = np.maximum(miss - tolerance, 0.0)
+            return (miss ** 2 * weights + OUTSIDE_PENALTY * outside ** 2).sum(axis=-1)
+
+        pools = {s: self._pool(s, include, exclude) for s in SLOTS}
+        slots = [s for s in SLOTS if len(pools[s])]
+        # candidate (meal, servings) pairs per slot and their macro contributions
+        cand_meal = {s: np.repeat(pools[s], len(SERVINGS)) for s in slots}
+        cand_serv = {s: np.tile(SERVINGS, len(pools[s])) for s in slots}
+        cand_vals = {s: self.values[cand_meal[s]] * cand_serv[s][:, None] for s in slots}
+
+        best = None
+        for r in range(restarts):
+            pick = self._search(slots, cand_meal, cand_vals, cost, max_repeats, np.random.default_rng([seed, r]))
+            week = sum(float(cost(sum(cand_vals[s][pick[s][d]] for s in slots))) for d in range(len(DAYS)))
+            if best is None or week < best[0]:
+                best = (week, pick)
+        total_cost, pick = best
+
+        # which target combinations some day could meet at all, ignoring repeats
+        unit = [cand_vals[s] / scale for s in slots]
+        lo, hi = targets / scale - tolerance, targets / scale + tolerance
+        reachable = {dims: not unreachable(unit, lo, hi, dims) for dims in REACH_CHECKS}
+        if reachable[ALL_TARGETS]:
+            band = (CALORIE_TOLERANCE + PAIR_SLACK) * scale[0]
+            self._pair_moves(slots, cand_meal, cand_vals, cost, max_repeats, pick,
+                             lambda total: bool((np.abs(total - targets) / scale <= tolerance).all()),
+                             (targets[0] - band, targets[0] + band))
+            total_cost = sum(float(cost(sum(cand_vals[s][pick[s][d]] for s in slots))) for d in range(len(DAYS)))
+
+        days, met, week_totals = [], [], []
+        for d, name in enumerate(DAYS):
+            meals = {}
+            totals = np.zeros(len(MACROS))
+            for s in slots:
+                c = pick[s][d]
+                meals[s] = {"meal": self.meals.at[cand_meal[s][c], "meal_name"],
+                            "servings": float(cand_serv[s][c])}
+                totals += cand_vals[s][c]
+            met.append(bool((np.abs(totals - targets) / scale <= tolerance).all()))
+            week_totals.append(totals)
+            days.append({"day": name, "meals": meals, "totals": dict(zip(MACROS, np.round(totals, 1).tolist()))})
+        week_totals = np.array(week_totals)
+        inside = np.abs(week_totals - targets) / scale <= tolerance
+        return {"days": days, "met": met, "calories_met": inside[:, 0].tolist(), "cost": total_cost,
+                "missing_slots": [s for s in SLOTS if s not in slots],
+                "notes": miss_notes(week_totals, targets, inside, reachable)}
+
+    def _search(self, slots, cand_meal, cand_vals, cost, max_repeats, rng):
+        n_days = len(DAYS)
+        pick = {s: rng.integers(len(cand_meal[s]), size=n_days) for s in slots}
+        uses = np.zeros(len(self.meals), dtype=np.int64)
+        for s in slots:
+            np.add.at(uses, cand_meal[s][pick[s]], 1)
+
+        def day_total(d, skip=None):
+            total = np.zeros(len(MACROS))
+            for s in slots:
+                if s != skip:
+                    total += cand_vals[s][pick[s][d]]
+            return total
+
+        for _ in range(MAX_ROUNDS):
+            changed = False
+            for d in range(n_days):
+                for s in slots:
+                    current = pick[s][d]
+                    base = day_total(d, skip=s)
+                    scores = cost(base + cand_vals[s])
+                    # variety: other uses of each meal this week, and meals already on this day
+                    others = uses[cand_meal[s]] - (cand_meal[s] == cand_meal[s][current])
+                    blocked = others >= max_repeats
+                    for o in slots:
+                        if o != s:
+                            blocked |= cand_meal[s] == cand_meal[o][pick[o][d]]
+                    scores[blocked & (np.arange(len(scores)) != current)] = np.inf
+                    best = int(np.argmin(scores))
+                    if scores[best] < scores[current] - 1e-12:
+                        uses[cand_meal[s][current]] -= 1
+                        uses[cand_meal[s][best]] += 1
+                        pick[s][d] = best
+                        changed = True
+            if not changed:
+                break
+        return pick
+
+    def _pair_moves(self, slots, cand_meal, cand_vals, cost, max_repeats, pick, inside, kcal):
+        """For each day still outside the tolerances, re-pick two slots at
+        once (every meal and portion pair) while that lowers its cost. Single
+        re-picks stall where no one slot can fix, say, protein without
+        breaking calories; a pair usually can.
+
+        A day whose cost is below what PAIR_SLACK beyond the calorie band
+        would cost can only improve with a pair that keeps it within that
+        slack, so only those pairs are scored in full.
+        """
+        pairs = []
+
+        def pair_sums():
+            # built on the first day that needs them; most weeks never do
+            for i, a in enumerate(slots):
+                for b in slots[i + 1:]:
+                    ia, ib = np.divmod(np.arange(len(cand_meal[a]) * len(cand_meal[b])), len(cand_meal[b]))
+                    pairs.append((a, b, ia, ib, cand_vals[a][ia] + cand_vals[b][ib]))
+            return pairs
+
+        uses = np.zeros(len(self.meals), dtype=np.int64)
+        for s in slots:
+            np.add.at(uses, cand_meal[s][pick[s]], 1)
+        lo, hi = kcal
+        for d in range(len(DAYS)):
+            for _ in range(MAX_ROUNDS):
+                total = sum(cand_vals[s][pick[s][d]] for s in slots)
+                if inside(total):
+                    break
+                current = float(cost(total))
+                near = current < OUTSIDE_PENALTY[0] * PAIR_SLACK ** 2
+                best = None
+                for a, b, ia, ib, sums in pairs or pair_sums():
+                    base = total - cand_vals[a][pick[a][d]] - cand_vals[b][pick[b][d]]
+                    # variety: other uses of each meal this week
+                    free_a = uses[cand_meal[a]] - (cand_meal[a] == cand_meal[a][pick[a][d]]) < max_repeats
+                    free_b = uses[cand_meal[b]] - (cand_meal[b] == cand_meal[b][pick[b][d]]) < max_repeats
+                    keep = free_a[ia] & free_b[ib]
+                    if near:
+                        keep &= (sums[:, 0] >= lo - base[0]) & (sums[:, 0] <= hi - base[0])
+                    keep = np.flatnonzero(keep)
+                    if not len(keep):
+                        continue
+                    scores = cost(base + sums[keep])
+                    j = int(np.argmin(scores))
+                    if scores[j] < current - 1e-12 and (best is None or scores[j] < best[0]):
+                        best = (scores[j], a, int(ia[keep[j]]), b, int(ib[keep[j]]))
+                if best is None:
+                    break
+                _, a, ca, b, cb = best
+                for s, c in ((a, ca), (b, cb)):
+                    uses[cand_meal[s][pick[s][d]]] -= 1
+                    uses[cand_meal[s][c]] += 1
+                    pick[s][d] = c
+
+def unreachable(cand_vals, lo, hi, dims):
+    """True if no day built from one candidate per slot (`cand_vals`, one
+    array per slot) can hold nutrients `dims` inside [lo, hi] together.
+
+    For a direction w the largest w . day is the sum of each slot's largest
+    w . candidate, so a direction where that stays below the box's smallest
+    w . x proves the box out of reach. Directions are swept around each
+    plane of two of the nutrients. A miss doesn't prove the box reachable,
+    but a hit never wrongly calls it unreachable.
+    """
+    dims = list(dims)
+    w = np.zeros((0, len(lo)))
+    for i, a in enumerate(dims):
+        for b in dims[i + 1:] or [a]:
+            plane = np.zeros((len(SWEEP), len(lo)))
+            plane[:, a] += np.cos(SWEEP)
+            plane[:, b] += np.sin(SWEEP)
+            w = np.vstack([w, plane])
+    best = sum((v @ w.T).max(axis=0) for v in cand_vals)
+    need = np.minimum(w * lo, w * hi).sum(axis=1)
+    return bool((best < need - 1e-9).any())
+
+
+def miss_notes(week_totals, targets, inside, reachable):
+    """Plain-language notes for targets the week misses. Misses are only put
+    down to the meals themselves where `reachable` (see unreachable) shows no
+    day could meet them; otherwise the repeat limit is what stood in the way."""
+    notes = []
+    ratio = week_totals.mean(axis=0) / np.maximum(targets, 1.0)
+    n_days = len(week_totals)
+    misses = n_days - inside[:, 0].sum()
+    if misses and not reachable[(0,)]:
+        reach = "reach" if ratio[0] < 1 else "stay under"
+        notes.append(f"Calories miss the ±{CALORIE_TOLERANCE:.0%} band on {misses} of {n_days} days: the meals "
+                     f"left after the filters can't {reach} {targets[0]:.0f} kcal a day. Drop a tag filter.")
+    elif misses:
+        notes.append(f"Calories miss the ±{CALORIE_TOLERANCE:.0%} band on {misses} of {n_days} days: no week "
+                     "within the repeat limit was found that hits them every day. Allow more repeats or drop "
+                     "a tag filter.")
+    for i, (name, unit) in enumerate((("Protein", "g"), ("Carbs", "g"), ("Fat", "g")), start=1):
+        misses = n_days - inside[:, i].sum()
+        if not misses:
+            continue
+        if not reachable[(0, i)] or (not reachable[ALL_TARGETS] and misses > n_days // 2):
+            notes.append(f"{name} averages {ratio[i]:.0%} of the {targets[i]:.0f} {unit} target ({misses} of "
+                         f"{n_days} days outside ±{MACRO_TOLERANCE:.0%}), the closest these meals get at "
+                         "this calorie level.")
+        elif reachable[ALL_TARGETS]:
+            notes.append(f"{name} is outside ±{MACRO_TOLERANCE:.0%} on {misses} of {n_days} days: no week "
+                         "within the repeat limit was found that meets it every day. Allowing more repeats "
+                         "may help.")
+    return notes
+
+
+# ---------------- cached entry point ---------------- #
+_planners = {"path": None, "planner": None}
+_plans = OrderedDict()
+
+
+def get_planner(meals_path):
+    if _planners["path"] != meals_path:
+        _planners["planner"] = MealPlanner(load_meals(meals_path))
+        _planners["path"] = meals_path
+        _plans.clear()
+    return _planners["planner"]
+
+
+def meal_tags(meals_path):
+    return sorted(set().union(*get_planner(meals_path).meals["tags"]))
+
+
+@timed("meal_planner.plan_week")
+def plan_week(meals_path, profile, include=(), exclude=(), max_repeats=MAX_REPEATS):
+    """Weekly plan for `profile`; identical targets and filters reuse the cached plan."""
+    planner = get_planner(meals_path)
+    targets = day_targets(profile)
+    key = json.dumps([targets.round(3).tolist(), sorted(include), sorted(exclude), max_repeats])
+    plan = _plans.get(key)
+    if plan is None:
+        seed = int(hashlib.sha1(key.encode()).hexdigest()[:8], 16)
+        plan = planner.solve(targets, include, exclude, max_repeats, seed=seed)
+        _plans[key] = plan
+        if len(_plans) > CACHE_SIZE:
+            _plans.popitem(last=False)
+    else:
+        _plans.move_to_end(key)
+    return plan
+
+
+def plan_frame(plan):
+    """One row per day: each slot as "meal (x servings)" plus the day's totals."""
+    rows = []
+    for day in plan["days"]:
+        row = {"Day": day["day"]}
+        for slot, m in day["meals"].items():
+            row[slot.title()] = f"{m['meal']} (x{m['servings']:g})"
+        row.update({"Calories": day["totals"]["calories"], "Protein (g)": day["totals"]["protein_g"],
+                    "Carbs (g)": day["totals"]["carbs_g"], "Fats (g)": day["totals"]["fat_g"]})
+        rows.append(row)
+    return pd.DataFrame(rows)
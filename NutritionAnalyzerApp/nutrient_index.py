@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+from text_index import IndexCache
+
+# Nearest-dish lookups by nutrition rather than by name, for "what fits my
+# remaining macros today". Per-serving [kcal, protein, carbs, fats] are kept
+# in one contiguous float32 matrix, scaled by reference daily values so a
+# gram of fat and a kcal weigh comparably. A second matrix holds each dish's
+# macro energy split (protein/carbs/fat shares) for "same balance, any size"
+# queries. A query is one vectorised distance pass plus a partial sort; at
+# this table size that is well under a millisecond, so no tree is built.
+
+NUTRIENTS = ("Calories", "Protein", "Carbs", "Fats")
+DAILY_VALUES = np.array([2000.0, 50.0, 275.0, 78.0], dtype=np.float32)
+KCAL_PER_GRAM = np.array([4.0, 4.0, 9.0], dtype=np.float32)  # protein, carbs, fat
+
+
+def serving_macros(df_food):
+    """Per-serving Calories, Protein, Carbs and Fats for every row.
+
+    The food table gives carbs and fats per 100 g, so they are scaled by the
+    serving weight; rows without a weight (custom foods, per-serving
+    catalogue sources) already hold per-serving values.
+    """
+    def col(name):
+        if name not in df_food.columns:
+            return pd.Series(0.0, index=df_food.index)
+        return pd.to_numeric(df_food[name], errors="coerce")
+
+    weight = col("Serving Weight (g)")
+    per_serving = (weight / 100.0).where(weight > 0, 1.0)
+    return pd.DataFrame({
+        "Calories": col("Calories per Serving"),
+        "Protein": col("Protein per Serving (g)"),
+        "Carbs": col("Carbohydrates (g)") * per_serving,
+        "Fats": col("Fats (g)") * per_serving,
+    }, index=df_food.index).fillna(0.0)
+
+
+def _macro_split(grams):
+    energy = grams * KCAL_PER_GRAM
+    total = energy.sum(axis=1, keepdims=True)
+    return np.divide(energy, total, out=np.zeros_like(energy), where=total > 0)
+
+
+class NutrientIndex:
+    def __init__(self, macros):
+        values = np.ascontiguousarray(macros.to_numpy(dtype=np.float32))
+        self.size = len(values)
+        self.macros = values
+        self.scaled = np.ascontiguousarray(values / DAILY_VALUES)
+        self.split = np.ascontiguousarray(_macro_split(values[:, 1:]))
+
+    def _query(self, matrix, point, k):
+        k = min(k, self.size)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        dist = np.sqrt(((matrix - point) ** 2).sum(axis=1))
+        idx = np.argpartition(dist, k - 1)[:k] if k < self.size else np.arange(self.size)
+        idx = idx[np.argsort(dist[idx], kind="stable")]
+        return idx, dist[idx]
+
+    def nearest(self, target, k=10, by="amount"):
+        """Row positions and distances of the `k` dishes closest to `target`,
+        a (Calories, Protein, Carbs, Fats) amount.
+
+        by="amount" matches the amounts themselves; by="ratio" matches only
+        the protein/carbs/fat energy split, whatever the portion size.
+        """
+        target = np.maximum(np.asarray(target, dtype=np.float32), 0.0)
+        if by == "ratio":
+            point = _macro_split(target[None, 1:])[0]
+            return self._query(self.split, point, k)
+        return self._query(self.scaled, target / DAILY_VALUES, k)
+
+
+_index_cache = IndexCache(lambda df_food: NutrientIndex(serving_macros(df_food)))
+
+
+def get_nutrient_index(df_food):
+    return _index_cache.get(df_food)
+
+
+@timed("nutrient_index.suggest")
+def suggest_foods(df_food, remaining, k=10, portions=1, by="amount"):
+    """Dishes closest to `remaining` {Calories, Protein, Carbs, Fats},
+    split evenly over `portions` dishes, with their per-serving macros."""
+    if df_food is None or df_food.empty:
+        return pd.DataFrame()
+    target = [remaining.get(n, 0.0) / max(portions, 1) for n in NUTRIENTS]
+    index = get_nutrient_index(df_food)
+    positions, dist = index.nearest(target, k=k, by=by)
+    out = pd.DataFrame(index.macros[positions].astype(np.float64), columns=list(NUTRIENTS)).round(1)
+    out.insert(0, "Dish Name", df_food["Dish Name"].iloc[positions].to_numpy())
+    out["Distance"] = np.round(dist, 3)
+    return out
@@ -0,0 +1,175 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import add_bytes, timed, timer
+
+
+# Reference tables (food / exercise / symptom databases) are loaded once per
+# process and kept in memory. Big CSVs also get a typed columnar cache written
+# next to them (<name>.csv.cache.npz) so a fresh process skips the CSV parse.
+# Both layers are keyed on the source file's mtime and size. Tables that are
+# built offline straight into that .npz layout (the food catalogue) are
+# loaded with load_artifact.
+
+CACHE_SUFFIX = ".cache.npz"
+
+_lock = threading.Lock()
+_tables = {}
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def cache_path(path):
+    return path + CACHE_SUFFIX
+
+
+def frame_to_arrays(df):
+    """Split a DataFrame into plain typed NumPy arrays (no pickled objects)."""
+    arrays = {"__columns__": np.array(list(df.columns), dtype=str)}
+    for i, col in enumerate(df.columns):
+        s = df[col]
+        key = f"c{i}"
+        if pd.api.types.is_bool_dtype(s):
+            arrays[key] = s.to_numpy(dtype=bool)
+        elif pd.api.types.is_numeric_dtype(s):
+            arrays[key] = s.to_numpy()
+        else:
+            na = s.isna().to_numpy()
+            values = s.fillna("").astype(str).tolist()
+            joined = "\x00".join(values)
+            if values and joined.count("\x00") == len(values) - 1:
+                # one packed UTF-8 buffer: far smaller and faster to load
+                # than a fixed-width unicode array padded to the longest value
+                arrays[key + "_utf8"] = np.frombuffer(joined.encode("utf-8"), dtype=np.uint8)
+            else:
+                arrays[key] = np.array(values, dtype=str)
+            if na.any():
+                arrays[key + "_na"] = na
+    return arrays
+
+
+def arrays_to_frame(arrays):
+    columns = arrays["__columns__"].tolist()
+    data = {}
+    for i, col in enumerate(columns):
+        key = f"c{i}"
+        if key + "_utf8" in arrays:
+            values = arrays[key + "_utf8"].tobytes().decode("utf-8").split("\x00")
+        else:
+            values = arrays[key]
+        if isinstance(values, list) or values.dtype.kind == "U":
+            s = pd.Series(values, dtype=object)
+            if key + "_na" in arrays:
+                s[arrays[key + "_na"]] = np.nan
+            data[col] = s
+        else:
+            data[col] = values
+    return pd.DataFrame(data, columns=columns)
+
+
+def write_npz_cache(path, df, signature):
+    arrays = frame_to_arrays(df)
+    arrays["__signature__"] = np.array(signature, dtype=np.int64)
+    tmp = cache_path(path) + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, cache_path(path))
+    except OSError:
+        # read-only checkout: the in-memory cache still works
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def write_npz_table(path, df, **extra):
+    """Write `df` (plus any extra arrays) as a compressed .npz, atomically."""
+    arrays = frame_to_arrays(df)
+    arrays.update(extra)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp, path)
+
+
+@timed("reference_data.read_npz")
+def read_npz_table(path):
+    with np.load(path, allow_pickle=False) as npz:
+        df = arrays_to_frame({k: npz[k] for k in npz.files})
+    add_bytes("reference_data.read_npz", os.path.getsize(path))
+    return df
+
+
+@timed("reference_data.read_npz")
+def read_npz_cache(path, signature):
+    cpath = cache_path(path)
+    if not os.path.exists(cpath):
+        return None
+    try:
+        with np.load(cpath, allow_pickle=False) as npz:
+            if tuple(npz["__signature__"].tolist()) != tuple(signature):
+                return None
+            df = arrays_to_frame({k: npz[k] for k in npz.files})
+        add_bytes("reference_data.read_npz", os.path.getsize(cpath))
+        return df
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _parse(path, signature, columnar):
+    if columnar:
+        df = read_npz_cache(path, signature)
+        if df is not None:
+            return df
+    try:
+        with timer("reference_data.read_csv"):
+            df = pd.read_csv(path)
+    except pd.errors.EmptyDataError:
+        return None
+    add_bytes("reference_data.read_csv", signature[1])
+    if columnar:
+        write_npz_cache(path, df, signature)
+    return df
+
+
+def _load(path, parse):
+    signature = file_signature(path)
+    if signature is None:
+        _tables.pop(path, None)
+        return None
+    with _lock:
+        hit = _tables.get(path)
+        if hit is not None and hit[0] == signature:
+            return hit[1]
+        df = parse(signature)
+        _tables[path] = (signature, df)
+        return df
+
+
+def load_table(path, columnar=True):
+    """Return the parsed table at `path`, or None if it is missing/empty.
+
+    The result is shared between callers; copy it before mutating.
+    """
+    return _load(path, lambda signature: _parse(path, signature, columnar))
+
+
+def load_artifact(path):
+    """Like load_table, for a table written by write_npz_table."""
+    return _load(path, lambda signature: read_npz_table(path))
+
+
+def invalidate(path=None):
+    with _lock:
+        if path is None:
+            _tables.clear()
+        else:
+            _tables.pop(path, None)
@@ -0,0 +1,193 @@
+import re
+from collections import defaultdict
+
+import pandas as pd
+
+from instrumentation import timed
+from text_index import IndexCache, stem, tokens
+
+
+# In-memory index over the symptom database for the Health Advisor. The
+# comma-separated Possible Causes and Foods to Avoid fields are split once
+# into normalised items with postings (cause -> symptoms, food -> symptoms),
+# so several symptoms can be looked up together: causes are ranked by how
+# many of the chosen symptoms they explain, and the foods to avoid are the
+# union over those symptoms.
+#
+# To cross-check what was logged today, every food-to-avoid item is reduced
+# to keywords ("Spicy fried foods" -> spicy, fried), each keyword expanded
+# with the dish and drink names it covers (FOOD_TERMS), and all of it put in
+# one term -> (item, keyword) table. A logged dish matches an item when its
+# words hit every keyword of the item.
+
+SEVERITY = {"Mild": 1, "Moderate": 2, "Severe": 3}
+
+# words that only qualify an item; "Heavy meals at night" is not a dish
+_GENERIC = frozenset("food drink snack meal item excess heavy high at night late before bed known certain "
+                     "too much".split())
+
+FOOD_TERMS = {
+    "caffeine": ("coffee", "tea", "chai", "espresso", "latte", "cappuccino", "cola"),
+    "alcohol": ("beer", "wine", "whisky", "whiskey", "vodka", "rum", "gin"),
+    "sugary": ("sweet", "candy", "chocolate", "cake", "soda", "cola", "juice", "ladoo", "halwa", "jalebi",
+               "gulab", "kheer", "barfi", "dessert", "pastry", "cookie", "biscuit"),
+    "sugar": ("sweet", "candy", "chocolate", "cake", "soda", "cola", "ladoo", "halwa", "jalebi", "gulab",
+              "kheer", "barfi", "dessert", "pastry"),
+    "candy": ("chocolate", "toffee", "sweet"),
+    "junk": ("pizza", "burger", "fries", "chips", "samosa", "pakora", "noodle", "maggi", "nachos"),
+    "fried": ("fry", "pakora", "pakoda", "samosa", "bhature", "puri", "poori", "vada", "bhaji", "chips", "fries",
+              "jalebi", "kachori"),
+    "oily": ("fried", "fry", "pakora", "samosa", "puri", "poori", "bhature", "kachori", "paratha"),
+    "greasy": ("fried", "fry", "pakora", "samosa", "burger", "pizza", "fries"),
+    "soda": ("cola", "sprite", "fanta", "pepsi", "coke"),
+    "carbonated": ("soda", "cola", "sprite", "fanta", "pepsi", "coke"),
+    "soft": ("soda", "cola", "sprite", "fanta", "pepsi", "coke"),
+    "energy": ("redbull",),
+    "salty": ("chips", "pickle", "achar", "namkeen", "papad", "bhujia"),
+    "salt": ("chips", "pickle", "achar", "namkeen", "papad", "bhujia"),
+    "processed": ("sausage", "bacon", "ham", "salami", "pepperoni", "nugget", "hotdog"),
+    "red": ("mutton", "beef", "pork", "lamb"),
+    "meat": ("mutton", "beef", "pork", "lamb", "sausage", "bacon", "ham", "salami"),
+    "spicy": ("chilli", "chili", "mirchi", "vindaloo"),
+    "citrus": ("orange", "lemon", "lime", "grapefruit", "mosambi"),
+    "dairy": ("milk", "paneer", "cheese", "curd", "yogurt", "yoghurt", "lassi", "butter", "ghee", "cream", "kheer"),
+    "bean": ("rajma", "chole", "chana", "lobia"),
+    "cabbage": ("gobhi", "patta"),
+    "refined": ("maida", "naan", "bread", "pasta", "noodle"),
+    "carb": ("maida", "naan", "bread", "pasta", "noodle", "rice"),
+    "cold": ("ice", "iced", "chilled", "cold"),
+}
+
+def _words(text):
+    return {stem(t) for t in tokens(text)}
+
+
+def split_items(text):
+    """'Dehydration, Stress (chronic), Eye strain' -> items; commas inside brackets don't split."""
+    if not isinstance(text, str):
+        return []
+    items, depth, cur = [], 0, []
+    for ch in text:
+        depth += ch == "("
+        depth -= ch == ")" and depth > 0
+        if ch == "," and not depth:
+            items.append("".join(cur))
+            cur = []
+        else:
+            cur.append(ch)
+    items.append("".join(cur))
+    return [i.strip().rstrip(".") for i in items if i.strip()]
+
+
+def item_key(item):
+    """'Caffeine (excess)', 'Excess caffeine' and 'caffeine' are one item."""
+    key = re.sub(r"\([^)]*\)", " ", item.lower())
+    key = re.sub(r"^excess\s+", "", key.strip())
+    return " ".join(stem(t) for t in key.split())
+
+
+class SymptomIndex:
+    def __init__(self, df_sym):
+        df_sym = df_sym.dropna(subset=["Symptom"]).drop_duplicates("Symptom")
+        self.symptoms = df_sym["Symptom"].astype(str).tolist()
+        self._pos = {s: i for i, s in enumerate(self.symptoms)}
+        self.records = df_sym.to_dict("records")
+
+        self.causes, self.foods = {}, {}                   # key -> display name
+        self.cause_postings = defaultdict(list)            # key -> symptom ids
+        self.food_postings = defaultdict(list)
+        self.symptom_causes = []                           # symptom id -> cause keys
+        self.symptom_foods = []                            # symptom id -> food keys
+        for i, rec in enumerate(self.records):
+            keys = []
+            for item in split_items(rec.get("Possible Causes")):
+                key = item_key(item)
+                self.causes.setdefault(key, item)
+                if i not in self.cause_postings[key]:
+                    self.cause_postings[key].append(i)
+                    keys.append(key)
+            self.symptom_causes.append(keys)
+            keys = []
+            for item in split_items(rec.get("Foods to Avoid")):
+                key = item_key(item)
+                self.foods.setdefault(key, item)
+                if i not in self.food_postings[key]:
+                    self.food_postings[key].append(i)
+                    keys.append(key)
+            self.symptom_foods.append(keys)
+
+        expansions = {stem(k): v for k, v in FOOD_TERMS.items()}
+        self.food_keywords = {}
+        self.term_items = defaultdict(set)  # dish word -> {(food key, keyword)}
+        for key in self.foods:
+            keywords = {w for w in _words(key) if w not in _GENERIC}
+            self.food_keywords[key] = keywords
+            for kw in keywords:
+                for term in (kw, *expansions.get(kw, ())):
+                    for w in _words(term):
+                        self.term_items[w].add((key, kw))
+
+    def ids(self, symptoms):
+        return [self._pos[s] for s in dict.fromkeys(symptoms) if s in self._pos]
+
+    def record(self, symptom):
+        return self.records[self._pos[symptom]]
+
+    def rank_causes(self, symptoms):
+        """Causes shared by the chosen symptoms: most symptoms explained first,
+        then the more specific cause (the one behind fewer symptoms overall)."""
+        chosen = self.ids(symptoms)
+        explains = defaultdict(list)
+        for i in chosen:
+            for key in self.symptom_causes[i]:
+                explains[key].append(self.symptoms[i])
+        rows = [(len(syms), -len(self.cause_postings[key]), self.causes[key], syms)
+                for key, syms in explains.items()]
+        rows.sort(key=lambda r: (-r[0], -r[1], r[2]))
+        return pd.DataFrame([{"Cause": name, "Explains": ", ".join(syms), "Overlap": f"{n}/{len(chosen)}"}
+                             for n, _, name, syms in rows], columns=["Cause", "Explains", "Overlap"])
+
+    def foods_to_avoid(self, symptoms):
+        """{food key: symptoms it aggravates} over the chosen symptoms."""
+        out = defaultdict(list)
+        for i in self.ids(symptoms):
+            for key in self.symptom_foods[i]:
+                out[key].append(self.symptoms[i])
+        return dict(out)
+
+    def match_dish(self, dish):
+        """Food-to-avoid keys whose every keyword is hit by a word of `dish`."""
+        hits = defaultdict(set)
+        for w in _words(dish):
+            for key, kw in self.term_items.get(w, ()):
+                hits[key].add(kw)
+        return [key for key, kws in hits.items() if kws == self.food_keywords[key]]
+
+    def check_log(self, symptoms, items):
+        """Logged dishes/drinks that are on the avoid list for the chosen symptoms:
+        rows of Logged, Avoid, Because of."""
+        avoid = self.foods_to_avoid(symptoms)
+        rows = []
+        for item in dict.fromkeys(items):
+            for key in self.match_dish(item):
+                if key in avoid:
+                    rows.append({"Logged": item, "Avoid": self.foods[key], "Because of": ", ".join(avoid[key])})
+        return pd.DataFrame(rows, columns=["Logged", "Avoid", "Because of"])
+
+    def severity(self, symptoms):
+        """The worst severity level among the chosen symptoms."""
+        levels = [self.record(s).get("Severity Level") for s in symptoms if s in self._pos]
+        levels = [lv for lv in levels if lv in SEVERITY]
+        return max(levels, key=SEVERITY.get) if levels else "N/A"
+
+
+@timed("symptom_index.build")
+def _build(df_sym):
+    return SymptomIndex(df_sym)
+
+
+_index_cache = IndexCache(_build)
+
+
+def get_symptom_index(df_sym):
+    return _index_cache.get(df_sym)
@@ -0,0 +1,45 @@
+import re
+
+# Text helpers shared by the search indexes (food, activity, asana, symptom
+# and the chatbot's symptom matcher), and the cache they use to keep one
+# index per source table.
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokens(text):
+    """Lower-cased alphanumeric words of `text`, in order."""
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def trigrams(text, padded=True):
+    """Character trigrams; padding adds the word-boundary grams (" pa", "er ")."""
+    if padded:
+        text = f" {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def stem(tok):
+    # just enough to make "pains", "problems", "arteries" meet their singulars
+    if len(tok) > 4 and tok.endswith("ies"):
+        return tok[:-3] + "y"
+    if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+        return tok[:-1]
+    return tok
+
+
+class IndexCache:
+    """Keeps the index built from the last source passed to get(); a
+    different object (e.g. a reloaded table) builds a new one. Sources are
+    compared by identity, since the tables are shared and never mutated."""
+
+    def __init__(self, build):
+        self.build = build
+        self.source = None
+        self.index = None
+
+    def get(self, source):
+        if self.source is not source:
+            self.index = self.build(source)
+            self.source = source
+        return self.index
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+from log_store import LogStore
+
+
+# Storage for many users. Profiles live in one SQLite table keyed (and so
+# indexed) by user id; each user's logs live in their own LogStore under a
+# sharded directory, root/<2 hex chars of sha1(id)>/<id>/, so writes from
+# different users never touch the same file and no directory gets huge.
+
+USER_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+MAX_OPEN_STORES = 256
+
+# activity levels and goals new_backend.compute_profile knows
+ACTIVITY_LEVELS = ["Sedentary (Office)", "Lightly Active", "Moderately Active", "Very Active", "Super Active"]
+ACTIVITY_ALIASES = dict({a.lower(): a for a in ACTIVITY_LEVELS}, sedentary="Sedentary (Office)")
+GOALS = ["Weight Loss", "Weight Gain", "Muscle Gain", "Maintain"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    name    TEXT,
+    profile TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_name ON users (name);
+"""
+
+
+def check_user_id(user_id):
+    if not USER_ID_RE.match(str(user_id)):
+        raise ValueError(f"invalid user id: {user_id!r}")
+    return user_id
+
+
+class UserStore:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.db_path = os.path.join(root, "users.sqlite")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stores = OrderedDict()
+        self._holds = {}        # LogStore -> acquire() calls not yet released
+        self._retired = set()   # stores evicted or deleted while held; closed on their last release
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            self._local.conn = conn
+        return conn
+
+    # ---------------- partitions ---------------- #
+    def user_dir(self, user_id):
+        shard = hashlib.sha1(check_user_id(user_id).encode()).hexdigest()[:2]
+        return os.path.join(self.root, shard, user_id)
+
+    def log_path(self, user_id):
+        return os.path.join(self.user_dir(user_id), "health_logs.sqlite")
+
+    def log_store(self, user_id, create=True):
+        """The user's LogStore; a bounded number stay open (LRU), and the
+        least recently used one is closed when another is opened, unless it
+        is still held (see acquire). With create=False a user without logs
+        gets None instead of a new partition.
+        """
+        return self._get(user_id, create, hold=False)
+
+    def acquire(self, user_id, create=True):
+        """log_store(), held open until release(store): eviction in the
+        meantime only drops it from the LRU. Use this (or checkout) wherever
+        other users' requests may run concurrently."""
+        return self._get(user_id, create, hold=True)
+
+    def release(self, store):
+        with self._lock:
+            held = self._holds.pop(store) - 1
+            if held:
+                self._holds[store] = held
+                return
+            if store not in self._retired:
+                return
+            self._retired.discard(store)
+        store.close()
+
+    @contextmanager
+    def checkout(self, user_id, create=True):
+        """acquire() for the length of a with block."""
+        store = self.acquire(user_id, create)
+        try:
+            yield store
+        finally:
+            if store is not None:
+                self.release(store)
+
+    def _get(self, user_id, create, hold):
+        evicted = None
+        with self._lock:
+            store = self._stores.get(user_id)
+            if store is not None:
+                self._stores.move_to_end(user_id)
+            else:
+                path = self.log_path(user_id)
+                if not create and not os.path.exists(path):
+                    return None
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                store = LogStore(path)
+                self._stores[user_id] = store
+                if len(self._stores) > MAX_OPEN_STORES:
+                    evicted = self._retire(self._stores.popitem(last=False)[1])
+            if hold:
+                self._holds[store] = self._holds.get(store, 0) + 1
+        if evicted is not None:
+            evicted.close()
+        return store
+
+    def _retire(self, store):
+        """For a store just dropped from the LRU (lock held): the store if it
+        can be closed now, else None and its last release() closes it."""
+        if store in self._holds:
+            self._retired.add(store)
+            return None
+        return store
+
+    # ---------------- profiles ---------------- #
+    def get_profile(self, user_id):
+        row = self._connect().execute(
+            "SELECT profile FROM users WHERE user_id = ?", (user_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_profile(self, user_id, profile):
+        check_user_id(user_id)
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO users (user_id, name, profile, updated) VALUES (?, ?, ?, ?)",
+                         (user_id, profile.get("Name"), json.dumps(profile), datetime.now().isoformat()))
+        return profile
+
+    def find_by_name(self, name):
+        rows = self._connect().execute("SELECT user_id FROM users WHERE name = ?", (name,)).fetchall()
+        return [u for (u,) in rows]
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def delete_user(self, user_id):
+        """Remove the profile and every log of one user."""
+        with self._lock:
+            store = self._stores.pop(user_id, None)
+            if store is not None:
+                store = self._retire(store)
+        if store is not None:
+            store.close()
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
+        shutil.rmtree(self.user_dir(user_id), ignore_errors=True)
+
+    # ---------------- bulk import ---------------- #
+    def import_users_csv(self, path):
+        """Load data/users.csv style rows (name, age, weight, height, activity,
+        diet_type, timestamp, optionally gender and goal) in one transaction.
+        Returns the imported ids.
+
+        Profiles are built with new_backend.compute_profile so they carry
+        targets. A row without a gender gets the lower (female) BMR and one
+        without a goal "Maintain"; the settings form can correct both. Rows
+        missing age, weight or height, or with an unknown activity level,
+        are skipped.
+        """
+        from new_backend import compute_profile
+
+        try:
+            df = pd.read_csv(path)
+        except pd.errors.EmptyDataError:
+            return []
+        records = []
+        now = datetime.now().isoformat()
+        for row in df.to_dict("records"):
+            row = {k: (None if isinstance(v, float) and v != v else v) for k, v in row.items()}
+            activity = ACTIVITY_ALIASES.get(str(row.get("activity")).strip().lower())
+            try:
+                age, weight, height = int(row["age"]), float(row["weight"]), float(row["height"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if activity is None:
+                continue
+            goal = row.get("goal") if row.get("goal") in GOALS else "Maintain"
+            profile = compute_profile(row.get("name"), age, row.get("gender"), height, weight, activity, goal,
+                                      water_goal=2500)
+            profile.update({"Diet": row.get("diet_type"), "Created": row.get("timestamp")})
+            key = f"{row.get('name')}|{row.get('timestamp')}"
+            user_id = "u" + hashlib.sha1(key.encode()).hexdigest()[:15]
+            records.append((user_id, profile["Name"], json.dumps(profile, default=str), now))
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO users (user_id, name, profile, updated) VALUES (?, ?, ?, ?)",
+                             records)
+        return [r[0] for r in records]
+
+if __name__ == "__main__":
+    import sys
+    from new_backend import get_user_store
+
+    if len(sys.argv) != 3 or sys.argv[1] != "import":
+        print("usage: python user_store.py import <users.csv>")
+        sys.exit(1)
+    ids = get_user_store().import_users_csv(sys.argv[2])
+    print(f"{len(ids)} users imported")
@@ -0,0 +1,27 @@
+import importlib
+
+from instrumentation import timer
+
+
+# One module per sidebar page, each with render(user). A page's module (and
+# whatever it imports: plotly, the food catalogue, the meal planner, ...) is
+# only imported the first time that page is opened, so a cold start pays for
+# the page on screen and nothing else.
+
+PAGES = {
+    "🏠 Home": "home",
+    "📝 Input Meal Logs": "food_log",
+    "📊 Nutrition Plan": "nutrition_plan",
+    "🩺 Health Advisor": "health_advisor",
+    "💧 Hydration Tracker": "hydration",
+    "🏋 Exercise Tracker": "fitness",
+    "📅 Meal Forecasting": "meal_forecast",
+    "💡 Smart Tips": "smart_tips",
+    "📊 Analytics": "analytics",
+    "⚙️ Settings": "settings",
+}
+
+
+def render(page, user):
+    with timer(f"page.{PAGES[page]}"):
+        importlib.import_module(f"{__name__}.{PAGES[page]}").render(user)
@@ -0,0 +1,71 @@
+import streamlit as st
+from datetime import datetime
+
+from log_analytics import get_aggregates
+from new_backend import generate_nutrition_plan, get_log_store
+
+
+def show_analytics_ad(user):
+    st.title("Nutrition Analytics")
+    agg=get_aggregates(get_log_store())
+    if agg.empty:
+        st.write("No food data available")
+        return
+
+    import plotly.express as px
+
+    st.subheader("Daily Calorie Intake")
+    fig=px.bar(agg.calories("daily"),x="Date",y="Calories",title="Daily Calorie Intake")
+    st.plotly_chart(fig,use_container_width=True)
+    st.divider()
+    st.subheader("🍰 Daily Macro Breakdown")
+    selected_date=st.date_input("Select Date",datetime.now())
+    c1,c2=st.columns(2)
+    with c1:
+        st.markdown("#### **Actual Intake**")
+        day=agg.day(selected_date)
+        if day is not None:
+            if sum(day)>0:
+                fig2=px.pie(names=["Protein","Carbs","Fat"],
+                values=list(day),
+            title=f"Actual:{selected_date}",hole=0.4,
+            color_discrete_sequence=px.colors.qualitative.Pastel)
+                st.plotly_chart(fig2,use_container_width=True)
+        else:
+            st.warning(f"No data available for the {selected_date.strftime('%Y-%m-%d')}")
+    with c2:
+        st.markdown("#### **Target Intake**")
+        target=generate_nutrition_plan(user)
+        prot=target["Protein (g)"]
+        carbs=target["Carbs (g)"]
+        fats=target["Fats (g)"]
+        fig3=px.pie(names=["Protein","Carbs","Fat"],
+        values=[prot,carbs,fats],
+        title="Reccomended Goal",hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Pastel)
+        st.plotly_chart(fig3,use_container_width=True)
+
+
+    st.divider()
+    st.subheader("wk Weekly Summaries")
+    t_week,t_month=st.tabs(["Weekly","Monthly"])
+    with t_week:
+        weekly_stats=agg.calories("weekly")
+        weekly_stats["Week"]=weekly_stats["Date"].dt.strftime("Week of %Y-%m-%d")
+        fig_weekly = px.bar(weekly_stats, x="Week", y="Calories",
+                            title="Total Calories per Week",
+                            text_auto=True,
+                            color="Calories", color_continuous_scale="Greens")
+        st.plotly_chart(fig_weekly, use_container_width=True)
+    with t_month:
+        monthly_stats=agg.calories("monthly")
+        monthly_stats["Month"]=monthly_stats["Date"].dt.strftime("%b %Y")
+        fig_monthly = px.bar(monthly_stats, x="Month", y="Calories",
+                             title="Total Calories per Month",
+                             text_auto=True,
+                             color="Calories", color_continuous_scale="Greens")
+        st.plotly_chart(fig_monthly, use_container_width=True)
+
+
+def render(user):
+    show_analytics_ad(user)
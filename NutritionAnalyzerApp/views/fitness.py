@@ -0,0 +1,106 @@
+import streamlit as st
+from datetime import datetime
+
+from activity_search import MAX_MINUTES, activities_to_burn, activity_facets, burn_kcal, search_activities
+from asana_index import LEVELS, search_asanas
+from new_backend import FILES, get_daily_stats, get_log_store, log_data
+from reference_data import load_table
+
+
+def show_fitness(user,df_ex):
+    st.title("🏃 Fitness Tracker")
+    weight=float(user["Current_Weight"])
+
+    t1,t2=st.tabs(["Workouts","🧘 Yoga"])
+    with t1:
+        c1,c2 =st.columns(2)
+        with c1:
+            st.subheader("Log workout")
+            date=st.date_input("Date",datetime.now())
+            time=st.time_input("Time",datetime.now())
+            search=st.text_input("Search Activity",placeholder="Type 'running','swim','yoga'")
+            if df_ex is not None:
+                facets=activity_facets(df_ex,search)
+                cats=st.multiselect("Category",list(facets),format_func=lambda c:f"{c} ({facets[c]})")
+                mins=st.number_input("Duration (Mins)",10,180,30)
+                if search or cats:
+                    matches=search_activities(df_ex,search,cats,minutes=mins,weight=weight)
+                    if matches.empty:
+                        st.warning("No matching activity.")
+                    else:
+                        st.dataframe(matches.drop(columns=["Activity Code"]),hide_index=True,height=220)
+                        act=st.selectbox("Choose Activity",matches["Activity"].unique())
+                        final=matches[matches["Activity"]==act].iloc[0]["MET"]
+                        burn=float(burn_kcal(final,mins,weight))
+                        st.success(f"Estimated Burnt:{burn:.0f}kcal")
+                        if st.button("Log Workout"):
+                            data_dict={"Date":date.strftime("%Y-%m-%d"),"Time":time.strftime("%H:%M:%S"),"Activity":act,"Duration":mins,"Calories Burnt":burn}
+                            log_data(FILES["exercise_log"],[data_dict])
+                            st.success("Logged!")
+
+        with c2:
+            st.subheader("History")
+            exercise_log=get_log_store().history("exercise_log")
+            if not exercise_log.empty:
+                st.dataframe(exercise_log.sort_index(ascending=False),use_container_width=True)
+
+        if df_ex is not None:
+            st.divider()
+            show_burn_planner(user,df_ex,weight)
+    with t2:
+        show_yoga()
+
+
+def show_burn_planner(user,df_ex,weight):
+    st.subheader("🔥 Burn off today's surplus")
+    stats=get_daily_stats()
+    # net intake over the calorie target: eaten - burnt - target
+    surplus=stats["eaten"]-stats["burnt"]-user["Targets"]["Calories"]
+    st.caption(f"Eaten {stats['eaten']:.0f} − burnt {stats['burnt']:.0f} − target "
+               f"{user['Targets']['Calories']:.0f} = {surplus:+.0f} kcal")
+    c1,c2,c3=st.columns(3)
+    kcal=c1.number_input("Surplus to burn off (kcal)",0,3000,int(round(max(surplus,0))),step=50,
+                         help="Defaults to how far today's intake, less exercise, is over your calorie target. "
+                              "Enter any amount to plan for it instead.")
+    max_mins=c2.slider("At most (Mins)",15,240,MAX_MINUTES,step=15)
+    cats=c3.multiselect("Category",sorted(df_ex["Category"].dropna().unique()),key="burn_categories")
+    if kcal<=0:
+        st.info(f"You're {-surplus:.0f} kcal under your target today, so there's no surplus to burn off."
+                if surplus<0 else "No surplus to burn off today.")
+        return
+    plan=activities_to_burn(df_ex,kcal,weight,cats,max_minutes=max_mins)
+    if plan.empty:
+        st.warning(f"Nothing burns {kcal} kcal within {max_mins} minutes. Try a longer session.")
+    else:
+        st.dataframe(plan,hide_index=True,use_container_width=True)
+
+
+def show_yoga():
+    st.subheader("Find asanas")
+    query=st.text_input("What are you looking for?",placeholder="back pain, beginner, no high blood pressure",
+                        help="Comma-separated: benefits to look for, a level, and 'no <condition>' to leave out "
+                             "asanas that are contraindicated for it.")
+    avoid=st.text_input("Also avoid asanas contraindicated for",placeholder="sciatica, hernia")
+    avoid=[a.strip() for a in avoid.split(",") if a.strip()]
+    if not query and not avoid:
+        st.info("Describe what you want help with, e.g. 'stress' or 'digestion, intermediate'.")
+        return
+    _,facets=search_asanas(query,avoid=avoid)
+    levels=st.multiselect("Level",[lv for lv in LEVELS if lv in facets],format_func=lambda lv:f"{lv} ({facets[lv]})")
+    results,_=search_asanas(query,levels,avoid)
+    if results.empty:
+        st.warning("No asana matches all of that.")
+        return
+    for _,row in results.iterrows():
+        with st.expander(f"{row['Name']} · {row['Level']}"):
+            st.write(f"**Benefits:** {row['Benefits']}")
+            if row["Contraindications"]:
+                st.write(f"**Contraindications:** {row['Contraindications']}")
+            if row["Description"]:
+                st.write(f"**How:** {row['Description']}")
+            if row["Breathing"]:
+                st.write(f"**Breathing:** {row['Breathing']}")
+
+
+def render(user):
+    show_fitness(user, load_table(FILES["exercise_db"]))
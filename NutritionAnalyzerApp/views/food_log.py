@@ -0,0 +1,52 @@
+import streamlit as st
+from datetime import datetime
+
+from food_search import search_foods
+from log_writer import append_csv
+from new_backend import FILES, load_food_database, log_data, make_food_entry, reload_custom_foods
+
+
+def show_food_log(df_food):
+    st.title("🍎 Nutrition Logger")
+    t1,t2=st.tabs(["Log Meal","Add Custom Food"])
+    with t1:
+        c1,c2,c3=st.columns(3)
+        with c1:
+            log_date=st.date_input("Date",datetime.now())
+        with c2:
+            log_time=st.time_input("Time",datetime.now())
+        with c3:
+            meal_type=st.selectbox("Meal Type",["Breakfast","Lunch","Dinner","Snack"])
+        st.divider()
+        search=st.text_input("Search Database",placeholder="Type 'Paneer','Rice','Chicken'")
+        if search and df_food is not None:
+            matches=search_foods(df_food,search,k=25)
+            if not matches.empty  :
+                dish=st.selectbox("Select Dish",matches["Dish Name"].unique())
+                sel=matches[matches["Dish Name"]==dish].iloc[0]
+                qty=st.number_input("Quantity (Servings)",0.5,10.0,1.0)
+                cals=sel.get("Calories per Serving",0)*qty
+                st.info(f"Total:{cals:.0f} kcal | Diet : {sel.get('Diet','Veg')}")
+                if st.button("Add to Log"):
+                    data_dict=make_food_entry(sel,qty,log_date,log_time,meal_type)
+                    log_data(FILES["food_log"],[data_dict])
+                    st.success("Logged Successfully!")
+    with t2:
+        with st.form("new _food"):
+            nm=st.text_input("Name")
+            diet=st.radio("Type",["Veg","Non-Veg"])
+            c1,c2,c3,c4=st.columns(4)
+            cal=c1.number_input("Calories",0.0)
+            prot=c2.number_input("Protein",0.0)
+            carbs=c3.number_input("Carbs",0.0)
+            fats=c4.number_input("Fats",0.0)
+            if st.form_submit_button("Save Food"):
+                data_dict={"Dish Name": nm,"Calories per Serving":cal,"Protein per Serving (g)": prot,
+                "Carbohydrates (g)":carbs,"Fats (g)":fats,"Diet":diet}
+                append_csv(FILES["custom_food"],data_dict)
+                st.success("Saved!")
+                reload_custom_foods()
+
+
+def render(user):
+    show_food_log(load_food_database())
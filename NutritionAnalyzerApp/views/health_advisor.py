@@ -0,0 +1,104 @@
+import streamlit as st
+from datetime import datetime
+
+from food_links import avoid_links, meal_links
+from new_backend import FILES, get_log_store, log_data
+from reference_data import load_table
+from symptom_index import get_symptom_index
+
+
+def logged_today():
+    """Dish and drink names logged today, for the food-to-avoid check."""
+    store=get_log_store()
+    today=datetime.now().strftime("%Y-%m-%d")
+    items=[]
+    for kind,col in (("food_log","Dish"),("water_log","Beverage")):
+        day=store.day(kind,today)
+        if col in day:
+            items+=day[col].dropna().astype(str).tolist()
+    return items
+
+
+def meal_type_now(now):
+    return "Breakfast" if now.hour<11 else "Lunch" if now.hour<16 else "Snack" if now.hour<19 else "Dinner"
+
+
+def show_suggested_meal(symptom):
+    """The recommended meal's dishes as catalogue foods, with a one-click log."""
+    links=meal_links(symptom)
+    if not links:
+        return
+    st.markdown("**Suggested meal, per serving:**")
+    for link in links:
+        st.write(f"- {link['Dish Name']}: {link['Calories']:.0f} kcal · P {link['Protein']:.0f} g · "
+                 f"C {link['Carbs']:.0f} g · F {link['Fats']:.0f} g")
+    total=sum(link["Calories"] for link in links)
+    if st.button(f"➕ Log this meal ({total:.0f} kcal)",key=f"log_meal_{symptom}"):
+        now=datetime.now()
+        log_data(FILES["food_log"],[{"Date":now.strftime("%Y-%m-%d"),"Time":now.strftime("%H:%M:%S"),
+                                     "Dish":link["Dish Name"],"Food ID":link["Food ID"],
+                                     "Meal Type":meal_type_now(now),"Quantity":1.0,"Calories":link["Calories"],
+                                     "Protein":link["Protein"],"Carbs":link["Carbs"],"Fats":link["Fats"]}
+                                    for link in links])
+        st.success("Logged!")
+
+
+def show_symptom(res):
+    st.info(
+        f"**Severity:** {res.get('Severity Level', 'N/A')} | **Recovery:** {res.get('Time to Relief', 'N/A')}")
+    c1, c2 = st.columns(2)
+    with c1:
+        st.warning(f"**Causes:** {res['Possible Causes']}")
+        st.info(f"**Remedies:** {res['Remedies']}")
+    with c2:
+        st.error(f"**Avoid:** {res['Foods to Avoid']}")
+        examples=", ".join(link["Dish Name"] for link in avoid_links(res["Symptom"]))
+        if examples:
+            st.caption(f"e.g. {examples}")
+        st.success(f"**Diet:** {res['Preferred Indian Meal']}")
+        show_suggested_meal(res["Symptom"])
+    with st.expander("💡 Lifestyle & Home Remedies"):
+        st.write(f"**Home Remedy:** {res.get('Home Remedy Option', 'N/A')}")
+        st.write(f"**Tip:** {res['Tips / General Medicine']}")
+        st.write(f"**Screen Time:** {res.get('Screen Time Link', 'N/A')}")
+
+
+def show_health_advisor(user,df_sym):
+    st.title("🩺 Advanced Symptom Checker")
+    if df_sym is not None:
+        index=get_symptom_index(df_sym)
+        name= user.get("Name")
+        st.subheader(f"Hello {name}")
+        syms = st.multiselect("I am feeling...", sorted(index.symptoms), placeholder="Pick one or more symptoms")
+        if len(syms) == 1:
+            show_symptom(index.record(syms[0]))
+        elif syms:
+            st.info(f"**Worst severity:** {index.severity(syms)}")
+            c1, c2 = st.columns(2)
+            with c1:
+                st.markdown("**Likely causes**")
+                st.dataframe(index.rank_causes(syms).head(10), hide_index=True, use_container_width=True)
+            with c2:
+                avoid = index.foods_to_avoid(syms)
+                st.markdown("**Foods to avoid**")
+                st.error("\n".join(f"- {index.foods[k]} ({', '.join(v)})" for k, v in avoid.items()))
+            for s in syms:
+                with st.expander(s):
+                    res = index.record(s)
+                    st.write(f"**Remedies:** {res['Remedies']}")
+                    st.write(f"**Diet:** {res['Preferred Indian Meal']}")
+                    show_suggested_meal(s)
+                    st.write(f"**Home Remedy:** {res.get('Home Remedy Option', 'N/A')}")
+                    st.write(f"**Tip:** {res['Tips / General Medicine']}")
+
+        if syms:
+            clashes = index.check_log(syms, logged_today())
+            if clashes.empty:
+                st.caption("Nothing you logged today is on the avoid list.")
+            else:
+                st.warning("Some of what you logged today may make this worse:")
+                st.dataframe(clashes, hide_index=True, use_container_width=True)
+
+
+def render(user):
+    show_health_advisor(user, load_table(FILES["symptom_db"]))
@@ -0,0 +1,83 @@
+import streamlit as st
+from datetime import date, timedelta
+
+from log_analytics import calendar_grid
+from new_backend import get_daily_stats, get_log_store
+
+
+def show_dashboard(user):
+    import plotly.graph_objects as go
+
+    st.title("Your Daily Snapshot")
+    stats=get_daily_stats()
+    net=stats["eaten"]-stats["burnt"]
+    target=user["Targets"]["Calories"]
+    c1,c2,c3,c4 =st.columns(4)
+    with c1:
+        st.metric("Calories Eaten", f"{stats['eaten']:.0f}", f"Target: {target}")
+    with c2:
+        st.metric("Calories Burnt",f"{stats['burnt']:.0f}","Active" )
+
+    with c3:
+        st.metric("Protein",f"{stats['protein']:.0f}",f"Goal: {user['Targets']['Protein']}g  ")
+    w_today = stats["hydration"]
+    with c4:
+        st.metric("Hydration", f"{w_today:.0f} ml", f"Goal: {user['Targets']['Water']} ml")
+
+    st.divider()
+    c_ring, c_streak = st.columns([2, 1])
+    with c_ring:
+        st.subheader("🎯 Today's Progress")
+        fig = go.Figure(go.Pie(
+            labels=['Eaten', 'Remaining'],
+            values=[net, max(0, target - net)],
+            hole=.7, marker_colors=['#FF4B4B', '#F0F2F6'], sort=False
+        ))
+        fig.update_layout(
+            annotations=[dict(text=f"{int(net)}<br>kcal", x=0.5, y=0.5, font_size=20, showarrow=False)],
+            showlegend=False, height=220, margin=dict(l=0, r=0, t=0, b=0))
+        st.plotly_chart(fig, use_container_width=True)
+
+    with c_streak:
+        streak, longest = get_log_store().streak("food_log")
+        st.subheader("🔥 Streak")
+        st.metric("Consecutive Days", f"{streak} 🔥", f"Best: {longest}", delta_color="off")
+
+        st.subheader("⚖️ Weight")
+        cw = user.get("Current_Weight", user["Start_Weight"])
+        st.metric("Current", f"{cw} kg", delta=f"{cw - user['Start_Weight']:.1f} kg")
+
+    show_activity_calendar()
+
+
+def show_activity_calendar():
+    import plotly.graph_objects as go
+
+    first, counts = get_log_store().activity()
+    if first is None:
+        return
+    st.subheader("📅 Logging Calendar")
+    span = st.radio("Show", ["Last year", "All history"], horizontal=True, label_visibility="collapsed")
+    start = date.today() - timedelta(days=364) if span == "Last year" else None
+    grid, weeks = calendar_grid(first, counts, start)
+    fig = go.Figure(go.Heatmap(
+        z=grid, x=weeks, y=["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+        zmin=0, zmax=3, xgap=2, ygap=2, colorscale=[[0, "#2a2a2a"], [1, "#1DB954"]],
+        hovertemplate="Week of %{x|%d %b %Y}, %{y}: %{z} of food / water / exercise logged<extra></extra>",
+        showscale=False))
+    fig.update_layout(height=200, margin=dict(l=0, r=0, t=0, b=0), yaxis=dict(autorange="reversed"))
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render(user):
+    st.title("🤖🩺 AI Health & Nutrition Analyzer")
+    st.write("Personalized health, diet, hydration and exercise recommendations.")
+
+    st.header("Welcome! 👋")
+    st.write("""
+    Our AI system generates personalized nutrition plans, hydration tracking,
+    workout suggestions and weekly meal planning based on your profile.
+    PROJECT BY : GROUP 1 SHARFIA, AKASH, AHANA, NOVESH, HARSH.
+    """)
+    st.divider()
+    show_dashboard(user)
@@ -0,0 +1,41 @@
+import streamlit as st
+from datetime import datetime
+
+from new_backend import HYDRATION_FACTORS, get_log_store, log_beverage_advanced
+
+
+def show_hydration(user):
+    st.title("💧 Hydration Tracker")
+    c1, c2 = st.columns([1, 2])
+    with c1:
+        st.subheader("Log Drink")
+        h_date = st.date_input("Date", datetime.now())
+        h_time = st.time_input("Time", datetime.now())
+        h_bev = st.selectbox("Beverage", list(HYDRATION_FACTORS.keys()))
+        h_vol = st.number_input("Volume (ml)", 50, 2000, 250, step=50)
+        if st.button("Log Drink"):
+            log_beverage_advanced(h_date, h_time, h_bev, h_vol)
+            st.success("Logged!")
+
+        st.markdown("#### Quick Add")
+        if st.button("💧 250ml Water"):
+            log_beverage_advanced(datetime.now(), datetime.now(), "Water", 250)
+            st.success("Logged!")
+
+    with c2:
+        st.subheader("History")
+        day_data = get_log_store().day("water_log", h_date.strftime("%Y-%m-%d"))
+        if not day_data.empty:
+            import plotly.express as px
+
+            tot = day_data["Effective_Hydration_ml"].sum()
+            st.metric("Effective Hydration", f"{tot:.0f} ml", f"Goal: {user['Targets']['Water']} ml")
+            st.progress(min(tot / user['Targets']['Water'], 1.0))
+            st.plotly_chart(px.pie(day_data, values="Volume_ml", names="Beverage", hole=0.4),
+                            use_container_width=True)
+        else:
+            st.info("No data for this date.")
+
+
+def render(user):
+    show_hydration(user)
@@ -0,0 +1,22 @@
+import streamlit as st
+
+from meal_planner import meal_tags, plan_frame, plan_week
+from new_backend import FILES
+
+
+def render(user):
+    st.header("Weekly Balanced Diet & Meal Schedule")
+    tags = meal_tags(FILES["meals_db"])
+    c1, c2, c3 = st.columns(3)
+    include = c1.multiselect("Only meals tagged", tags)
+    exclude = c2.multiselect("Skip meals tagged", tags)
+    repeats = c3.slider("Max times a meal repeats", 1, 7, 2)
+    plan = plan_week(FILES["meals_db"], user, include, exclude, repeats)
+    if plan["missing_slots"]:
+        st.warning("No meals match the filters for: " + ", ".join(plan["missing_slots"]))
+    c1, c2 = st.columns(2)
+    c1.metric("Days within calorie target", f"{sum(plan['calories_met'])}/7")
+    c2.metric("Days within calorie & macro targets", f"{sum(plan['met'])}/7")
+    for note in plan["notes"]:
+        (st.error if note.startswith("Calories") else st.info)(note)
+    st.dataframe(plan_frame(plan), hide_index=True)
@@ -0,0 +1,41 @@
+import pandas as pd
+import streamlit as st
+
+from food_search import search_foods
+from new_backend import generate_nutrition_plan, get_daily_stats, load_food_database, remaining_macros
+from nutrient_index import suggest_foods
+
+
+def render(user):
+    df_food = load_food_database()
+    st.header("Your AI-Powered Nutrition Plan")
+    plan = generate_nutrition_plan(user)
+    df = pd.DataFrame({
+        "Nutrient": ["Calories", "Protein (g)", "Carbs (g)", "Fats (g)"],
+        "Target": [plan["Calories"], plan["Protein (g)"], plan["Carbs (g)"], plan["Fats (g)"]]
+    })
+    st.table(df)
+    st.subheader("Personalized Tips")
+    for tip in plan["Tips"]:
+        st.info("💡 " + tip)
+
+    st.subheader("Suggest Foods")
+    remaining = remaining_macros(plan, get_daily_stats())
+    st.write("Remaining today: " + " | ".join(f"{n} {v:.0f}" for n, v in remaining.items()))
+    c1, c2 = st.columns(2)
+    portions = c1.number_input("Spread over how many dishes", 1, 6, 1)
+    by = c2.radio("Match on", ["Amounts", "Macro balance"], horizontal=True)
+    if remaining["Calories"] <= 0:
+        st.success("You've reached today's calorie target.")
+    else:
+        st.dataframe(suggest_foods(df_food, remaining, k=10, portions=portions,
+                                   by="ratio" if by == "Macro balance" else "amount"))
+
+    st.subheader("Search Foods")
+    food_query = st.text_input("Search for a food:", key="food_search")
+    if food_query:
+        results = search_foods(df_food, food_query, k=50)
+        if results.empty:
+            st.info("No foods found matching your query.")
+        else:
+            st.dataframe(results)
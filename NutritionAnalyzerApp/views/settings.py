@@ -0,0 +1,68 @@
+import pandas as pd
+import streamlit as st
+
+from instrumentation import metrics
+from log_analytics import export_csv
+from new_backend import get_log_store, reset_all_data, save_profile
+
+
+def show_settings(user):
+    st.title("⚙️ Settings")
+    with st.expander("✏️ Edit Profile"):
+        new_w = st.number_input("Update Weight (kg)", value=float(user['Current_Weight']))
+        new_h = st.number_input("Update Height (cm)", value=float(user['Height']))
+        new_age = st.number_input("Update Age", value=int(user['Age']))
+        new_act = st.selectbox("Update Activity",
+                               ["Sedentary (Office)", "Lightly Active", "Moderately Active", "Very Active",
+                                "Super Active"], index=0)
+        new_goal = st.selectbox("Update Goal", ["Weight Loss", "Weight Gain", "Muscle Gain", "Maintain"], index=0)
+
+        if st.button("Save Profile Changes"):
+            new_profile = save_profile(user['Name'], new_age, user['Gender'], new_h, new_w, new_act, new_goal,
+                         user['Targets']['Water'])
+            st.session_state["user"] = new_profile
+            st.success("Profile Updated!")
+            st.rerun()
+
+    st.divider()
+    st.subheader("⬇️ Export Data")
+    c1, c2, c3 = st.columns(3)
+    store = get_log_store()
+    c1.download_button("Download Food Log", export_csv(store, "food_log"), "food_log.csv")
+    c2.download_button("Download Exercise Log", export_csv(store, "exercise_log"), "exercise_log.csv")
+    c3.download_button("Download Weight Log", export_csv(store, "weight_log"), "weight_log.csv")
+
+    st.divider()
+    if st.button("🗑️ Reset All Data (Irreversible)", type="primary"):
+        reset_all_data()
+        del st.session_state["user"]
+        st.rerun()
+
+    # hidden unless opened with ?diagnostics=1 or recording is already on
+    if st.query_params.get("diagnostics") == "1" or metrics.enabled:
+        show_diagnostics()
+
+
+def show_diagnostics():
+    st.divider()
+    with st.expander("🩺 Diagnostics", expanded=metrics.enabled):
+        metrics.enabled = st.toggle("Record timings", value=metrics.enabled,
+                                    help="Times table loads, log reads/writes, searches and page renders.")
+        snap = metrics.snapshot()
+        if not snap:
+            st.info("Nothing recorded yet. Switch recording on and use the app.")
+            return
+        rows = [{"Name": name, "Calls": s["calls"], "Errors": s["errors"], "p50 ms": s["p50_ms"],
+                 "p95 ms": s["p95_ms"], "p99 ms": s["p99_ms"], "Total s": s["total_s"],
+                 "KiB read": round(s["bytes"] / 1024, 1), "Events": s["events"]} for name, s in snap.items()]
+        st.dataframe(pd.DataFrame(rows).sort_values("Total s", ascending=False), hide_index=True)
+        c1, c2, c3 = st.columns(3)
+        c1.download_button("Export JSON", metrics.to_json(), "metrics.json", "application/json")
+        c2.download_button("Export Prometheus", metrics.to_prometheus(), "metrics.prom", "text/plain")
+        if c3.button("Clear"):
+            metrics.reset()
+            st.rerun()
+
+
+def render(user):
+    show_settings(user)
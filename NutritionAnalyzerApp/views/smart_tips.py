@@ -0,0 +1,15 @@
+import streamlit as st
+
+TIPS = [
+    "Drink 2–3 liters of water daily.",
+    "Sleep 7–8 hours for recovery.",
+    "Combine cardio & strength training.",
+    "Avoid sugary drinks.",
+    "Eat whole grains & fresh vegetables."
+]
+
+
+def render(user):
+    st.header("AI Smart Recommendations")
+    for t in TIPS:
+        st.success("✅ " + t)
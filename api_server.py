@@ -0,0 +1,257 @@
+import asyncio
+import json
+import os
+import sys
+import weakref
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from aiohttp import web
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "NutritionAnalyzerApp")
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from health_backend import HealthBackend
+from log_store import LOG_KINDS
+from user_store import ACTIVITY_LEVELS, GOALS, USER_ID_RE, UserStore
+from new_backend import compute_profile, generate_nutrition_plan, load_all_databases, make_food_entry
+from food_search import get_food_index
+from instrumentation import metrics, timer
+
+# ---------------- HTTP/JSON API ---------------- #
+# Serves HealthBackend and the nutrition functions to many clients at once.
+# Reference data (food/exercise/symptom tables and the search index) is
+# loaded once and shared; profiles and per-user log stores come from a
+# UserStore. Blocking work (SQLite, pandas) runs in worker threads.
+#
+#   python api_server.py [--port 8080] [--data-dir api_data]
+
+MAX_CONCURRENT_REQUESTS = 64
+MAX_CONCURRENT_PER_USER = 4
+
+
+# ---------------- helpers ---------------- #
+def _json(data, status=200):
+    return web.json_response(data, status=status, dumps=lambda o: json.dumps(o, default=_default))
+
+
+def _default(o):
+    if hasattr(o, "item"):
+        return o.item()
+    raise TypeError(f"{type(o).__name__} is not JSON serializable")
+
+
+def _user_id(request):
+    user_id = request.match_info["user_id"]
+    if not USER_ID_RE.match(user_id):
+        raise web.HTTPBadRequest(reason="invalid user id")
+    return user_id
+
+
+def _user_limit(request, user_id):
+    """The user's write semaphore; it lives only while some request holds it."""
+    limits = request.app["user_limits"]
+    limit = limits.get(user_id)
+    if limit is None:
+        limit = limits[user_id] = asyncio.Semaphore(MAX_CONCURRENT_PER_USER)
+    return limit
+
+
+def _open_store(users, user_id, create):
+    store = users.acquire(user_id, create=create)
+    if store is None and users.get_profile(user_id) is not None:
+        store = users.acquire(user_id)  # a profile without logs yet, e.g. bulk imported
+    return store
+
+
+@asynccontextmanager
+async def _log_store(request, user_id, create=False):
+    """The user's LogStore from the UserStore (opened off the event loop),
+    held so LRU eviction can't close it mid-request. Reads (create=False)
+    answer 404 for a user with neither a profile nor logs."""
+    users = request.app["users"]
+    store = await asyncio.to_thread(_open_store, users, user_id, create)
+    if store is None:
+        raise web.HTTPNotFound(reason="unknown user")
+    try:
+        yield store
+    finally:
+        # only closes anything if the store was evicted while held
+        users.release(store)
+
+
+def _today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+async def _body(request):
+    try:
+        return await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(reason="body is not valid JSON")
+
+
+def _int_param(request, name, default, lo, hi):
+    try:
+        value = int(request.query.get(name, default))
+    except ValueError:
+        raise web.HTTPBadRequest(reason=f"{name} must be an integer")
+    return max(lo, min(value, hi))
+
+
+@web.middleware
+async def concurrency_limit(request, handler):
+    async with request.app["limit"]:
+        route = request.match_info.route.resource
+        with timer(f"api.{request.method} {route.canonical if route else 'unmatched'}"):
+            return await handler(request)
+
+
+# ---------------- handlers ---------------- #
+async def health(request):
+    return _json({"status": "ok"})
+
+
+async def get_metrics(request):
+    """Prometheus text by default, ?format=json for the JSON report."""
+    if request.query.get("format") == "json":
+        return web.Response(text=metrics.to_json(), content_type="application/json")
+    return web.Response(text=metrics.to_prometheus(), content_type="text/plain")
+
+
+async def search_food(request):
+    query = request.query.get("q", "")
+    k = _int_param(request, "k", 20, 1, 100)
+    df_food = request.app["df_food"]
+    rows = df_food.iloc[get_food_index(df_food).search(query, k=k)]
+    cols = [c for c in ["Dish Name", "Calories per Serving", "Protein per Serving (g)",
+                        "Carbohydrates (g)", "Fats (g)", "Serving Unit"] if c in rows.columns]
+    return _json(rows[cols].where(rows[cols].notna(), None).to_dict("records"))
+
+
+async def put_profile(request):
+    user_id = _user_id(request)
+    body = await _body(request)
+    try:
+        args = [body["name"], int(body["age"]), body["gender"], float(body["height"]),
+                float(body["weight"]), body["activity"], body["goal"], int(body.get("water_goal", 2500))]
+    except (KeyError, TypeError, ValueError) as e:
+        raise web.HTTPBadRequest(reason=f"bad profile: {e}")
+    if args[5] not in ACTIVITY_LEVELS or args[6] not in GOALS:
+        raise web.HTTPBadRequest(reason="unknown activity level or goal")
+    async with _user_limit(request, user_id):
+        profile = compute_profile(*args)
+        await asyncio.to_thread(request.app["users"].save_profile, user_id, profile)
+        async with _log_store(request, user_id, create=True) as store:
+            if await asyncio.to_thread(store.count, "weight_log") == 0:
+                await asyncio.to_thread(store.append, "weight_log", {"Date": _today(), "Weight": args[4]})
+    return _json(profile)
+
+
+async def get_profile(request):
+    user_id = _user_id(request)
+    profile = await asyncio.to_thread(request.app["users"].get_profile, user_id)
+    if profile is None:
+        raise web.HTTPNotFound(reason="no profile")
+    return _json(profile)
+
+
+async def get_stats(request):
+    user_id = _user_id(request)
+    day = request.query.get("date", _today())
+    async with _user_limit(request, user_id):
+        async with _log_store(request, user_id) as store:
+            return _json(await asyncio.to_thread(store.totals, day))
+
+
+async def get_plan(request):
+    user_id = _user_id(request)
+    profile = await asyncio.to_thread(request.app["users"].get_profile, user_id)
+    if profile is None:
+        raise web.HTTPNotFound(reason="no profile")
+    try:
+        plan = generate_nutrition_plan(profile)
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        raise web.HTTPUnprocessableEntity(reason="profile is incomplete; PUT the profile to set targets")
+    return _json(plan)
+
+
+async def post_log(request):
+    user_id = _user_id(request)
+    kind = request.match_info["kind"]
+    if kind not in LOG_KINDS:
+        raise web.HTTPNotFound(reason="unknown log")
+    body = await _body(request)
+    rows = body if isinstance(body, list) else [body]
+    if not rows or not all(isinstance(row, dict) for row in rows):
+        raise web.HTTPBadRequest(reason="expected a JSON object or a non-empty list of objects")
+    now = datetime.now()
+    entries = []
+    for row in rows:
+        if kind == "food_log" and "Dish" not in row:
+            # {"dish": ..., "quantity": ..., "meal_type": ...} -> priced from the food DB
+            df_food = request.app["df_food"]
+            hits = get_food_index(df_food).search(str(row.get("dish", "")), k=1)
+            if not hits:
+                raise web.HTTPBadRequest(reason=f"unknown dish {row.get('dish')!r}")
+            try:
+                quantity = float(row.get("quantity", 1))
+            except (TypeError, ValueError):
+                raise web.HTTPBadRequest(reason="quantity must be a number")
+            entries.append(make_food_entry(df_food.iloc[hits[0]], quantity, now, now, row.get("meal_type", "Snack")))
+        else:
+            # every stored row needs a day; it defaults to today
+            row.setdefault("Date", now.strftime("%Y-%m-%d"))
+            try:
+                datetime.strptime(str(row["Date"])[:10], "%Y-%m-%d")
+            except ValueError:
+                raise web.HTTPBadRequest(reason=f"bad Date {row['Date']!r}, expected YYYY-MM-DD")
+            entries.append(row)
+    async with _user_limit(request, user_id):
+        async with _log_store(request, user_id, create=True) as store:
+            n = await asyncio.to_thread(store.append, kind, entries)
+    return _json({"logged": n, "entries": entries}, status=201)
+
+
+async def analyze_device(request):
+    address = request.match_info["address"]
+    backend = request.app["backend"]
+    return _json(await backend.retrieve_and_analyze(address))
+
+
+# ---------------- app ---------------- #
+def create_app(data_dir="api_data", max_concurrent=MAX_CONCURRENT_REQUESTS, backend=None):
+    app = web.Application(middlewares=[concurrency_limit])
+    app["data_dir"] = data_dir
+    app["users"] = UserStore(data_dir)
+    app["user_limits"] = weakref.WeakValueDictionary()
+    app["limit"] = asyncio.Semaphore(max_concurrent)
+    app["backend"] = backend or HealthBackend()
+    # shared, read-only reference data
+    app["df_food"], app["df_ex"], app["df_sym"] = load_all_databases()
+    get_food_index(app["df_food"])
+
+    app.router.add_get("/health", health)
+    app.router.add_get("/metrics", get_metrics)
+    app.router.add_get("/foods/search", search_food)
+    app.router.add_put("/users/{user_id}/profile", put_profile)
+    app.router.add_get("/users/{user_id}/profile", get_profile)
+    app.router.add_get("/users/{user_id}/stats", get_stats)
+    app.router.add_get("/users/{user_id}/plan", get_plan)
+    app.router.add_post("/users/{user_id}/logs/{kind}", post_log)
+    app.router.add_post("/devices/{address}/analyze", analyze_device)
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Health & nutrition HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data-dir", default="api_data")
+    parser.add_argument("--metrics", action="store_true", help="record timings, served at /metrics")
+    args = parser.parse_args()
+    metrics.enabled = metrics.enabled or args.metrics
+    web.run_app(create_app(args.data_dir), host=args.host, port=args.port)
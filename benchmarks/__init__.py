@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Benchmarks run from the repository root (python -m benchmarks.<name>).
+# The app modules live in NutritionAnalyzerApp/ and import each other by
+# plain module name, so put both directories on the path.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT, "NutritionAnalyzerApp")
+for _p in (APP_DIR, ROOT):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
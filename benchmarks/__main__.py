@@ -0,0 +1,335 @@
+"""Benchmark suite: times the backend hot paths on synthetic data and
+compares them with a saved baseline. Runs headless (no Streamlit session,
+no Bluetooth adapter).
+
+    python -m benchmarks                       # all cases, JSON on stdout
+    python -m benchmarks food_search hr        # only cases matching these
+    python -m benchmarks --quick --out run.json
+    python -m benchmarks --save-baseline       # write benchmarks/baseline.json
+    python -m benchmarks --compare             # exit 1 on a regression
+
+The bench_*.py modules next to this one are the detailed, one-feature
+benchmarks (old vs new implementations, correctness checks); this suite is
+the quick "did anything get slower" run over all of them.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import benchmarks  # noqa: F401  (path setup)
+from benchmarks import synthetic
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+THRESHOLD = 1.25  # slower than baseline by more than this factor is a regression
+
+CASES = {}
+
+
+def case(name, repeats=7):
+    """Register a case; the decorated function does the setup and returns
+    (fn, items): fn is what gets timed, items how many things one call handles."""
+    def register(setup):
+        CASES[name] = (setup, repeats)
+        return setup
+    return register
+
+
+class Context:
+    """Data shared by the cases, built on first use."""
+
+    def __init__(self, scale, tmp):
+        self.scale = scale
+        self.tmp = tmp
+        self._store = None
+
+    def n(self, full):
+        return max(1, int(full * self.scale))
+
+    def open_store(self):
+        # one user with years of logs, as the app's default user so the
+        # new_backend helpers (get_daily_stats, ...) read it
+        if self._store is None:
+            import new_backend
+            new_backend.FILES["user_data"] = os.path.join(self.tmp, "user_data")
+            new_backend._user_store.clear()
+            profile = synthetic.make_users(1)[0]
+            new_backend.get_user_store().save_profile(new_backend.DEFAULT_USER, profile)
+            self._store = new_backend.get_log_store()
+            self.rows = synthetic.fill_store(self._store, synthetic.make_logs(profile, years=self.n(5)))
+        return self._store
+
+
+# ---------------- cases ---------------- #
+@case("load_all_databases.cold", repeats=3)
+def _load_cold(ctx):
+    from new_backend import load_all_databases
+    from reference_data import invalidate
+
+    def fn():
+        invalidate()
+        load_all_databases()
+    return fn, 1
+
+
+@case("load_all_databases.warm")
+def _load_warm(ctx):
+    from new_backend import load_all_databases
+    load_all_databases()
+    return load_all_databases, 1
+
+
+@case("food_search")
+def _food_search(ctx):
+    import random
+    from food_search import search_foods
+    from new_backend import load_food_database
+    df_food = load_food_database()
+    rng = random.Random(0)
+    names = df_food["Dish Name"].astype(str).tolist()
+    queries = []
+    for _ in range(ctx.n(200)):
+        name = rng.choice(names).lower()
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(name[:rng.randint(3, 8)])           # typing a prefix
+        elif kind < 0.7:
+            queries.append(synthetic.typo(name, rng))          # a typo
+        else:
+            queries.append(rng.choice(name.split()))           # one word
+    search_foods(df_food, "warm up", k=25)
+    return lambda: [search_foods(df_food, q, k=25) for q in queries], len(queries)
+
+
+@case("activity_search")
+def _activity_search(ctx):
+    from activity_search import activities_to_burn, search_activities
+    from benchmarks.bench_activity_search import queries
+    from new_backend import FILES
+    from reference_data import load_table
+    df_ex = load_table(FILES["exercise_db"])
+    qs = queries(df_ex, ctx.n(200))
+    search_activities(df_ex, "warm up")
+
+    def fn():
+        for q in qs:
+            search_activities(df_ex, q)
+        activities_to_burn(df_ex, 300, 70.0)
+    return fn, len(qs) + 1
+
+
+@case("asana_search")
+def _asana_search(ctx):
+    import asana_index
+    from benchmarks.bench_asana_index import QUERIES
+    asana_index.get_asana_index()
+    return lambda: [asana_index.search_asanas(q) for q in QUERIES], len(QUERIES)
+
+
+@case("symptom_index")
+def _symptom_index(ctx):
+    import random
+    import symptom_index
+    from new_backend import FILES
+    from reference_data import load_table
+    df_sym = load_table(FILES["symptom_db"])
+    index = symptom_index.get_symptom_index(df_sym)
+    rng = random.Random(0)
+    picks = [rng.sample(index.symptoms, rng.randint(1, 4)) for _ in range(ctx.n(200))]
+    dishes = ["Samosa", "Masala Chai", "Dal Tadka", "Cola", "Paneer Tikka"]
+
+    def fn():
+        for p in picks:
+            index.rank_causes(p)
+            index.check_log(p, dishes)
+    return fn, len(picks)
+
+
+@case("get_daily_stats")
+def _daily_stats(ctx):
+    from new_backend import get_daily_stats
+    ctx.open_store()
+    return get_daily_stats, 1
+
+
+@case("get_streak")
+def _streak(ctx):
+    from new_backend import get_streak
+    ctx.open_store()
+    return get_streak, 1
+
+
+@case("analytics.rebuild", repeats=5)
+def _analytics_cold(ctx):
+    import log_analytics
+    store = ctx.open_store()
+
+    def fn():
+        log_analytics._cache.clear()
+        log_analytics.get_aggregates(store)
+    return fn, 1
+
+
+@case("analytics.rerun")
+def _analytics_warm(ctx):
+    import log_analytics
+    store = ctx.open_store()
+    days = store.days("food_log")
+    picks = days[::max(1, len(days) // 20)]
+
+    def fn():
+        agg = log_analytics.get_aggregates(store)
+        for d in picks:
+            agg.day(d)
+        agg.calories("daily"), agg.calories("weekly"), agg.calories("monthly")
+    return fn, 1
+
+
+@case("health_analyzer.daily_summary", repeats=3)
+def _daily_summary(ctx):
+    from health_analyzer import HealthAnalyzer
+    n = ctx.n(5000)
+    cols = synthetic.make_health_days(n)
+    meals = cols.pop("meals")
+    args = [(cols["sleep_hours"][i].item(), cols["deep_sleep"][i].item(), cols["rem_sleep"][i].item(),
+             cols["heart_rate"][i].item(), cols["screen_time"][i].item(), cols["pickups"][i].item(),
+             cols["breaks"][i].item(), {k: v[i].item() for k, v in meals.items()}) for i in range(n)]
+    goals = synthetic.NUTRITION_GOALS
+    return lambda: [HealthAnalyzer(*a, goals, []).daily_summary() for a in args], n
+
+
+@case("health_analyzer.batch", repeats=5)
+def _daily_summary_batch(ctx):
+    from health_analyzer import BatchHealthAnalyzer
+    n = ctx.n(5000)
+    cols = synthetic.make_health_days(n)
+    meals = cols.pop("meals")
+    batch = BatchHealthAnalyzer(meals=meals, nutrition_goals=synthetic.NUTRITION_GOALS,
+                                dates=["2026-01-01"] * n, **cols)
+    return batch.daily_summaries, n
+
+
+@case("chatbot.match", repeats=3)
+def _chatbot(ctx):
+    from spellchecker import SpellChecker
+    from symptom_matcher import SymptomMatcher
+    conditions = synthetic.make_conditions(ctx.n(5000))
+    messages = synthetic.make_messages(conditions, ctx.n(100))
+    matcher = SymptomMatcher(conditions, SpellChecker())
+    return lambda: [matcher.lookup(matcher.correct(m)) for m in messages], len(messages)
+
+
+@case("hr.decode")
+def _hr_decode(ctx):
+    from hr_parser import parse_hr_measurement
+    packets = synthetic.make_hr_stream(ctx.n(20000))
+    return lambda: [parse_hr_measurement(p) for p in packets], len(packets)
+
+
+@case("hr.decode_batch")
+def _hr_decode_batch(ctx):
+    from hr_parser import pack_packets, parse_hr_batch
+    packets = synthetic.make_hr_stream(ctx.n(20000))
+    buffer, offsets = pack_packets(packets)
+    return lambda: parse_hr_batch(buffer, offsets), len(packets)
+
+
+# ---------------- runner ---------------- #
+def measure(fn, items, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    median = statistics.median(times)
+    return {"ms": round(median * 1000, 3), "min_ms": round(min(times) * 1000, 3),
+            "items": items, "us_per_item": round(median / items * 1e6, 3), "repeats": repeats}
+
+
+def run(patterns=(), scale=1.0):
+    tmp = tempfile.mkdtemp(prefix="bench-")
+    try:
+        ctx = Context(scale, tmp)
+        results = {}
+        for name, (setup, repeats) in CASES.items():
+            if patterns and not any(p in name for p in patterns):
+                continue
+            fn, items = setup(ctx)
+            fn()  # warm-up, so import and first-call costs stay out of the numbers
+            results[name] = measure(fn, items, repeats)
+        meta = {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": scale,
+            "log_rows": getattr(ctx, "rows", None),
+            "streamlit_imported": "streamlit" in sys.modules,
+        }
+        return {"meta": meta, "results": results}
+    finally:
+        if ctx._store is not None:
+            ctx._store.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def compare(report, baseline, threshold=THRESHOLD):
+    """{case: ratio} for cases in both, and the names that regressed."""
+    ratios, regressed = {}, []
+    for name, res in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base["us_per_item"]:
+            continue
+        ratio = res["us_per_item"] / base["us_per_item"]
+        ratios[name] = round(ratio, 3)
+        if ratio > threshold:
+            regressed.append(name)
+    return ratios, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help="substrings of the case names to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="a fifth of the data, for a fast check")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every data size by this")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write the report to {BASELINE}")
+    parser.add_argument("--compare", nargs="?", const=BASELINE, metavar="BASELINE",
+                        help="compare with a saved report (default: the saved baseline)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        return 0
+    report = run(args.cases, args.scale * (0.2 if args.quick else 1.0))
+    status = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("scale") != report["meta"]["scale"]:
+            print(f"note: baseline was run at scale {baseline['meta'].get('scale')}", file=sys.stderr)
+        ratios, regressed = compare(report, baseline, args.threshold)
+        report["compare"] = {"baseline": args.compare, "threshold": args.threshold,
+                             "ratios": ratios, "regressed": regressed}
+        for name, ratio in ratios.items():
+            flag = "  REGRESSED" if name in regressed else ""
+            print(f"{name:34s} {ratio:6.2f}x{flag}", file=sys.stderr)
+        status = 1 if regressed else 0
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    for path in filter(None, [args.out, BASELINE if args.save_baseline else None]):
+        with open(path, "w") as f:
+            f.write(text + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Exercise Tracker search over the Compendium of Physical Activities: the
+old per-keystroke str.contains scan vs activity_search's token index, and
+the "minutes to burn N kcal" query vs computing it for every row. Checks
+that indexed matches are a subset of the substring matches and that the
+burn planner returns the same quickest activities as the brute force.
+
+    python -m benchmarks.bench_activity_search [queries]
+"""
+import json
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import benchmarks  # noqa: F401  (sets up sys.path)
+import activity_search
+from new_backend import FILES
+from reference_data import load_table
+from text_index import tokens
+
+WEIGHT = 70.0
+
+
+def naive(df_ex, query, minutes=30):
+    """What show_fitness did on every keystroke before the index."""
+    matches = df_ex[df_ex["Description"].str.lower().str.contains(query.lower(), regex=False)]
+    return matches["MET Value"] * (minutes / 60) * WEIGHT
+
+
+def naive_burn(df_ex, kcal, max_minutes, k=10):
+    met = pd.to_numeric(df_ex["MET Value"], errors="coerce").fillna(0.0).to_numpy()
+    with np.errstate(divide="ignore"):
+        minutes = kcal * 60.0 / (met * WEIGHT)
+    ok = (minutes >= activity_search.MIN_MINUTES) & (minutes <= max_minutes)
+    return np.sort(minutes[ok])[:k]
+
+
+def queries(df_ex, n, seed=0):
+    rng = random.Random(seed)
+    words = sorted({w for d in df_ex["Description"].dropna() for w in tokens(d) if len(w) > 3})
+    out = []
+    for _ in range(n):
+        w = rng.choice(words)
+        out.append(w[:rng.randint(3, len(w))] if rng.random() < 0.5 else w)  # mid-typing or a whole word
+    return out
+
+
+def _per_call(fn, qs):
+    t0 = time.perf_counter()
+    for q in qs:
+        fn(q)
+    return (time.perf_counter() - t0) / len(qs)
+
+
+def run(n_queries=300):
+    df_ex = load_table(FILES["exercise_db"])
+    qs = queries(df_ex, n_queries)
+
+    slow = _per_call(lambda q: naive(df_ex, q), qs)
+    t0 = time.perf_counter()
+    index = activity_search.get_activity_index(df_ex)
+    build = time.perf_counter() - t0
+    fast = _per_call(lambda q: activity_search.search_activities(df_ex, q, minutes=30, weight=WEIGHT), qs)
+    facets = _per_call(lambda q: activity_search.activity_facets(df_ex, q), qs)
+
+    subset = True
+    for q in qs[:50]:
+        rows = index.search(q, k=index.size)
+        subset = subset and set(rows) <= set(np.flatnonzero(df_ex["Description"].str.lower()
+                                                            .str.contains(q, regex=False).to_numpy()))
+
+    targets = [(kcal, mx) for kcal in (100, 250, 400, 800) for mx in (30, 60, 120)]
+    burn_slow = _per_call(lambda t: naive_burn(df_ex, *t), targets)
+    burn_fast = _per_call(lambda t: index.minutes_to_burn(t[0], WEIGHT, max_minutes=t[1]), targets)
+    burn_ok = all(np.allclose(np.sort(index.minutes_to_burn(kcal, WEIGHT, max_minutes=mx)[1]),
+                              naive_burn(df_ex, kcal, mx)) for kcal, mx in targets)
+
+    return {
+        "activities": len(df_ex),
+        "queries": len(qs),
+        "naive_search_ms": round(slow * 1000, 3),
+        "index_build_ms": round(build * 1000, 2),
+        "indexed_search_ms": round(fast * 1000, 3),
+        "facet_counts_ms": round(facets * 1000, 3),
+        "speedup": round(slow / fast, 1),
+        "naive_burn_ms": round(burn_slow * 1000, 3),
+        "indexed_burn_ms": round(burn_fast * 1000, 3),
+        "matches_subset_of_naive": bool(subset),
+        "burn_matches_naive": bool(burn_ok),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print(json.dumps(run(*args), indent=2))
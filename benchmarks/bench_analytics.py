@@ -0,0 +1,111 @@
+"""Analytics page data over 5 years of synthetic logs: the old per-rerun
+pipeline (read every food event, to_datetime, groupby, resample, filter)
+vs log_analytics' version-keyed aggregates, with a check that both give the
+same numbers before and after a new entry is logged.
+
+    python -m benchmarks.bench_analytics [years] [reruns]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+import benchmarks  # noqa: F401  (sets up sys.path)
+import log_analytics
+from log_store import LogStore
+
+MEALS = ("Breakfast", "Lunch", "Dinner", "Snack")
+
+
+def fill(store, years, seed=0):
+    rng = np.random.default_rng(seed)
+    start = date.today() - timedelta(days=365 * years)
+    food, water = [], []
+    for d in range(365 * years):
+        day = (start + timedelta(days=d)).strftime("%Y-%m-%d")
+        if rng.random() < 0.1:  # some days only have water logged
+            water.append({"Date": day, "Time": "09:00:00", "Beverage": "Water",
+                          "Volume_ml": 250, "Effective_Hydration_ml": 250.0})
+            continue
+        for meal in MEALS[:rng.integers(2, 5)]:
+            kcal = float(rng.uniform(150, 900))
+            food.append({"Date": day, "Time": "12:00:00", "Dish": "Dish", "Meal Type": meal, "Quantity": 1.0,
+                         "Calories": kcal, "Protein": kcal * 0.05, "Carbs": kcal * 0.12, "Fats": kcal * 0.03})
+    store.append("food_log", food)
+    store.append("water_log", water)
+    return len(food)
+
+
+def naive(store, selected):
+    """What show_analytics_ad computed on every rerun before the cache."""
+    food_log = store.history("food_log")
+    food_log["Date"] = pd.to_datetime(food_log["Date"])
+    daily = food_log.groupby("Date")["Calories"].sum().reset_index()
+    day = food_log[food_log["Date"] == pd.to_datetime(selected)]
+    macros = (day["Protein"].sum(), day["Carbs"].sum(), day["Fats"].sum())
+    weekly = food_log.set_index("Date").resample("W")["Calories"].sum().reset_index()
+    return daily, macros, weekly
+
+
+def cached(store, selected):
+    agg = log_analytics.get_aggregates(store)
+    return agg.calories("daily"), agg.day(selected), agg.calories("weekly")
+
+
+def same(a, b):
+    return (np.array_equal(a[0]["Date"], b[0]["Date"]) and np.allclose(a[0]["Calories"], b[0]["Calories"])
+            and np.allclose(a[1], b[1])
+            and np.array_equal(a[2]["Date"], b[2]["Date"]) and np.allclose(a[2]["Calories"], b[2]["Calories"]))
+
+
+def _per_call(fn, store, dates):
+    t0 = time.perf_counter()
+    for d in dates:
+        fn(store, d)
+    return (time.perf_counter() - t0) / len(dates)
+
+
+def run(years=5, reruns=20):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LogStore(os.path.join(tmp, "logs.sqlite"))
+        rows = fill(store, years)
+        days = store.days("food_log")
+        dates = [days[i] for i in np.linspace(0, len(days) - 1, reruns).astype(int)]
+
+        slow = _per_call(naive, store, dates)
+        t0 = time.perf_counter()
+        log_analytics.get_aggregates(store)
+        build = time.perf_counter() - t0
+        warm = _per_call(cached, store, dates)
+        ok = all(same(naive(store, d), cached(store, d)) for d in dates[:5])
+
+        # a new entry has to show up on the next rerun
+        today = date.today().strftime("%Y-%m-%d")
+        store.append("food_log", {"Date": today, "Time": "20:00:00", "Dish": "Late snack", "Meal Type": "Snack",
+                                  "Quantity": 1.0, "Calories": 321.0, "Protein": 9.0, "Carbs": 40.0, "Fats": 12.0})
+        t0 = time.perf_counter()
+        after = cached(store, today)
+        rebuild = time.perf_counter() - t0
+        ok = ok and same(naive(store, today), after)
+        store.close()
+
+    return {
+        "years": years,
+        "food_rows": rows,
+        "naive_rerun_ms": round(slow * 1000, 2),
+        "cache_build_ms": round(build * 1000, 2),
+        "cached_rerun_ms": round(warm * 1000, 3),
+        "rebuild_after_append_ms": round(rebuild * 1000, 2),
+        "speedup": round(slow / warm, 1),
+        "matches_naive": bool(ok),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    print(json.dumps(run(*args), indent=2))
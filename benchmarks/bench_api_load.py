@@ -0,0 +1,85 @@
+"""Load test for api_server against a local instance.
+
+    python -m benchmarks.bench_api_load [users] [concurrency] [requests]
+"""
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+
+from aiohttp import ClientSession, web
+
+import benchmarks  # noqa: F401  (path setup)
+from api_server import create_app
+
+QUERIES = ["paneer", "rice", "dal", "chiken", "aloo", "tea", "idli", "dosa", "egg", "soup"]
+
+
+async def _drive(users, concurrency, total):
+    with tempfile.TemporaryDirectory() as data_dir:
+        runner = web.AppRunner(create_app(data_dir))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        base = f"http://127.0.0.1:{port}"
+        latencies = []
+        errors = 0
+
+        async with ClientSession() as http:
+            for u in range(users):
+                await http.put(f"{base}/users/u{u}/profile", json={
+                    "name": f"user{u}", "age": 30, "gender": "Female", "height": 165, "weight": 60,
+                    "activity": "Lightly Active", "goal": "Maintain"})
+
+            rng = random.Random(0)
+
+            def next_request():
+                u = f"u{rng.randrange(users)}"
+                r = rng.random()
+                if r < 0.4:
+                    return "GET", f"{base}/foods/search?q={rng.choice(QUERIES)}&k=10", None
+                if r < 0.7:
+                    return "GET", f"{base}/users/{u}/stats", None
+                if r < 0.8:
+                    return "GET", f"{base}/users/{u}/plan", None
+                return "POST", f"{base}/users/{u}/logs/food_log", {"dish": rng.choice(QUERIES), "quantity": 1}
+
+            requests = [next_request() for _ in range(total)]
+
+            async def worker(chunk):
+                nonlocal errors
+                for method, url, body in chunk:
+                    t0 = time.perf_counter()
+                    async with http.request(method, url, json=body) as resp:
+                        await resp.read()
+                        if resp.status >= 400:
+                            errors += 1
+                    latencies.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            await asyncio.gather(*(worker(requests[i::concurrency]) for i in range(concurrency)))
+            elapsed = time.perf_counter() - t0
+        await runner.cleanup()
+
+    latencies.sort()
+    return {
+        "users": users,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "requests_per_sec": round(total / elapsed, 1),
+        "latency_ms_p50": round(latencies[len(latencies) // 2] * 1000, 2),
+        "latency_ms_p99": round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+    }
+
+
+def run(users=50, concurrency=32, total=3000):
+    return asyncio.run(_drive(users, concurrency, total))
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    print(json.dumps(run(*args), indent=2))
@@ -0,0 +1,89 @@
+"""Yoga asana search: parsing data/final_asan1_1.csv with pandas on demand
+vs the one-time build and the lazily loaded asana_index.npz, then query
+latency. Checks the indexed BM25 scores against a from-scratch computation
+over the raw text, and that no result is contraindicated for a condition
+the query asked to avoid.
+
+    python -m benchmarks.bench_asana_index [repeats]
+"""
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+import benchmarks  # noqa: F401  (sets up sys.path)
+import asana_index
+
+QUERIES = ["back pain, beginner, no high blood pressure", "digestion, intermediate", "stress, no heart problems",
+           "insomnia", "flexibility of the spine, no sciatica, no hernia", "constipation, beginner",
+           "concentration and memory", "menstrual problems, no pregnancy"]
+
+
+def brute_bm25(texts, query):
+    docs = [Counter(asana_index.terms(t)) for t in texts]
+    lengths = [sum(d.values()) for d in docs]
+    avg = sum(lengths) / len(lengths)
+    scores = np.zeros(len(docs))
+    for term in dict.fromkeys(asana_index.terms(query)):
+        df = sum(term in d for d in docs)
+        idf = math.log1p((len(docs) - df + 0.5) / (df + 0.5))
+        for i, d in enumerate(docs):
+            tf = d.get(term, 0)
+            if tf:
+                scores[i] += idf * tf * (asana_index.K1 + 1) / (
+                    tf + asana_index.K1 * (1 - asana_index.B + asana_index.B * lengths[i] / avg))
+    return scores
+
+
+def _time(fn, repeats):
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - t0) / repeats
+
+
+def run(repeats=20):
+    pandas_parse = _time(lambda: pd.read_csv(asana_index.SOURCE_PATH), repeats)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "asana_index.npz")
+        t0 = time.perf_counter()
+        asana_index.write_index(path)
+        build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        index = asana_index.get_asana_index(path)
+        load = time.perf_counter() - t0
+        query = _time(lambda: [asana_index.search_asanas(q, path=path) for q in QUERIES], repeats) / len(QUERIES)
+
+        texts = index.records["Benefits"].tolist()
+        contra = index.records["Contraindications"].str.lower()
+        bm25_ok = safe = True
+        for q in QUERIES:
+            benefit, levels, avoid = asana_index.parse_query(q)
+            fast = index.fields["Benefits"].bm25(asana_index.terms(benefit), index.size)
+            bm25_ok = bm25_ok and np.allclose(fast, brute_bm25(texts, benefit))
+            for row in index.search(benefit, levels, avoid, k=index.size):
+                text = set(asana_index.terms(contra.iloc[row]))
+                safe = safe and not any(set(asana_index.terms(a)) <= text for a in avoid)
+        size = os.path.getsize(path)
+
+    return {
+        "asanas": index.size,
+        "pandas_read_csv_ms": round(pandas_parse * 1000, 2),
+        "index_build_ms": round(build * 1000, 2),
+        "index_load_ms": round(load * 1000, 2),
+        "index_kib": round(size / 1024, 1),
+        "query_ms": round(query * 1000, 3),
+        "bm25_matches_brute_force": bool(bm25_ok),
+        "no_contraindicated_results": bool(safe),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print(json.dumps(run(*args), indent=2))
@@ -0,0 +1,81 @@
+"""Multi-device HR ingestion against simulated Bleak clients.
+
+    python -m benchmarks.bench_ble_ingest [devices] [seconds] [rate_hz]
+"""
+import asyncio
+import functools
+import json
+import random
+import sys
+
+import benchmarks  # noqa: F401  (path setup)
+from ble_ingest import HeartRateIngestService
+from hr_parser import RR_RESOLUTION, build_hr_measurement
+
+
+class FakeBleakClient:
+    """Stands in for bleak.BleakClient: emits HR notifications at `rate_hz`
+    and drops the link now and then so reconnects get exercised."""
+
+    def __init__(self, address, disconnected_callback=None, rate_hz=1.0,
+                 disconnect_prob=0.001, connect_delay=0.01):
+        self.address = address
+        self.disconnected_callback = disconnected_callback
+        self.rate_hz = rate_hz
+        self.disconnect_prob = disconnect_prob
+        self.connect_delay = connect_delay
+        self.is_connected = False
+        self._emitter = None
+        self._rng = random.Random(address)
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.connect_delay)
+        self.is_connected = True
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop_notify(None)
+        self.is_connected = False
+
+    async def start_notify(self, _uuid, callback):
+        self._emitter = asyncio.create_task(self._emit(callback))
+
+    async def stop_notify(self, _uuid):
+        if self._emitter is not None:
+            self._emitter.cancel()
+            self._emitter = None
+
+    def packet(self, hr):
+        rr = int(60.0 / hr * RR_RESOLUTION)
+        return bytearray(build_hr_measurement(hr, sensor_contact=True, rr_intervals=(rr,)))
+
+    async def _emit(self, callback):
+        hr = self._rng.randint(55, 90)
+        period = 1.0 / self.rate_hz
+        # stagger devices so they don't all fire on the same tick
+        await asyncio.sleep(self._rng.uniform(0, period))
+        while True:
+            hr = min(200, max(40, hr + self._rng.randint(-2, 2)))
+            callback(None, self.packet(hr))
+            if self._rng.random() < self.disconnect_prob:
+                self.is_connected = False
+                if self.disconnected_callback:
+                    self.disconnected_callback(self)
+                return
+            await asyncio.sleep(period * self._rng.uniform(0.9, 1.1))
+
+
+def run(devices=200, seconds=5.0, rate_hz=4.0):
+    factory = functools.partial(FakeBleakClient, rate_hz=rate_hz)
+    service = HeartRateIngestService([f"AA:BB:{i:06X}" for i in range(devices)],
+                                     client_factory=factory, backoff_initial=0.05)
+    stats = asyncio.run(service.run_for(seconds))
+    stats["expected_samples_per_sec"] = devices * rate_hz
+    return stats
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    print(json.dumps(run(int(args[0]) if args else 200,
+                         float(args[1]) if len(args) > 1 else 5.0,
+                         float(args[2]) if len(args) > 2 else 4.0), indent=2))
@@ -0,0 +1,55 @@
+"""Food catalogue: offline build time, artifact size, and startup load time
+of the .npz artifact vs parsing the source CSVs it replaces.
+
+    python -m benchmarks.bench_food_catalogue [repeats]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import benchmarks
+import food_catalogue
+from reference_data import read_npz_table
+
+
+def _best(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(repeats=5):
+    sources = [os.path.join(benchmarks.ROOT, spec[0]) for spec in food_catalogue.SOURCES]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "food_catalogue.npz")
+        t0 = time.perf_counter()
+        df = food_catalogue.write_catalogue(path)
+        build = time.perf_counter() - t0
+        size = os.path.getsize(path)
+        load = _best(lambda: read_npz_table(path), repeats)
+
+    rows_in = sum(len(pd.read_csv(p)) for p in sources)
+    parse_all = _best(lambda: [pd.read_csv(p) for p in sources], repeats)
+    parse_one = _best(lambda: pd.read_csv(sources[0]), repeats)
+    return {
+        "source_rows": rows_in,
+        "catalogue_rows": len(df),
+        "build_s": round(build, 2),
+        "artifact_kib": round(size / 1024, 1),
+        "sources_kib": round(sum(os.path.getsize(p) for p in sources) / 1024, 1),
+        "load_artifact_ms": round(load * 1000, 1),
+        "parse_all_csvs_ms": round(parse_all * 1000, 1),
+        "parse_old_food_csv_ms": round(parse_one * 1000, 1),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print(json.dumps(run(*args), indent=2))
@@ -0,0 +1,80 @@
+"""Offline fuzzy join of symptom meal advice to the food catalogue: scoring
+every catalogue name per phrase vs the blocked shortlist, and the blocked
+build on one process vs a worker pool. Checks that blocking finds the same
+best match as the full scan for the confident links, and that the pool
+and the single process write identical tables.
+
+    python -m benchmarks.bench_food_links [jobs]
+"""
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+import benchmarks  # noqa: F401  (sets up sys.path)
+import food_links
+from food_catalogue import load_catalogue
+
+
+def full_scan(texts, blocker):
+    """Score every catalogue name, as a join without blocking would."""
+    fuzz = food_links._worker["fuzz"]
+    best = {}
+    for text in texts:
+        words = food_links._words(text)
+        query = " ".join(words)
+        top = (None, -1)
+        for i, variants in enumerate(blocker.variants):
+            for v in variants:
+                name = " ".join(v)
+                s = (fuzz.token_sort_ratio(query, name) + fuzz.token_set_ratio(query, name)) / 2
+                s = round(s * (0.6 + 0.4 * blocker.coverage(words, v)))
+                if s > top[1] or (s == top[1] and blocker.size[i] < blocker.size[top[0]]):
+                    top = (i, s)
+        best[text] = top
+    return best
+
+
+def run(jobs=None):
+    jobs = jobs or max(2, os.cpu_count() or 1)
+    df_sym = pd.read_csv(food_links.SYMPTOM_PATH)
+    df_food = load_catalogue()
+
+    t0 = time.perf_counter()
+    single = food_links.build_links(df_sym, df_food, jobs=1)
+    t_single = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    pooled = food_links.build_links(df_sym, df_food, jobs=jobs)
+    t_pool = time.perf_counter() - t0
+
+    blocker = food_links._worker["blocker"]
+    confident = single[(single["Rank"] == 0) & (single["Score"] >= food_links.MIN_CONFIDENCE)]
+    sample = confident.drop_duplicates("Component").head(15)
+    t0 = time.perf_counter()
+    scan = full_scan(sample["Component"].tolist(), blocker)
+    t_scan = (time.perf_counter() - t0) / len(sample)
+    t0 = time.perf_counter()
+    for text in sample["Component"]:
+        food_links._match(text)
+    t_block = (time.perf_counter() - t0) / len(sample)
+    same_best = all(scan[c][1] == s for c, s in zip(sample["Component"], sample["Score"]))
+
+    best = single[single["Rank"] == 0].drop_duplicates("Component")
+    return {
+        "phrases": len(best),
+        "catalogue_foods": len(df_food),
+        "linked_share": round(float((best["Score"] >= food_links.MIN_CONFIDENCE).mean()), 3),
+        "full_scan_ms_per_phrase": round(t_scan * 1000, 2),
+        "blocked_ms_per_phrase": round(t_block * 1000, 3),
+        "build_1_process_s": round(t_single, 3),
+        f"build_{jobs}_processes_s": round(t_pool, 3),
+        "blocked_best_score_matches_full_scan": bool(same_best),
+        "pool_matches_single_process": bool(single.equals(pooled)),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print(json.dumps(run(*args), indent=2))
@@ -0,0 +1,51 @@
+"""Per-instance HealthAnalyzer vs BatchHealthAnalyzer.
+
+    python -m benchmarks.bench_health_analyzer [n_user_days]
+"""
+import json
+import sys
+import time
+
+import benchmarks  # noqa: F401  (path setup)
+from benchmarks.synthetic import NUTRITION_GOALS, make_health_days
+from health_analyzer import BatchHealthAnalyzer, HealthAnalyzer
+
+def run(n=20000):
+    cols = make_health_days(n)
+    meals = cols.pop("meals")
+    dates = ["2026-01-01"] * n
+
+    t0 = time.perf_counter()
+    single = []
+    for i in range(n):
+        a = HealthAnalyzer(cols["sleep_hours"][i].item(), cols["deep_sleep"][i].item(),
+                           cols["rem_sleep"][i].item(), cols["heart_rate"][i].item(),
+                           cols["screen_time"][i].item(), cols["pickups"][i].item(),
+                           cols["breaks"][i].item(), {k: v[i].item() for k, v in meals.items()},
+                           NUTRITION_GOALS, [])
+        summary = a.daily_summary()
+        summary["date"] = dates[i]
+        single.append(summary)
+    t_single = time.perf_counter() - t0
+
+    batch = BatchHealthAnalyzer(meals=meals, nutrition_goals=NUTRITION_GOALS, dates=dates, **cols)
+    t0 = time.perf_counter()
+    frame = batch.to_frame()
+    t_frame = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    summaries = batch.daily_summaries()
+    t_summaries = time.perf_counter() - t0
+
+    return {
+        "user_days": n,
+        "identical": summaries == single and len(frame) == n,
+        "per_instance_s": round(t_single, 4),
+        "batch_frame_s": round(t_frame, 4),
+        "batch_summaries_s": round(t_summaries, 4),
+        "speedup_frame": round(t_single / t_frame, 1),
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(json.dumps(run(n), indent=2))
@@ -0,0 +1,87 @@
+"""Rolling HR/HRV engine: accuracy against batch NumPy and per-sample cost.
+
+    python -m benchmarks.bench_hr_analytics [hours]
+"""
+import json
+import sys
+import time
+
+import numpy as np
+
+import benchmarks  # noqa: F401  (path setup)
+from hr_analytics import DEFAULT_WINDOWS, RR_GAP_RESET, HeartRateAnalytics
+from hr_parser import RR_RESOLUTION
+
+
+def synthetic_stream(hours, seed=0):
+    """1 Hz samples, each carrying 0-2 RR intervals, with a few signal gaps."""
+    rng = np.random.default_rng(seed)
+    n = int(hours * 3600)
+    t = np.arange(n, dtype=np.float64) + rng.uniform(0, 0.2, n)
+    for start in rng.integers(0, n, 5):
+        t[start:] += rng.uniform(10, 120)   # dropout
+    hr = np.clip(65 + np.cumsum(rng.normal(0, 0.5, n)), 45, 180).round().astype(int)
+    rr_counts = rng.choice([0, 1, 1, 2], n)
+    rr = [tuple(int(x) for x in rng.normal(60000 / h * RR_RESOLUTION / 1000, 20, c)) for h, c in zip(hr, rr_counts)]
+    return t, hr, rr
+
+
+def reference(t, hr, rr, now, span, buckets):
+    """Batch NumPy version of one bucket-aligned window."""
+    width = span / buckets
+    current = int(now // width)
+    ids = np.floor(t / width).astype(np.int64)
+    live = (ids > current - buckets) & (ids <= current)
+
+    rr_t, rr_ms, diffs_t, diffs = [], [], [], []
+    prev, prev_t = None, None
+    for ti, sample in zip(t, rr):
+        if not sample:
+            continue
+        if prev is not None and ti - prev_t > RR_GAP_RESET:
+            prev = None
+        for x in sample:
+            ms = x * 1000.0 / RR_RESOLUTION
+            rr_t.append(ti)
+            rr_ms.append(ms)
+            if prev is not None:
+                diffs_t.append(ti)
+                diffs.append(ms - prev)
+            prev = ms
+        prev_t = ti
+    rr_live = np.isin(np.floor(np.array(rr_t) / width).astype(np.int64), ids[live])
+    d_live = np.isin(np.floor(np.array(diffs_t) / width).astype(np.int64), ids[live])
+    rr_ms, diffs = np.array(rr_ms)[rr_live], np.array(diffs)[d_live]
+    return {
+        "mean_hr": hr[live].mean(), "min_hr": hr[live].min(), "max_hr": hr[live].max(),
+        "sdnn_ms": rr_ms.std(), "rmssd_ms": np.sqrt(np.mean(diffs ** 2)),
+    }
+
+
+def run(hours=26):
+    t, hr, rr = synthetic_stream(hours)
+    engine = HeartRateAnalytics()
+    t0 = time.perf_counter()
+    for ti, h, r in zip(t.tolist(), hr.tolist(), rr):
+        engine.add(ti, h, r)
+    elapsed = time.perf_counter() - t0
+
+    now = float(t[-1])
+    summary = engine.summary(now)
+    max_error = 0.0
+    for name, (span, buckets) in DEFAULT_WINDOWS.items():
+        ref = reference(t, hr, rr, now, span, buckets)
+        for key, value in ref.items():
+            max_error = max(max_error, abs(summary[name][key] - float(value)))
+
+    return {
+        "samples": len(t),
+        "us_per_sample": round(elapsed / len(t) * 1e6, 2),
+        "max_abs_error_vs_numpy": max_error,
+        "matches_numpy": max_error < 1e-6,
+        "resting_hr": summary["resting_hr"],
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(float(sys.argv[1]) if len(sys.argv) > 1 else 26), indent=2))
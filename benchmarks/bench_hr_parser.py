@@ -0,0 +1,68 @@
+"""Round-trip check and throughput of the 0x2A37 parser.
+
+    python -m benchmarks.bench_hr_parser [n_packets]
+"""
+import json
+import random
+import sys
+import time
+
+import benchmarks  # noqa: F401  (path setup)
+from hr_parser import build_hr_measurement, pack_packets, parse_hr_batch, parse_hr_measurement
+
+
+def random_packets(n, seed=0):
+    rng = random.Random(seed)
+    fields = []
+    for _ in range(n):
+        fields.append(dict(
+            heart_rate=rng.randint(30, 300),
+            sensor_contact=rng.choice([None, True, False]),
+            energy_expended=rng.choice([None, rng.randint(0, 65535)]),
+            rr_intervals=tuple(rng.randint(300, 2000) for _ in range(rng.choice([0, 0, 1, 2, 4]))),
+            force_uint16=rng.random() < 0.2,
+        ))
+    return fields, [build_hr_measurement(**f) for f in fields]
+
+
+def check_round_trip(fields, packets):
+    for f, p in zip(fields, packets):
+        m = parse_hr_measurement(p)
+        expected = (f["heart_rate"], f["sensor_contact"], f["energy_expended"], f["rr_intervals"])
+        if tuple(m) != expected:
+            return False
+    batch = parse_hr_batch(*pack_packets(packets))
+    for i, f in enumerate(fields):
+        rr = tuple(batch.rr[batch.rr_offsets[i]:batch.rr_offsets[i + 1]].tolist())
+        contact = batch.sensor_contact[i]
+        if (batch.heart_rate[i] != f["heart_rate"] or rr != f["rr_intervals"]
+                or (None if contact < 0 else bool(contact)) != f["sensor_contact"]
+                or (None if batch.energy_expended[i] < 0 else batch.energy_expended[i]) != f["energy_expended"]):
+            return False
+    return True
+
+
+def run(n=200000):
+    fields, packets = random_packets(n)
+    ok = check_round_trip(fields[:20000], packets[:20000])
+
+    t0 = time.perf_counter()
+    for p in packets:
+        parse_hr_measurement(p)
+    t_single = time.perf_counter() - t0
+
+    buffer, offsets = pack_packets(packets)
+    t0 = time.perf_counter()
+    parse_hr_batch(buffer, offsets)
+    t_batch = time.perf_counter() - t0
+
+    return {
+        "packets": n,
+        "round_trip_ok": ok,
+        "single_packets_per_sec": round(n / t_single),
+        "batch_packets_per_sec": round(n / t_batch),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000), indent=2))
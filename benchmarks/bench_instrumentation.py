@@ -0,0 +1,59 @@
+"""Cost of the instrumentation layer: a bare call vs the same call through
+@timed and timer(), with recording off and on, plus the exports.
+
+    python -m benchmarks.bench_instrumentation [calls]
+"""
+import json
+import sys
+import time
+
+import benchmarks  # noqa: F401  (path setup)
+from instrumentation import Registry
+
+
+def noop(x):
+    return x
+
+
+def _per_call_ns(fn, calls):
+    t0 = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - t0) / calls * 1e9
+
+
+def run(calls=500000):
+    registry = Registry()
+    wrapped = registry.timed("bench.noop")(noop)
+
+    def with_timer(x):
+        with registry.timer("bench.block"):
+            return x
+
+    bare = _per_call_ns(noop, calls)
+    registry.enabled = False
+    off = _per_call_ns(wrapped, calls)
+    timer_off = _per_call_ns(with_timer, calls)
+    registry.enabled = True
+    on = _per_call_ns(wrapped, calls)
+    timer_on = _per_call_ns(with_timer, calls)
+
+    t0 = time.perf_counter()
+    prom = registry.to_prometheus()
+    export = time.perf_counter() - t0
+    snap = registry.snapshot()
+    return {
+        "calls": calls,
+        "bare_ns": round(bare, 1),
+        "timed_off_overhead_ns": round(off - bare, 1),
+        "timer_off_overhead_ns": round(timer_off - bare, 1),
+        "timed_on_overhead_ns": round(on - bare, 1),
+        "timer_on_overhead_ns": round(timer_on - bare, 1),
+        "recorded_calls": snap["bench.noop"]["calls"] + snap["bench.block"]["calls"],
+        "prometheus_export_ms": round(export * 1000, 3),
+        "prometheus_lines": prom.count("\n"),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(int(sys.argv[1]) if len(sys.argv) > 1 else 500000), indent=2))
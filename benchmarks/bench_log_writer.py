@@ -0,0 +1,103 @@
+"""Concurrent log writes: many threads and processes appending to one
+LogStore and one CSV at the same time. Checks that every row lands exactly
+once, intact, and that the daily totals agree with the rows.
+
+    python -m benchmarks.bench_log_writer [threads] [processes] [rows_per_writer]
+"""
+import json
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+import benchmarks  # noqa: F401  (sets up sys.path)
+from log_store import LogStore
+from log_writer import append_csv
+
+DAY = "2026-01-01"
+
+
+def _rows(writer, n):
+    for i in range(n):
+        yield {"Date": DAY, "Dish": f"{writer}-{i}", "Writer": writer, "Seq": i,
+               "Calories": 1.0, "Protein": 0.5, "Carbs": 0.25, "Fats": 0.125}
+
+
+def _write(db_path, csv_path, writer, n, store=None):
+    # threads share the parent's store (and so its group commit); processes open their own
+    own = store is None
+    if own:
+        store = LogStore(db_path)
+    for row in _rows(writer, n):
+        store.append("food_log", row)
+        append_csv(csv_path, row)
+    if own:
+        store.close()
+
+
+def _check(df, writers, n):
+    problems = []
+    if len(df) != len(writers) * n:
+        problems.append(f"{len(df)} rows, expected {len(writers) * n}")
+    if df.isna().any().any():
+        problems.append("rows with missing fields")
+    seen = set(zip(df["Writer"].astype(str), df["Seq"].astype(int)))
+    expected = {(w, i) for w in writers for i in range(n)}
+    if seen != expected:
+        problems.append(f"{len(expected - seen)} rows missing, {len(df) - len(seen)} duplicated")
+    return problems
+
+
+def run(threads=16, processes=4, rows_per_writer=100):
+    tmp = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(tmp, "logs.sqlite")
+        csv_path = os.path.join(tmp, "log.csv")
+        store = LogStore(db_path)
+
+        writers = [f"t{i}" for i in range(threads)] + [f"p{i}" for i in range(processes)]
+        ctx = mp.get_context("spawn")
+        t0 = time.perf_counter()
+        procs = [ctx.Process(target=_write, args=(db_path, csv_path, w, rows_per_writer))
+                 for w in writers[threads:]]
+        for p in procs:
+            p.start()
+        pool = [threading.Thread(target=_write, args=(db_path, csv_path, w, rows_per_writer, store))
+                for w in writers[:threads]]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - t0
+
+        total = len(writers) * rows_per_writer
+        db = store.history("food_log")
+        csv = pd.read_csv(csv_path)
+        totals = store.totals(DAY)
+        problems = {"sqlite": _check(db, writers, rows_per_writer),
+                    "csv": _check(csv, writers, rows_per_writer)}
+        if abs(totals["eaten"] - total) > 1e-6 or abs(totals["fats"] - total * 0.125) > 1e-6:
+            problems["sqlite"].append(f"daily totals off: {totals}")
+        return {
+            "threads": threads,
+            "processes": processes,
+            "rows": total,
+            "rows_per_sec": round(2 * total / elapsed, 1),
+            "thread_rows_per_commit": round(store._writer.items / max(store._writer.commits, 1), 2),
+            "ok": not any(problems.values()),
+            "problems": problems,
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    print(json.dumps(run(*args), indent=2))
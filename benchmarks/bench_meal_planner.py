@@ -0,0 +1,52 @@
+"""Weekly meal planner: solve time and how many days land within tolerance,
+over a spread of profiles, with and without tag filters; plus cache hits.
+
+    python -m benchmarks.bench_meal_planner
+"""
+import json
+import os
+import time
+
+import benchmarks
+import meal_planner
+from meal_planner import day_targets, plan_week
+from new_backend import compute_profile
+
+MEALS = os.path.join(benchmarks.ROOT, "data", "meals_dataset.csv")
+GOALS = ["Weight Loss", "Weight Gain", "Muscle Gain", "Maintain"]
+PEOPLE = [("Male", 80, 180, "Very Active"), ("Male", 70, 172, "Lightly Active"),
+          ("Female", 55, 160, "Sedentary (Office)"), ("Female", 68, 168, "Moderately Active")]
+FILTERS = [((), ()), (("vegetarian",), ()), ((), ("street-food", "dessert"))]
+
+
+def run():
+    meal_planner.get_planner(MEALS)
+    solve_ms, cached_us, met, calories_ok, flagged = [], [], 0, 0, 0
+    for goal in GOALS:
+        for gender, weight, height, activity in PEOPLE:
+            profile = compute_profile("bench", 30, gender, height, weight, activity, goal, 2500)
+            kcal = day_targets(profile)[0]
+            for include, exclude in FILTERS:
+                t0 = time.perf_counter()
+                plan = plan_week(MEALS, profile, include, exclude)
+                solve_ms.append((time.perf_counter() - t0) * 1000)
+                t0 = time.perf_counter()
+                plan_week(MEALS, profile, include, exclude)
+                cached_us.append((time.perf_counter() - t0) * 1e6)
+                met += sum(plan["met"])
+                calories_ok += sum(abs(d["totals"]["calories"] - kcal) <= 0.1 * kcal for d in plan["days"])
+                flagged += any(n.startswith("Calories") and "can't" in n for n in plan["notes"])
+    days = 7 * len(solve_ms)
+    return {
+        "plans": len(solve_ms),
+        "solve_ms_mean": round(sum(solve_ms) / len(solve_ms), 1),
+        "solve_ms_max": round(max(solve_ms), 1),
+        "cached_us_mean": round(sum(cached_us) / len(cached_us), 1),
+        "days_within_calorie_tolerance": f"{calories_ok}/{days}",
+        "days_within_all_tolerances": f"{met}/{days}",
+        "plans_flagged_calories_unreachable": flagged,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
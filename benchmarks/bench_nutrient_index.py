@@ -0,0 +1,72 @@
+"""Remaining-macro food suggestions: NutrientIndex vs recomputing and sorting
+the whole food table per query.
+
+    python -m benchmarks.bench_nutrient_index [n_dishes] [n_queries]
+"""
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import benchmarks  # noqa: F401  (sets up sys.path)
+from new_backend import load_food_database
+from nutrient_index import DAILY_VALUES, NutrientIndex, serving_macros
+
+
+def make_table(n, seed=0):
+    """The real food table, repeated with jitter up to `n` rows."""
+    rng = np.random.default_rng(seed)
+    base = load_food_database()
+    reps = -(-n // len(base))
+    df = pd.concat([base] * reps, ignore_index=True).iloc[:n].copy()
+    for col in ["Calories per Serving", "Protein per Serving (g)", "Carbohydrates (g)", "Fats (g)"]:
+        df[col] = df[col] * rng.uniform(0.8, 1.2, n)
+    return df
+
+
+def linear(df, target, k):
+    macros = serving_macros(df)
+    dist = np.sqrt((((macros.to_numpy() - target) / DAILY_VALUES) ** 2).sum(axis=1))
+    return np.argsort(dist, kind="stable")[:k]
+
+
+def run(n_dishes=100000, n_queries=200, k=10):
+    rng = np.random.default_rng(1)
+    df = make_table(n_dishes)
+    targets = rng.uniform([100, 5, 10, 3], [900, 60, 120, 40], size=(n_queries, 4)).astype(np.float32)
+
+    t0 = time.perf_counter()
+    index = NutrientIndex(serving_macros(df))
+    build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = [index.nearest(t, k=k)[0] for t in targets]
+    fast_time = (time.perf_counter() - t0) / n_queries
+
+    t0 = time.perf_counter()
+    for t in targets:
+        index.nearest(t, k=k, by="ratio")
+    ratio_time = (time.perf_counter() - t0) / n_queries
+
+    n_slow = min(n_queries, 20)
+    t0 = time.perf_counter()
+    slow = [linear(df, t, k) for t in targets[:n_slow]]
+    slow_time = (time.perf_counter() - t0) / n_slow
+
+    same = sum(set(a.tolist()) == set(b.tolist()) for a, b in zip(fast, slow))
+    return {
+        "dishes": n_dishes,
+        "build_ms": round(build * 1000, 1),
+        "query_ms": round(fast_time * 1000, 3),
+        "ratio_query_ms": round(ratio_time * 1000, 3),
+        "linear_query_ms": round(slow_time * 1000, 3),
+        "speedup": round(slow_time / fast_time, 1),
+        "same_top_k": f"{same}/{n_slow}",
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    print(json.dumps(run(*args), indent=2))
@@ -0,0 +1,88 @@
+"""Streamlit cold start: time to import the backend, and time for a fresh
+process to render each page for the first time (AppTest, profile already
+saved; cold start is the backend import plus the first script run, which
+always lands on Home). Every measurement runs in its own interpreter so
+nothing is warm.
+
+    python -m benchmarks.bench_startup [repeats]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import benchmarks
+
+APP = os.path.join(benchmarks.APP_DIR, "aihealthandnutritionanalyzer.py")
+PAGES = ["🏠 Home", "📝 Input Meal Logs", "📊 Nutrition Plan", "🩺 Health Advisor",
+         "💧 Hydration Tracker", "🏋 Exercise Tracker", "📅 Meal Forecasting", "💡 Smart Tips",
+         "📊 Analytics", "⚙️ Settings"]
+HEAVY = ("plotly",)
+
+
+def _child_import():
+    t0 = time.perf_counter()
+    import new_backend  # noqa: F401
+    took = time.perf_counter() - t0
+    return {"ms": took * 1000, "loaded": [m for m in HEAVY if m in sys.modules]}
+
+
+def _child_render(page, data_dir):
+    t0 = time.perf_counter()
+    import new_backend
+    imported = time.perf_counter() - t0
+    # keep the benchmark's profile and logs out of the app directory
+    new_backend.FILES.update({
+        "profile": os.path.join(data_dir, "user_profile.json"),
+        "log_store": os.path.join(data_dir, "health_logs.sqlite"),
+        "user_data": os.path.join(data_dir, "user_data"),
+    })
+    new_backend.save_profile("Bench", 30, "Female", 165, 60, "Lightly Active", "Maintain", 2500)
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP, default_timeout=60)
+    t0 = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - t0
+    page_ms = first
+    if page != PAGES[0]:
+        t0 = time.perf_counter()
+        at.sidebar.radio[0].set_value(page).run()
+        page_ms = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+    return {"cold_start_ms": (imported + first) * 1000, "first_run_ms": first * 1000, "page_ms": page_ms * 1000,
+            "loaded": [m for m in HEAVY if m in sys.modules]}
+
+
+def _spawn(*args):
+    out = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child", *args],
+                         cwd=benchmarks.ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(repeats=3):
+    imports = [_spawn("import") for _ in range(repeats)]
+    pages = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for page in PAGES:
+            runs = [_spawn("render", page, os.path.join(tmp, f"{i}-{len(pages)}")) for i in range(repeats)]
+            pages[page] = {
+                "cold_start_ms": round(min(r["cold_start_ms"] for r in runs), 1),
+                "page_ms": round(min(r["page_ms"] for r in runs), 1),
+                "heavy_modules": runs[0]["loaded"],
+            }
+    return {
+        "import_backend_ms": round(min(r["ms"] for r in imports), 1),
+        "heavy_modules_on_import": imports[0]["loaded"],
+        "pages": pages,
+    }
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        result = _child_import() if sys.argv[2] == "import" else _child_render(*sys.argv[3:5])
+        print(json.dumps(result))
+    else:
+        print(json.dumps(run(*[int(a) for a in sys.argv[1:2]]), indent=2, ensure_ascii=False))
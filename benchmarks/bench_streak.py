@@ -0,0 +1,108 @@
+"""Dashboard streak and activity calendar over 5 years of synthetic logs:
+the old get_streak (every food day through pd.to_datetime into a set, then
+a day-by-day walk) vs the store's day bitmaps. Checks current and longest
+streaks against a brute-force count, including after backfilled entries,
+and times the bitmap upkeep per logged entry.
+
+    python -m benchmarks.bench_streak [years]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+import benchmarks  # noqa: F401  (sets up sys.path)
+from benchmarks import synthetic
+from log_analytics import calendar_grid
+from log_store import BITMAP_KINDS, LogStore
+
+
+def brute(days, today):
+    """(current, longest) from a list of ISO days."""
+    s = sorted({date.fromisoformat(d) for d in days})
+    if not s:
+        return 0, 0
+    longest = run = 1
+    for a, b in zip(s, s[1:]):
+        run = run + 1 if (b - a).days == 1 else 1
+        longest = max(longest, run)
+    have = set(s)
+    d = today if today in have else today - timedelta(days=1)
+    current = 0
+    while d in have:
+        current += 1
+        d -= timedelta(days=1)
+    return current, longest
+
+
+def naive_streak(store):
+    """What the dashboard did before the bitmaps."""
+    import pandas as pd
+    log_dates = set(pd.to_datetime(pd.Series(store.days("food_log"), dtype=object)).dt.date)
+    d = date.today() if date.today() in log_dates else date.today() - timedelta(days=1)
+    streak = 0
+    while d in log_dates:
+        streak += 1
+        d -= timedelta(days=1)
+    return streak
+
+
+def _per_call(fn, n=50):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def run(years=5):
+    profile = synthetic.make_users(1)[0]
+    logs = synthetic.make_logs(profile, years=years)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LogStore(os.path.join(tmp, "logs.sqlite"))
+        synthetic.fill_store(store, logs)
+        today = date.today()
+
+        slow = _per_call(lambda: naive_streak(store))
+        fast = _per_call(lambda: store.streak("food_log"))
+        calendar = _per_call(lambda: calendar_grid(*store.activity()))
+        ok = all(store.streak(k) == brute(store.days(k), today) for k in BITMAP_KINDS)
+        ok = ok and store.streak("food_log")[0] == naive_streak(store)
+
+        # backfilling a gap has to merge runs; a new store must backfill its bitmaps
+        gaps = sorted(set((date.fromisoformat(store.days("food_log")[0]) + timedelta(days=i)).isoformat()
+                          for i in range(365 * years)) - set(store.days("food_log")))
+        t0 = time.perf_counter()
+        for d in gaps:
+            store.append("food_log", {"Date": d, "Time": "12:00:00", "Dish": "Dal", "Calories": 200.0})
+        per_append = (time.perf_counter() - t0) / max(len(gaps), 1)
+        ok = ok and store.streak("food_log") == brute(store.days("food_log"), today)
+        store.close()
+        rebuilt = LogStore(os.path.join(tmp, "logs.sqlite"))
+        before = rebuilt.streak("food_log")
+        rebuilt.rebuild_bitmaps()
+        ok = ok and rebuilt.streak("food_log") == before
+        first, counts = rebuilt.activity()
+        grid, weeks = calendar_grid(first, counts)
+        ok = ok and int(np.nansum(grid)) == int(counts.sum())
+        rebuilt.close()
+
+    return {
+        "years": years,
+        "food_days": len(set(r["Date"] for r in logs["food_log"])),
+        "naive_streak_ms": round(slow * 1000, 3),
+        "bitmap_streak_ms": round(fast * 1000, 4),
+        "speedup": round(slow / fast, 1),
+        "calendar_data_ms": round(calendar * 1000, 3),
+        "calendar_weeks": len(weeks),
+        "append_with_bitmap_ms": round(per_append * 1000, 3),
+        "matches_brute_force": bool(ok),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print(json.dumps(run(*args), indent=2))
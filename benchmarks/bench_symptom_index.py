@@ -0,0 +1,73 @@
+"""Health Advisor lookups for several symptoms at once: filtering the
+symptom DataFrame and splitting its comma-separated fields on every rerun
+vs symptom_index's postings built once. Checks both give the same cause
+overlap counts and the same union of foods to avoid.
+
+    python -m benchmarks.bench_symptom_index [lookups]
+"""
+import json
+import random
+import sys
+import time
+from collections import Counter
+
+import benchmarks  # noqa: F401  (sets up sys.path)
+import symptom_index
+from new_backend import FILES
+from reference_data import load_table
+
+
+def naive(df_sym, symptoms):
+    """Per-rerun scan: one row filter per symptom, fields split in place."""
+    causes, foods = Counter(), set()
+    for s in symptoms:
+        res = df_sym[df_sym["Symptom"] == s].iloc[0]
+        for c in symptom_index.split_items(res["Possible Causes"]):
+            causes[symptom_index.item_key(c)] += 1
+        foods |= {symptom_index.item_key(f) for f in symptom_index.split_items(res["Foods to Avoid"])}
+    return causes, foods
+
+
+def indexed(index, symptoms):
+    return index.rank_causes(symptoms), index.foods_to_avoid(symptoms)
+
+
+def run(lookups=500):
+    df_sym = load_table(FILES["symptom_db"])
+    names = df_sym["Symptom"].dropna().unique().tolist()
+    rng = random.Random(0)
+    picks = [rng.sample(names, rng.randint(1, 4)) for _ in range(lookups)]
+
+    t0 = time.perf_counter()
+    for p in picks:
+        naive(df_sym, p)
+    slow = (time.perf_counter() - t0) / lookups
+    t0 = time.perf_counter()
+    index = symptom_index.get_symptom_index(df_sym)
+    build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for p in picks:
+        indexed(index, p)
+    fast = (time.perf_counter() - t0) / lookups
+
+    ok = True
+    for p in picks[:100]:
+        causes, foods = naive(df_sym, p)
+        ranked, avoid = indexed(index, p)
+        got = {symptom_index.item_key(c): int(o.split("/")[0]) for c, o in zip(ranked["Cause"], ranked["Overlap"])}
+        ok = ok and got == dict(causes) and set(avoid) == foods
+
+    return {
+        "symptoms": len(names),
+        "lookups": lookups,
+        "naive_lookup_ms": round(slow * 1000, 3),
+        "index_build_ms": round(build * 1000, 2),
+        "indexed_lookup_ms": round(fast * 1000, 3),
+        "speedup": round(slow / fast, 1),
+        "matches_naive": bool(ok),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print(json.dumps(run(*args), indent=2))
@@ -0,0 +1,67 @@
+"""Chatbot condition matching: per-message linear extractOne vs SymptomMatcher.
+
+    python -m benchmarks.bench_symptom_matcher [n_conditions] [n_messages]
+"""
+import json
+import random
+import sys
+import time
+
+import pandas as pd
+from spellchecker import SpellChecker
+from thefuzz import process
+
+import benchmarks  # noqa: F401  (path setup)
+from benchmarks.synthetic import make_conditions, typo
+from symptom_matcher import MATCH_THRESHOLD, SymptomMatcher
+
+def run(n_conditions=10000, n_messages=50):
+    rng = random.Random(1)
+    conditions = make_conditions(n_conditions)
+    df = pd.DataFrame({"Condition": conditions})
+    messages = [typo(rng.choice(conditions), rng) for _ in range(n_messages)]
+    messages += ["i have a headache", "stomach pain after eating", "xyzzy"]
+    spell = SpellChecker()
+
+    # what the bot did before: rebuild choices, uncached spelling, linear scan
+    t0 = time.perf_counter()
+    old = []
+    for m in messages:
+        cleaned = " ".join(spell.correction(w) or w if w not in spell else w for w in m.split())
+        choices = df["Condition"].astype(str).tolist()
+        match, score = process.extractOne(cleaned, choices)
+        old.append(match if score > MATCH_THRESHOLD else None)
+    t_old = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    matcher = SymptomMatcher(conditions, spell)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new = []
+    for m in messages:
+        hit = matcher.lookup(matcher.correct(m))
+        new.append(hit[1] if hit else None)
+    t_new = time.perf_counter() - t0
+
+    # second pass: spelling corrections are now cached
+    t0 = time.perf_counter()
+    for m in messages:
+        matcher.lookup(matcher.correct(m))
+    t_warm = time.perf_counter() - t0
+
+    return {
+        "conditions": len(conditions),
+        "messages": len(messages),
+        "linear_ms_per_message": round(t_old / len(messages) * 1000, 2),
+        "matcher_build_s": round(t_build, 3),
+        "matcher_ms_per_message": round(t_new / len(messages) * 1000, 2),
+        "matcher_ms_per_message_warm": round(t_warm / len(messages) * 1000, 2),
+        "same_decision_rate": round(sum(a == b for a, b in zip(old, new)) / len(messages), 3),
+        "same_accept_reject_rate": round(sum((a is None) == (b is None) for a, b in zip(old, new)) / len(messages), 3),
+    }
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    print(json.dumps(run(int(args[0]) if args else 10000, int(args[1]) if len(args) > 1 else 50), indent=2))
@@ -0,0 +1,155 @@
+"""Synthetic users, logs, chatbot conditions and heart-rate streams for the
+benchmarks, drawn from the real reference tables so names, portions, MET
+values and symptoms look like what the app actually sees. Everything is
+seeded; the same arguments always give the same data.
+"""
+import os
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+import benchmarks
+from hr_parser import RR_RESOLUTION, build_hr_measurement
+from new_backend import FILES, HYDRATION_FACTORS, compute_profile, load_food_database
+from nutrient_index import serving_macros
+from reference_data import load_table
+
+ACTIVITIES = ["Sedentary (Office)", "Lightly Active", "Moderately Active", "Very Active", "Super Active"]
+GOALS = ["Weight Loss", "Weight Gain", "Muscle Gain", "Maintain"]
+MEAL_TIMES = {"Breakfast": "08:30:00", "Lunch": "13:00:00", "Snack": "17:00:00", "Dinner": "20:30:00"}
+BEVERAGES = list(HYDRATION_FACTORS)
+BEVERAGE_WEIGHTS = [0.6, 0.08, 0.1, 0.12, 0.04, 0.02, 0.02, 0.02]
+NUTRITION_GOALS = {"calories": 2000, "protein": 80, "carbs": 250, "fat": 70}
+MODIFIERS = ["mild", "severe", "chronic", "sudden", "recurring", "night", "morning", "after meals",
+             "with fever", "in children", "during exercise", "with nausea", "on left side", "persistent"]
+
+
+# ---------------- users ---------------- #
+def make_users(n, seed=0):
+    """Profiles as compute_profile builds them, with BMIs around 22."""
+    rng = random.Random(seed)
+    users = []
+    for i in range(n):
+        gender = rng.choice(["Male", "Female"])
+        height = rng.randint(150, 195) if gender == "Male" else rng.randint(145, 180)
+        weight = round(rng.gauss(22.5, 3.5) * (height / 100) ** 2, 1)
+        profile = compute_profile(f"user{i:05d}", rng.randint(18, 75), gender, height, weight,
+                                  rng.choice(ACTIVITIES), rng.choice(GOALS), rng.choice([2000, 2500, 3000]))
+        users.append(profile)
+    return users
+
+
+# ---------------- logs ---------------- #
+def make_logs(profile, years=1, seed=0, end=None):
+    """{kind: [rows]} covering `years` up to `end` (today): 2-4 meals a day
+    from the food catalogue, drinks, workouts from the activity compendium
+    and a weekly weigh-in. Some days are skipped entirely."""
+    rng = np.random.default_rng(seed)
+    df_food = load_food_database()
+    # the rows make_food_entry builds, without its per-row DataFrame round trip
+    macros = serving_macros(df_food).to_numpy()
+    dishes, food_ids = df_food["Dish Name"].to_numpy(), df_food["Food ID"].to_numpy()
+    df_ex = load_table(FILES["exercise_db"])
+    end = end or date.today()
+    weight = float(profile["Current_Weight"])
+    logs = {"food_log": [], "water_log": [], "exercise_log": [], "weight_log": []}
+    for offset in range(365 * years - 1, -1, -1):
+        day = end - timedelta(days=offset)
+        if rng.random() < 0.08:
+            continue
+        for meal in rng.choice(list(MEAL_TIMES), size=rng.integers(2, 5), replace=False):
+            i = int(rng.integers(len(df_food)))
+            qty = float(rng.choice([0.5, 1.0, 1.0, 1.5, 2.0]))
+            kcal, protein, carbs, fats = (macros[i] * qty).tolist()
+            logs["food_log"].append({"Date": day.strftime("%Y-%m-%d"), "Time": MEAL_TIMES[meal],
+                                     "Dish": dishes[i], "Food ID": int(food_ids[i]), "Meal Type": str(meal),
+                                     "Quantity": qty, "Calories": kcal, "Protein": protein,
+                                     "Carbs": carbs, "Fats": fats})
+        for _ in range(rng.integers(3, 9)):
+            bev = BEVERAGES[rng.choice(len(BEVERAGES), p=BEVERAGE_WEIGHTS)]
+            vol = int(rng.choice([150, 250, 330, 500]))
+            logs["water_log"].append({"Date": day.strftime("%Y-%m-%d"), "Time": f"{rng.integers(7, 23):02d}:00:00",
+                                      "Beverage": bev, "Volume_ml": vol,
+                                      "Effective_Hydration_ml": HYDRATION_FACTORS[bev] * vol})
+        if rng.random() < 0.5:
+            act = df_ex.iloc[int(rng.integers(len(df_ex)))]
+            mins = int(rng.choice([15, 30, 45, 60, 90]))
+            logs["exercise_log"].append({"Date": day.strftime("%Y-%m-%d"), "Time": "18:00:00",
+                                         "Activity": act["Description"], "Duration": mins,
+                                         "Calories Burnt": float(act["MET Value"]) * mins / 60 * weight})
+        if day.weekday() == 0:
+            weight = round(weight + rng.normal(0, 0.4), 1)
+            logs["weight_log"].append({"Date": day.strftime("%Y-%m-%d"), "Weight": weight})
+    return logs
+
+
+def fill_store(store, logs):
+    for kind, rows in logs.items():
+        if rows:
+            store.append(kind, rows)
+    return {kind: len(rows) for kind, rows in logs.items()}
+
+
+# ---------------- health analyzer ---------------- #
+def make_health_days(n, seed=0):
+    """Column arrays for n user-days of sleep, screen time and meal totals."""
+    rng = np.random.default_rng(seed)
+    return {
+        "sleep_hours": np.round(rng.normal(7, 1.2, n), 1),
+        "deep_sleep": np.round(rng.normal(1.6, 0.4, n), 1),
+        "rem_sleep": np.round(rng.normal(1.5, 0.3, n), 1),
+        "heart_rate": rng.integers(50, 95, n),
+        "screen_time": rng.integers(1, 14, n),
+        "pickups": rng.integers(10, 120, n),
+        "breaks": rng.integers(0, 10, n),
+        "meals": {k: rng.integers(int(g * 0.5), int(g * 1.3), n) for k, g in NUTRITION_GOALS.items()},
+    }
+
+
+# ---------------- chatbot ---------------- #
+def make_conditions(n, seed=0):
+    """n distinct condition strings: the real symptoms plus modifier variants."""
+    rng = random.Random(seed)
+    sym = pd.read_csv(os.path.join(benchmarks.ROOT, "data", "symptom_database.csv"))
+    base = [s.lower() for s in sym["Symptom"].astype(str)]
+    out = set(base)
+    while len(out) < n:
+        words = [rng.choice(MODIFIERS), rng.choice(base)]
+        if rng.random() < 0.5:
+            words.append(rng.choice(MODIFIERS))
+        out.add(" ".join(words))
+    return sorted(out)[:n]
+
+
+def typo(text, rng):
+    """Drop one inner letter of one word, the way users mistype."""
+    words = text.split()
+    i = rng.randrange(len(words))
+    w = words[i]
+    if len(w) > 3:
+        j = rng.randrange(1, len(w) - 1)
+        words[i] = w[:j] + w[j + 1:]
+    return " ".join(words)
+
+
+def make_messages(conditions, n, seed=1):
+    rng = random.Random(seed)
+    return [typo(rng.choice(conditions), rng) for _ in range(n)]
+
+
+# ---------------- heart rate ---------------- #
+def make_hr_stream(n, seed=0, rate_hz=1.0):
+    """n 0x2A37 packets from one strap: a bounded random walk with matching
+    RR intervals, occasional lost contact and an energy field now and then."""
+    rng = random.Random(seed)
+    hr, packets = rng.randint(55, 80), []
+    for i in range(n):
+        hr = min(200, max(40, hr + rng.randint(-2, 2)))
+        beats = max(1, round(hr / 60 / rate_hz))
+        rr = tuple(int(60.0 / hr * RR_RESOLUTION) + rng.randint(-15, 15) for _ in range(beats))
+        packets.append(build_hr_measurement(hr, sensor_contact=rng.random() > 0.01,
+                                            energy_expended=i % 65536 if i % 10 == 0 else None,
+                                            rr_intervals=rr))
+    return packets
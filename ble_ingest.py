@@ -0,0 +1,192 @@
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import deque
+
+from hr_parser import parse_hr_measurement
+
+# instrumentation lives with the app modules in NutritionAnalyzerApp/
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "NutritionAnalyzerApp")
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
+
+from instrumentation import count, metrics  # noqa: E402
+
+# ---------------- Heart Rate Ingestion ---------------- #
+# Keeps persistent connections to many BLE heart-rate devices at once,
+# subscribes to HR notifications and pushes decoded samples into a bounded
+# ring buffer per device. Notifications are only timestamped and queued in
+# the BLE callback; decoding happens in a single consumer task.
+
+HR_UUID = "00002a37-0000-1000-8000-00805f9b34fb"
+
+
+def _default_client_factory(address, **kwargs):
+    from bleak import BleakClient
+    return BleakClient(address, **kwargs)
+
+
+class DeviceStream:
+    """Per-device state: ring buffer of (timestamp, heart_rate, rr_intervals) plus counters."""
+
+    def __init__(self, address, buffer_size):
+        self.address = address
+        self.samples = deque(maxlen=buffer_size)
+        self.received = 0
+        self.reconnects = 0
+        self.connected = False
+        self.last_error = None
+
+    def latest(self):
+        return self.samples[-1] if self.samples else None
+
+
+class HeartRateIngestService:
+    def __init__(self, addresses, client_factory=None, buffer_size=3600,
+                 backoff_initial=1.0, backoff_max=30.0, queue_size=10000,
+                 clock=time.monotonic):
+        self.client_factory = client_factory or _default_client_factory
+        self.devices = {a: DeviceStream(a, buffer_size) for a in addresses}
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.clock = clock
+        self.queue_size = queue_size
+        self.latencies = deque(maxlen=10000)
+        self.dropped = 0
+        self.listeners = []
+        self._queue = None
+        self._tasks = []
+        self._stopping = None
+        self._started_at = None
+        self._stopped_at = None
+
+    # ---------------- lifecycle ---------------- #
+    @property
+    def running(self):
+        return bool(self._tasks)
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._stopping = asyncio.Event()
+        self._started_at = self.clock()
+        self._stopped_at = None
+        self._tasks = [asyncio.create_task(self._consume())]
+        self._tasks += [asyncio.create_task(self._run_device(d)) for d in self.devices.values()]
+
+    async def stop(self):
+        if not self.running:
+            return
+        self._stopping.set()
+        device_tasks = self._tasks[1:]
+        await asyncio.gather(*device_tasks, return_exceptions=True)
+        # let the consumer drain what was already received
+        await self._queue.join()
+        self._tasks[0].cancel()
+        await asyncio.gather(self._tasks[0], return_exceptions=True)
+        self._tasks = []
+        self._stopped_at = self.clock()
+
+    async def run_for(self, seconds):
+        await self.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await self.stop()
+        return self.stats()
+
+    # ---------------- connections ---------------- #
+    def _on_notify(self, device):
+        def callback(_sender, data):
+            try:
+                self._queue.put_nowait((device, self.clock(), bytes(data)))
+            except asyncio.QueueFull:
+                self.dropped += 1
+                count("ble.dropped")
+        return callback
+
+    async def _run_device(self, device):
+        delay = self.backoff_initial
+        while not self._stopping.is_set():
+            disconnected = asyncio.Event()
+            try:
+                started = time.perf_counter()
+                client = self.client_factory(device.address,
+                                             disconnected_callback=lambda _c, ev=disconnected: ev.set())
+                async with client:
+                    await client.start_notify(HR_UUID, self._on_notify(device))
+                    device.connected = True
+                    if metrics.enabled:
+                        metrics.observe("ble.connect", time.perf_counter() - started)
+                    delay = self.backoff_initial
+                    waiters = [asyncio.create_task(self._stopping.wait()),
+                               asyncio.create_task(disconnected.wait())]
+                    await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                    for w in waiters:
+                        w.cancel()
+                    if client.is_connected:
+                        try:
+                            await client.stop_notify(HR_UUID)
+                        except Exception as e:
+                            # the link is torn down anyway; keep the error visible
+                            device.last_error = str(e)
+                            count("ble.stop_notify_errors")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                device.last_error = str(e)
+                count("ble.connect_errors")
+            device.connected = False
+            if self._stopping.is_set():
+                break
+            device.reconnects += 1
+            count("ble.reconnects")
+            # exponential backoff with jitter, cut short by stop()
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay * random.uniform(0.5, 1.0))
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, self.backoff_max)
+
+    async def _consume(self):
+        while True:
+            device, received_at, raw = await self._queue.get()
+            try:
+                m = parse_hr_measurement(raw)
+                device.samples.append((received_at, m.heart_rate, m.rr_intervals))
+                device.received += 1
+                for listener in self.listeners:
+                    listener(device.address, received_at, m)
+                latency = self.clock() - received_at
+                self.latencies.append(latency)
+                if metrics.enabled:
+                    metrics.observe("ble.sample_latency", latency)
+            except ValueError:
+                device.last_error = "malformed heart rate packet"
+                count("ble.malformed")
+            finally:
+                self._queue.task_done()
+
+    # ---------------- reporting ---------------- #
+    def stats(self):
+        end = self._stopped_at if self._stopped_at is not None else self.clock()
+        elapsed = max(end - (self._started_at or end), 1e-9)
+        total = sum(d.received for d in self.devices.values())
+        lat = sorted(self.latencies)
+
+        def pct(p):
+            return round(lat[min(len(lat) - 1, int(p * len(lat)))] * 1000, 3) if lat else None
+
+        return {
+            "devices": len(self.devices),
+            "connected": sum(d.connected for d in self.devices.values()),
+            "samples": total,
+            "samples_per_sec": round(total / elapsed, 1),
+            "latency_ms_p50": pct(0.50),
+            "latency_ms_p99": pct(0.99),
+            "dropped": self.dropped,
+            "reconnects": sum(d.reconnects for d in self.devices.values()),
+        }
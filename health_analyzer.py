@@ -0,0 +1,193 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+# ---------------- Health Analyzer ---------------- #
+class HealthAnalyzer:
+    def __init__(self, sleep_hours, deep_sleep, rem_sleep, heart_rate,
+                 screen_time, pickups, breaks,
+                 meals, nutrition_goals, supplements):
+        self.sleep_hours = sleep_hours
+        self.deep_sleep = deep_sleep
+        self.rem_sleep = rem_sleep
+        self.heart_rate = heart_rate
+        self.screen_time = screen_time
+        self.pickups = pickups
+        self.breaks = breaks
+        self.meals = meals
+        self.nutrition_goals = nutrition_goals
+        self.supplements = supplements
+
+    def analyze_sleep(self):
+        score = 100
+        if self.sleep_hours < 7: score -= 20
+        if self.deep_sleep < 1.5: score -= 10
+        if self.heart_rate > 70: score -= 5
+        return {
+            "hours": self.sleep_hours,
+            "deep": self.deep_sleep,
+            "rem": self.rem_sleep,
+            "score": score,
+            "quality": "Good" if score > 70 else "Poor"
+        }
+
+    def analyze_screen_time(self):
+        score = max(0, 100 - (self.screen_time - 4) * 10)
+        return {
+            "screen_time": self.screen_time,
+            "pickups": self.pickups,
+            "breaks": self.breaks,
+            "score": score
+        }
+
+    def analyze_nutrition(self):
+        report = {}
+        for nutrient, goal in self.nutrition_goals.items():
+            val = self.meals.get(nutrient, 0)
+            report[nutrient] = {
+                "intake": val,
+                "goal": goal,
+                "status": "ok" if val >= goal * 0.8 else "low"
+            }
+        return report
+
+    def recommend_supplements(self):
+        recs = []
+        if self.sleep_hours < 7:
+            recs.append("Magnesium for better sleep")
+        if self.meals.get("protein", 0) < self.nutrition_goals.get("protein", 50):
+            recs.append("Protein supplement")
+        if self.screen_time > 6:
+            recs.append("Vitamin A for eye health")
+        return recs
+
+    def daily_summary(self):
+        return {
+            "date": datetime.date.today().isoformat(),
+            "sleep": self.analyze_sleep(),
+            "screen": self.analyze_screen_time(),
+            "nutrition": self.analyze_nutrition(),
+            "supplement_recommendations": self.recommend_supplements()
+        }
+
+# ---------------- Batch Health Analyzer ---------------- #
+class BatchHealthAnalyzer:
+    """
+    Column-oriented version of HealthAnalyzer: every argument is an array
+    (one entry per user-day) and all scores are computed with NumPy.
+    `daily_summaries()` returns exactly what HealthAnalyzer.daily_summary()
+    returns for each row.
+    """
+
+    def __init__(self, sleep_hours, deep_sleep, rem_sleep, heart_rate,
+                 screen_time, pickups, breaks,
+                 meals, nutrition_goals, dates=None):
+        self.sleep_hours = np.asarray(sleep_hours)
+        self.size = len(self.sleep_hours)
+        self.deep_sleep = np.asarray(deep_sleep)
+        self.rem_sleep = np.asarray(rem_sleep)
+        self.heart_rate = np.asarray(heart_rate)
+        self.screen_time = np.asarray(screen_time)
+        self.pickups = np.asarray(pickups)
+        self.breaks = np.asarray(breaks)
+        # nutrient -> column; goals may also be scalars shared by every row
+        self.meals = {k: np.asarray(v) for k, v in meals.items()}
+        self.nutrition_goals = {k: np.broadcast_to(np.asarray(v), (self.size,))
+                                for k, v in nutrition_goals.items()}
+        if dates is None:
+            dates = [datetime.date.today().isoformat()] * self.size
+        self.dates = list(dates)
+
+    @classmethod
+    def from_frame(cls, df, nutrients, goals, dates_column=None):
+        """Build from a DataFrame with one row per user-day.
+
+        `nutrients` lists the intake columns; `goals` maps nutrient -> goal
+        column name or a scalar goal.
+        """
+        meals = {n: df[n].to_numpy() for n in nutrients}
+        nutrition_goals = {n: df[g].to_numpy() if isinstance(g, str) else g for n, g in goals.items()}
+        return cls(df["sleep_hours"].to_numpy(), df["deep_sleep"].to_numpy(), df["rem_sleep"].to_numpy(),
+                   df["heart_rate"].to_numpy(), df["screen_time"].to_numpy(), df["pickups"].to_numpy(),
+                   df["breaks"].to_numpy(), meals, nutrition_goals,
+                   dates=df[dates_column].astype(str).tolist() if dates_column else None)
+
+    def _intake(self, nutrient):
+        if nutrient in self.meals:
+            return self.meals[nutrient]
+        return np.zeros(self.size, dtype=int)
+
+    def analyze_sleep(self):
+        score = (100
+                 - 20 * (self.sleep_hours < 7)
+                 - 10 * (self.deep_sleep < 1.5)
+                 - 5 * (self.heart_rate > 70))
+        return {"score": score, "good": score > 70}
+
+    def analyze_screen_time(self):
+        return {"score": np.maximum(0, 100 - (self.screen_time - 4) * 10)}
+
+    def analyze_nutrition(self):
+        report = {}
+        for nutrient, goal in self.nutrition_goals.items():
+            val = self._intake(nutrient)
+            report[nutrient] = {"intake": val, "goal": goal, "ok": val >= goal * 0.8}
+        return report
+
+    def recommend_supplements(self):
+        protein_goal = self.nutrition_goals.get("protein", np.full(self.size, 50))
+        return {
+            "Magnesium for better sleep": self.sleep_hours < 7,
+            "Protein supplement": self._intake("protein") < protein_goal,
+            "Vitamin A for eye health": self.screen_time > 6,
+        }
+
+    def to_frame(self):
+        """All scores, nutrient statuses and supplement flags as one DataFrame."""
+        sleep = self.analyze_sleep()
+        cols = {
+            "date": self.dates,
+            "sleep_score": sleep["score"],
+            "sleep_quality": np.where(sleep["good"], "Good", "Poor"),
+            "screen_score": self.analyze_screen_time()["score"],
+        }
+        for nutrient, r in self.analyze_nutrition().items():
+            cols[f"{nutrient}_status"] = np.where(r["ok"], "ok", "low")
+        for rec, flag in self.recommend_supplements().items():
+            cols[rec] = flag
+        return pd.DataFrame(cols)
+
+    def daily_summaries(self):
+        sleep = self.analyze_sleep()
+        sleep_score = sleep["score"].tolist()
+        quality = np.where(sleep["good"], "Good", "Poor").tolist()
+        screen_score = self.analyze_screen_time()["score"].tolist()
+        nutrition = [(n, r["intake"].tolist(), r["goal"].tolist(), np.where(r["ok"], "ok", "low").tolist())
+                     for n, r in self.analyze_nutrition().items()]
+        supplements = [(rec, flag.tolist()) for rec, flag in self.recommend_supplements().items()]
+        hours, deep, rem = self.sleep_hours.tolist(), self.deep_sleep.tolist(), self.rem_sleep.tolist()
+        screen, pickups, breaks = self.screen_time.tolist(), self.pickups.tolist(), self.breaks.tolist()
+
+        summaries = []
+        for i in range(self.size):
+            summaries.append({
+                "date": self.dates[i],
+                "sleep": {
+                    "hours": hours[i],
+                    "deep": deep[i],
+                    "rem": rem[i],
+                    "score": sleep_score[i],
+                    "quality": quality[i]
+                },
+                "screen": {
+                    "screen_time": screen[i],
+                    "pickups": pickups[i],
+                    "breaks": breaks[i],
+                    "score": screen_score[i]
+                },
+                "nutrition": {n: {"intake": val[i], "goal": goal[i], "status": status[i]}
+                              for n, val, goal, status in nutrition},
+                "supplement_recommendations": [rec for rec, flags in supplements if flags[i]]
+            })
+        return summaries
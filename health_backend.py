@@ -0,0 +1,119 @@
+from bleak import BleakScanner, BleakClient
+from health_analyzer import HealthAnalyzer
+from ble_ingest import HeartRateIngestService  # also puts NutritionAnalyzerApp/ on the path
+from instrumentation import timed
+from hr_parser import parse_hr_measurement, rr_seconds
+from hr_analytics import HeartRateAnalyticsHub
+
+# ---------------- Bluetooth Data Manager ---------------- #
+class BluetoothManager:
+    """
+    Scans for Bluetooth devices and retrieves basic health metrics
+    (like heart rate, etc.) from a connected device.
+    """
+
+    HR_UUID = "00002a37-0000-1000-8000-00805f9b34fb"  # standard Heart Rate characteristic UUID
+
+    @timed("ble.scan")
+    async def scan_devices(self, timeout=5.0):
+        """Scan for available Bluetooth devices."""
+        devices = await BleakScanner.discover(timeout=timeout)
+        result = [{"name": d.name or "Unknown", "address": d.address} for d in devices]
+        return result
+
+    @timed("ble.connect_and_retrieve")
+    async def connect_and_retrieve(self, address):
+        """
+        Connect to a specific Bluetooth device and read heart rate or other available data.
+        Returns a dictionary of sensor readings.
+        """
+        data = {"heart_rate": None, "device": address, "status": "disconnected"}
+        try:
+            async with BleakClient(address) as client:
+                if client.is_connected:
+                    data["status"] = "connected"
+                    # try reading heart rate characteristic
+                    try:
+                        raw = await client.read_gatt_char(self.HR_UUID)
+                        m = parse_hr_measurement(raw)
+                        data["heart_rate"] = m.heart_rate
+                        data["sensor_contact"] = m.sensor_contact
+                        data["energy_expended"] = m.energy_expended
+                        data["rr_intervals"] = rr_seconds(m.rr_intervals).tolist()
+                    except Exception:
+                        pass
+        except Exception as e:
+            data["error"] = str(e)
+        return data
+
+# ---------------- Main Backend Logic ---------------- #
+class HealthBackend:
+    """
+    This class combines Bluetooth retrieval and analysis.
+    The frontend/chatbot can call its methods to get updated data.
+    """
+
+    def __init__(self):
+        self.bt_manager = BluetoothManager()
+        self.ingest = None
+        self.hr_analytics = HeartRateAnalyticsHub()
+
+    async def scan_devices(self):
+        """Return list of scanned devices."""
+        return await self.bt_manager.scan_devices()
+
+    async def start_streaming(self, addresses):
+        """Keep connections to all `addresses` open and buffer their HR notifications.
+        A service already running for the same devices is reused; otherwise it is stopped first."""
+        if self.ingest is not None:
+            if set(self.ingest.devices) == set(addresses):
+                await self.ingest.start()
+                return self.ingest
+            await self.stop_streaming()
+        self.ingest = HeartRateIngestService(addresses)
+        self.ingest.listeners.append(self.hr_analytics.on_sample)
+        await self.ingest.start()
+        return self.ingest
+
+    async def stop_streaming(self):
+        """Stop the running service; returns its final stats, or None if nothing was streaming."""
+        ingest, self.ingest = self.ingest, None
+        if ingest is None:
+            return None
+        await ingest.stop()
+        return ingest.stats()
+
+    @timed("health_backend.retrieve_and_analyze")
+    async def retrieve_and_analyze(self, address):
+        """
+        Connects to a Bluetooth device, retrieves sensor data,
+        and performs full analysis. Returns JSON-compatible dict.
+        """
+        # prefer the streamed rolling/resting HR over a single reading
+        hr = self.hr_analytics.heart_rate_for_analysis(address)
+        if self.ingest is not None and address in self.ingest.devices:
+            stream = self.hr_analytics.device(address)
+            bt_data = {"heart_rate": stream.latest_hr, "device": address,
+                       "status": "streaming", "hr_stats": stream.summary()}
+        else:
+            bt_data = await self.bt_manager.connect_and_retrieve(address)
+        if hr is None:
+            hr = bt_data.get("heart_rate") or 70  # fallback HR
+        # Example placeholder values; can be replaced with real sensor metrics
+        analyzer = HealthAnalyzer(
+            sleep_hours=6.5,
+            deep_sleep=1.2,
+            rem_sleep=1.5,
+            heart_rate=hr,
+            screen_time=6,
+            pickups=40,
+            breaks=3,
+            meals={"calories": 1800, "protein": 60, "carbs": 220, "fat": 65},
+            nutrition_goals={"calories": 2000, "protein": 80, "carbs": 250, "fat": 70},
+            supplements=[]
+        )
+        analysis = analyzer.daily_summary()
+        return {
+            "bluetooth_data": bt_data,
+            "analysis": analysis
+        }
@@ -0,0 +1,173 @@
+import math
+import time
+
+import numpy as np
+
+from hr_parser import RR_RESOLUTION
+
+# ---------------- Rolling Heart Rate Analytics ---------------- #
+# Online HR / HRV statistics over sliding time windows in fixed memory.
+# Each window is a ring of time buckets holding running sums, so adding a
+# sample is O(1) and a query only touches the window's buckets. Windows are
+# bucket-aligned: a 5 min window with 60 buckets advances in 5 s steps.
+
+# name -> (span in seconds, number of buckets)
+DEFAULT_WINDOWS = {
+    "1min": (60, 60),
+    "5min": (300, 60),
+    "24h": (86400, 1440),
+}
+RESTING_WINDOW = "24h"
+RESTING_MIN_SAMPLES = 20   # HR samples a 1-minute bucket needs to count as "resting"
+RR_GAP_RESET = 5.0         # seconds without RR data before successive diffs restart
+
+
+class BucketWindow:
+    def __init__(self, span, buckets):
+        self.span = span
+        self.buckets = buckets
+        self.width = span / buckets
+        # plain lists: scalar updates on them are much cheaper than on
+        # NumPy arrays, and queries only walk `buckets` entries
+        self.ids = [-1] * buckets
+        self.hr_n = [0] * buckets
+        self.hr_sum = [0.0] * buckets
+        self.hr_min = [math.inf] * buckets
+        self.hr_max = [-math.inf] * buckets
+        self.rr_n = [0] * buckets
+        self.rr_sum = [0.0] * buckets
+        self.rr_sumsq = [0.0] * buckets
+        self.diff_n = [0] * buckets
+        self.diff_sumsq = [0.0] * buckets
+
+    def _slot(self, t):
+        b = int(t // self.width)
+        s = b % self.buckets
+        if self.ids[s] != b:
+            self.ids[s] = b
+            self.hr_n[s] = 0
+            self.hr_sum[s] = 0.0
+            self.hr_min[s] = math.inf
+            self.hr_max[s] = -math.inf
+            self.rr_n[s] = 0
+            self.rr_sum[s] = 0.0
+            self.rr_sumsq[s] = 0.0
+            self.diff_n[s] = 0
+            self.diff_sumsq[s] = 0.0
+        return s
+
+    def add(self, t, hr, rr_ms, diffs):
+        s = self._slot(t)
+        self.hr_n[s] += 1
+        self.hr_sum[s] += hr
+        if hr < self.hr_min[s]:
+            self.hr_min[s] = hr
+        if hr > self.hr_max[s]:
+            self.hr_max[s] = hr
+        for rr in rr_ms:
+            self.rr_n[s] += 1
+            self.rr_sum[s] += rr
+            self.rr_sumsq[s] += rr * rr
+        for d in diffs:
+            self.diff_n[s] += 1
+            self.diff_sumsq[s] += d * d
+
+    def live(self, now):
+        current = int(now // self.width)
+        return [s for s, b in enumerate(self.ids) if current - self.buckets < b <= current]
+
+    def stats(self, now):
+        live = self.live(now)
+        hr_n = sum(self.hr_n[s] for s in live)
+        rr_n = sum(self.rr_n[s] for s in live)
+        diff_n = sum(self.diff_n[s] for s in live)
+        out = {"samples": hr_n, "mean_hr": None, "min_hr": None, "max_hr": None,
+               "rr_count": rr_n, "sdnn_ms": None, "rmssd_ms": None}
+        if hr_n:
+            out["mean_hr"] = math.fsum(self.hr_sum[s] for s in live) / hr_n
+            out["min_hr"] = float(min(self.hr_min[s] for s in live))
+            out["max_hr"] = float(max(self.hr_max[s] for s in live))
+        if rr_n:
+            mean = math.fsum(self.rr_sum[s] for s in live) / rr_n
+            var = max(math.fsum(self.rr_sumsq[s] for s in live) / rr_n - mean * mean, 0.0)
+            out["sdnn_ms"] = math.sqrt(var)
+        if diff_n:
+            out["rmssd_ms"] = math.sqrt(math.fsum(self.diff_sumsq[s] for s in live) / diff_n)
+        return out
+
+    def bucket_means(self, now, min_samples=1):
+        live = [s for s in self.live(now) if self.hr_n[s] >= min_samples]
+        return np.array([self.hr_sum[s] / self.hr_n[s] for s in live])
+
+
+class HeartRateAnalytics:
+    """Rolling statistics for one device."""
+
+    def __init__(self, windows=None, clock=time.monotonic):
+        self.windows = {name: BucketWindow(span, n) for name, (span, n) in (windows or DEFAULT_WINDOWS).items()}
+        self.clock = clock
+        self.latest_hr = None
+        self._last_rr = None
+        self._last_rr_t = None
+
+    def add(self, t, hr, rr_intervals=()):
+        """Add one sample; `rr_intervals` are raw 1/1024 s ticks as sent by the sensor."""
+        rr_ms = [rr * 1000.0 / RR_RESOLUTION for rr in rr_intervals]
+        diffs = []
+        if rr_ms:
+            prev = self._last_rr
+            if prev is not None and t - self._last_rr_t > RR_GAP_RESET:
+                prev = None
+            for rr in rr_ms:
+                if prev is not None:
+                    diffs.append(rr - prev)
+                prev = rr
+            self._last_rr = prev
+            self._last_rr_t = t
+        for w in self.windows.values():
+            w.add(t, hr, rr_ms, diffs)
+        self.latest_hr = hr
+
+    def resting_hr(self, now=None):
+        """Lowest 1-minute-bucket mean HR over the resting window."""
+        w = self.windows.get(RESTING_WINDOW)
+        if w is None:
+            return None
+        means = w.bucket_means(self.clock() if now is None else now, RESTING_MIN_SAMPLES)
+        return float(means.min()) if means.size else None
+
+    def summary(self, now=None):
+        now = self.clock() if now is None else now
+        out = {name: w.stats(now) for name, w in self.windows.items()}
+        out["latest_hr"] = self.latest_hr
+        out["resting_hr"] = self.resting_hr(now)
+        return out
+
+
+class HeartRateAnalyticsHub:
+    """One HeartRateAnalytics per device; plugs into HeartRateIngestService.listeners."""
+
+    def __init__(self, windows=None, clock=time.monotonic):
+        self.windows = windows
+        self.clock = clock
+        self.devices = {}
+
+    def device(self, address):
+        if address not in self.devices:
+            self.devices[address] = HeartRateAnalytics(self.windows, self.clock)
+        return self.devices[address]
+
+    def on_sample(self, address, t, measurement):
+        self.device(address).add(t, measurement.heart_rate, measurement.rr_intervals)
+
+    def heart_rate_for_analysis(self, address, now=None):
+        """Value to feed HealthAnalyzer: resting HR, else the 5 min mean, else the latest sample."""
+        a = self.devices.get(address)
+        if a is None:
+            return None
+        s = a.summary(now)
+        if s["resting_hr"] is not None:
+            return s["resting_hr"]
+        if "5min" in s and s["5min"]["mean_hr"] is not None:
+            return s["5min"]["mean_hr"]
+        return a.latest_hr
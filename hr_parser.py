@@ -0,0 +1,146 @@
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+# ---------------- Heart Rate Measurement (0x2A37) ---------------- #
+# Layout (little endian):
+#   flags        uint8
+#   heart rate   uint8, or uint16 when flags bit 0 is set
+#   energy exp.  uint16 kJ, present when flags bit 3 is set
+#   RR intervals uint16 each (1/1024 s), present when flags bit 4 is set;
+#                they fill the rest of the packet
+# Flags bits 1-2 are the sensor contact status: bit 2 = feature supported,
+# bit 1 = contact detected.
+
+FLAG_HR_UINT16 = 0x01
+FLAG_CONTACT_DETECTED = 0x02
+FLAG_CONTACT_SUPPORTED = 0x04
+FLAG_ENERGY_EXPENDED = 0x08
+FLAG_RR_INTERVALS = 0x10
+
+RR_RESOLUTION = 1024.0  # RR ticks per second
+
+_U16 = struct.Struct("<H")
+
+# sensor_contact is None when the sensor does not report it;
+# rr_intervals are raw 1/1024 s ticks.
+HeartRateMeasurement = namedtuple(
+    "HeartRateMeasurement", "heart_rate sensor_contact energy_expended rr_intervals")
+
+# Batch result. Missing values: sensor_contact -1, energy_expended -1.
+# RR intervals of packet i are rr[rr_offsets[i]:rr_offsets[i + 1]].
+HeartRateBatch = namedtuple(
+    "HeartRateBatch", "heart_rate sensor_contact energy_expended rr rr_offsets")
+
+
+def parse_hr_measurement(data):
+    """Decode one packet from bytes / bytearray / memoryview without copying it."""
+    buf = memoryview(data)
+    size = len(buf)
+    if size < 2:
+        raise ValueError("heart rate packet too short")
+    flags = buf[0]
+    offset = 1
+    if flags & FLAG_HR_UINT16:
+        if size < 3:
+            raise ValueError("heart rate packet too short")
+        hr = _U16.unpack_from(buf, offset)[0]
+        offset += 2
+    else:
+        hr = buf[offset]
+        offset += 1
+
+    contact = bool(flags & FLAG_CONTACT_DETECTED) if flags & FLAG_CONTACT_SUPPORTED else None
+
+    energy = None
+    if flags & FLAG_ENERGY_EXPENDED:
+        if size < offset + 2:
+            raise ValueError("heart rate packet truncated before energy expended")
+        energy = _U16.unpack_from(buf, offset)[0]
+        offset += 2
+
+    rr = ()
+    if flags & FLAG_RR_INTERVALS:
+        rr = struct.unpack_from(f"<{(size - offset) // 2}H", buf, offset)
+    return HeartRateMeasurement(hr, contact, energy, rr)
+
+
+def build_hr_measurement(heart_rate, sensor_contact=None, energy_expended=None,
+                         rr_intervals=(), force_uint16=False):
+    """Encode a packet; the inverse of parse_hr_measurement."""
+    flags = 0
+    body = bytearray()
+    if force_uint16 or heart_rate > 0xFF:
+        flags |= FLAG_HR_UINT16
+        body += _U16.pack(heart_rate)
+    else:
+        body.append(heart_rate)
+    if sensor_contact is not None:
+        flags |= FLAG_CONTACT_SUPPORTED
+        if sensor_contact:
+            flags |= FLAG_CONTACT_DETECTED
+    if energy_expended is not None:
+        flags |= FLAG_ENERGY_EXPENDED
+        body += _U16.pack(energy_expended)
+    if rr_intervals:
+        flags |= FLAG_RR_INTERVALS
+        body += struct.pack(f"<{len(rr_intervals)}H", *rr_intervals)
+    return bytes([flags]) + bytes(body)
+
+
+def pack_packets(packets):
+    """Concatenate packets into one buffer plus an offsets array (len n + 1)."""
+    packets = list(packets)
+    offsets = np.zeros(len(packets) + 1, dtype=np.int64)
+    np.cumsum([len(p) for p in packets], out=offsets[1:])
+    return b"".join(packets), offsets
+
+
+def _u16_at(arr, idx):
+    return arr[idx].astype(np.uint16) | (arr[idx + 1].astype(np.uint16) << 8)
+
+
+def parse_hr_batch(buffer, offsets):
+    """Decode many packets stored back to back in `buffer`.
+
+    `offsets[i]:offsets[i + 1]` is packet i. The buffer is viewed, not copied.
+    """
+    arr = np.frombuffer(buffer, dtype=np.uint8)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    starts, ends = offsets[:-1], offsets[1:]
+    n = len(starts)
+    if n == 0:
+        empty = np.zeros(0, dtype=np.uint16)
+        return HeartRateBatch(empty, np.zeros(0, np.int8), np.zeros(0, np.int32), empty,
+                              np.zeros(1, np.int64))
+
+    if np.any(ends - starts < 2):
+        raise ValueError("truncated heart rate packet in batch")
+    flags = arr[starts]
+    wide = (flags & FLAG_HR_UINT16) != 0
+    has_ee = (flags & FLAG_ENERGY_EXPENDED) != 0
+    has_rr = (flags & FLAG_RR_INTERVALS) != 0
+    hr_end = starts + 2 + wide
+    rr_start = hr_end + 2 * has_ee
+    if np.any(rr_start > ends):
+        raise ValueError("truncated heart rate packet in batch")
+
+    # clamp indices so the unused branch of np.where never reads out of range
+    last = len(arr) - 1
+    hr = np.where(wide, _u16_at(arr, np.minimum(starts + 1, last - 1)), arr[starts + 1])
+    energy = np.where(has_ee, _u16_at(arr, np.minimum(hr_end, last - 1)).astype(np.int32), -1)
+    contact = np.where((flags & FLAG_CONTACT_SUPPORTED) != 0,
+                       ((flags & FLAG_CONTACT_DETECTED) != 0).astype(np.int8), -1).astype(np.int8)
+
+    rr_counts = np.where(has_rr, (ends - rr_start) // 2, 0)
+    rr_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(rr_counts, out=rr_offsets[1:])
+    packet = np.repeat(np.arange(n), rr_counts)
+    within = np.arange(rr_offsets[-1]) - rr_offsets[packet]
+    rr = _u16_at(arr, rr_start[packet] + 2 * within)
+    return HeartRateBatch(hr.astype(np.uint16), contact, energy, rr, rr_offsets)
+
+
+def rr_seconds(rr):
+    return np.asarray(rr, dtype=np.float64) / RR_RESOLUTION
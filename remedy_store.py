@@ -0,0 +1,77 @@
+import json
+import os
+
+import pandas as pd
+
+# ---------------- Learned Remedy Store ---------------- #
+# The chatbot's knowledge base is a CSV plus an append-only journal
+# (<csv>.journal, one JSON row per line). Learning a remedy appends one
+# fsync'd journal line and one in-memory row; every `compact_every` rows the
+# table is rewritten to a temp file and atomically renamed over the CSV.
+# Journal lines carry the row number they create, so replaying after a crash
+# between the rename and the journal reset never duplicates rows.
+
+COMPACT_EVERY = 50
+
+
+class RemedyStore:
+    def __init__(self, csv_path, required_columns, compact_every=COMPACT_EVERY):
+        self.csv_path = csv_path
+        self.journal_path = csv_path + ".journal"
+        self.compact_every = compact_every
+        if os.path.exists(csv_path):
+            self.df = pd.read_csv(csv_path)
+        else:
+            self.df = pd.DataFrame(columns=required_columns)
+        for col in required_columns:
+            if col not in self.df.columns:
+                self.df[col] = ""
+        self.pending, torn = self._replay()
+        # a torn journal tail must not have new lines appended after it
+        if torn or not os.path.exists(csv_path):
+            self.compact()
+
+    def _replay(self):
+        applied = 0
+        if not os.path.exists(self.journal_path):
+            return applied, False
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    return applied, True  # crash mid-write
+                if entry["seq"] >= len(self.df):
+                    self._add_row(entry["row"])
+                    applied += 1
+        return applied, False
+
+    def _add_row(self, row):
+        for col in row:
+            if col not in self.df.columns:
+                self.df[col] = ""
+        self.df.loc[len(self.df)] = [row.get(c, "") for c in self.df.columns]
+
+    def append(self, row):
+        """Persist one learned row and add it to `df` in place; returns its row number."""
+        seq = len(self.df)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"seq": seq, "row": row}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._add_row(row)
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.compact()
+        return seq
+
+    def compact(self):
+        tmp = self.csv_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            self.df.to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.csv_path)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.pending = 0
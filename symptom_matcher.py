@@ -0,0 +1,151 @@
+import heapq
+import math
+import os
+import sys
+from collections import defaultdict
+
+from thefuzz import process
+
+# the shared text helpers live with the app modules in NutritionAnalyzerApp/
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "NutritionAnalyzerApp")
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
+
+from text_index import tokens, trigrams  # noqa: E402
+
+# ---------------- Symptom Matcher ---------------- #
+# Built once from the known conditions and extended in place when the bot
+# learns a new one. Spelling corrections are cached per token, and full
+# fuzzy scoring (thefuzz WRatio, as before) only runs on the conditions that
+# share a token, or a near-spelling of one, with the input. WRatio can still
+# rate an unblocked condition highly, so a best score close to the threshold
+# is confirmed with a full scan; that keeps lookup() deciding exactly as the
+# old linear extractOne did.
+
+MATCH_THRESHOLD = 70
+SHORTLIST_SIZE = None    # cap on scored candidates (best overlap first); None scores every blocked one
+# Best blocked scores up to threshold + this are checked against every condition.
+# WRatio gives 85.5 (shown as 86) to any condition sharing a single word with a
+# text of quite different length, so ties at 86 are common and may sit in rows
+# that were only reachable through a too-common word.
+FULL_SCAN_MARGIN = 16
+TOKEN_SIMILARITY = 0.5   # trigram Dice needed for a vocabulary token to count as a near-spelling
+COMMON_TOKEN_SHARE = 0.2  # tokens in more than this share of conditions are too common to block on
+
+class SymptomMatcher:
+    def __init__(self, conditions=(), spell=None, shortlist=SHORTLIST_SIZE):
+        self.spell = spell
+        self.shortlist = shortlist
+        self.conditions = []
+        self.choices = {}                     # condition id -> condition, for extractOne
+        self.postings = defaultdict(set)      # token -> condition ids
+        self.vocab_grams = defaultdict(set)   # trigram -> tokens
+        self.vocab_gram_count = {}            # token -> number of its trigrams
+        self._corrections = {}
+        self._similar = {}
+        for c in conditions:
+            self.add(c)
+        # resolve the conditions' own words now rather than on the first messages
+        self.correct(" ".join(self.postings))
+
+    def add(self, condition):
+        """Index one more condition; returns its id (its row position)."""
+        cid = len(self.conditions)
+        self.conditions.append(str(condition))
+        self.choices[cid] = self.conditions[cid]
+        for tok in set(tokens(str(condition))):
+            if tok not in self.postings:
+                grams = trigrams(tok)
+                for g in grams:
+                    self.vocab_grams[g].add(tok)
+                self.vocab_gram_count[tok] = len(grams)
+                self._similar.clear()
+            self.postings[tok].add(cid)
+        return cid
+
+    def correct(self, text):
+        """Same result as correcting word by word with the spell checker, cached per word."""
+        out = []
+        for word in text.split():
+            fixed = self._corrections.get(word)
+            if fixed is None:
+                fixed = word
+                if self.spell is not None and word not in self.spell:
+                    fixed = self.spell.correction(word) or word
+                self._corrections[word] = fixed
+            out.append(fixed)
+        return " ".join(out)
+
+    def _similar_tokens(self, token):
+        """Vocabulary tokens spelled like `token`, with their trigram Dice similarity."""
+        hit = self._similar.get(token)
+        if hit is not None:
+            return hit
+        grams = trigrams(token)
+        counts = defaultdict(int)
+        for g in grams:
+            for tok in self.vocab_grams.get(g, ()):
+                counts[tok] += 1
+        hit = []
+        for tok, n in counts.items():
+            sim = 2.0 * n / (len(grams) + self.vocab_gram_count[tok])
+            if sim >= TOKEN_SIMILARITY:
+                hit.append((tok, sim))
+        self._similar[token] = hit
+        return hit
+
+    def candidates(self, text):
+        """Blocked condition ids, best token overlap first (at most `shortlist` of them)."""
+        n = max(len(self.conditions), 1)
+        limit = COMMON_TOKEN_SHARE * n
+        query = set(tokens(text))
+        scores = defaultdict(float)
+        common = []
+        for q in query:
+            for tok, sim in self._similar_tokens(q):
+                ids = self.postings[tok]
+                weight = (math.log(n / len(ids)) + 1.0) * sim
+                if len(ids) > limit:
+                    common.append((ids, weight))
+                    continue
+                for cid in ids:
+                    scores[cid] += weight
+        if scores:
+            # common words only break ties between already-blocked candidates
+            for ids, weight in common:
+                for cid in scores:
+                    if cid in ids:
+                        scores[cid] += weight
+        else:
+            # only very common words matched: block on those after all
+            for ids, weight in common:
+                for cid in ids:
+                    scores[cid] += weight
+        if self.shortlist is None:
+            return sorted(scores, key=scores.get, reverse=True)
+        return heapq.nlargest(self.shortlist, scores, key=scores.get)
+
+    def match(self, text):
+        """Best (condition id, condition, score) among the blocked candidates, or None."""
+        ids = self.candidates(text)
+        if not ids:
+            return None
+        # row order, so equal scores resolve to the earlier row as a linear scan does
+        choices = {cid: self.conditions[cid] for cid in sorted(ids)}
+        best = process.extractOne(text, choices)
+        if best is None:
+            return None
+        condition, score, cid = best
+        return cid, condition, score
+
+    def lookup(self, text, threshold=MATCH_THRESHOLD):
+        """Best (condition id, condition, score) scoring above `threshold`, or None."""
+        hit = self.match(text)
+        if hit is None or hit[2] <= threshold + FULL_SCAN_MARGIN:
+            # scores are rounded; an unrounded score r - 0.5 still rounds to r
+            cutoff = max(hit[2] if hit else 0, threshold + 1) - 0.5
+            best = process.extractOne(text, self.choices, score_cutoff=cutoff)
+            hit = None if best is None else (best[2], best[0], best[1])
+        if hit is None or hit[2] <= threshold:
+            return None
+        return hit
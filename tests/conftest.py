@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Tests run from the repository root (python -m pytest). As in benchmarks/,
+# the app modules import each other by plain module name, so put both the
+# root and NutritionAnalyzerApp/ on the path.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT, "NutritionAnalyzerApp")
+for _p in (APP_DIR, ROOT):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
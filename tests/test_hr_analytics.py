@@ -0,0 +1,81 @@
+import pytest
+
+from benchmarks.bench_hr_analytics import reference, synthetic_stream
+from hr_analytics import DEFAULT_WINDOWS, RR_GAP_RESET, HeartRateAnalytics, HeartRateAnalyticsHub
+from hr_parser import RR_RESOLUTION
+
+KEYS = ("mean_hr", "min_hr", "max_hr", "sdnn_ms", "rmssd_ms")
+SMALL = {"10s": (10, 10)}
+
+
+def ticks(ms):
+    return round(ms * RR_RESOLUTION / 1000.0)
+
+
+@pytest.mark.parametrize("cut", [0.1, 0.5, 1.0])
+def test_matches_numpy_reference(cut):
+    t, hr, rr = synthetic_stream(26)
+    n = int(len(t) * cut)
+    t, hr, rr = t[:n], hr[:n], rr[:n]
+    engine = HeartRateAnalytics()
+    for ti, h, r in zip(t.tolist(), hr.tolist(), rr):
+        engine.add(ti, h, r)
+    now = float(t[-1])
+    summary = engine.summary(now)
+    for name, (span, buckets) in DEFAULT_WINDOWS.items():
+        ref = reference(t, hr, rr, now, span, buckets)
+        for key in KEYS:
+            assert summary[name][key] == pytest.approx(float(ref[key]), abs=1e-6), (name, key)
+
+
+def test_window_boundary_eviction():
+    a = HeartRateAnalytics(SMALL)
+    a.add(0.5, 60)
+    a.add(5.5, 80)
+    assert a.summary(9.99)["10s"]["samples"] == 2
+    # the 0-1 s bucket leaves the window once the clock reaches 10 s
+    s = a.summary(10.0)["10s"]
+    assert (s["samples"], s["mean_hr"], s["min_hr"], s["max_hr"]) == (1, 80.0, 80.0, 80.0)
+    assert a.summary(15.99)["10s"]["samples"] == 0
+
+
+def test_reused_bucket_drops_old_sums():
+    a = HeartRateAnalytics(SMALL)
+    a.add(0.5, 200, (ticks(500),))
+    a.add(10.5, 60, (ticks(1000),))   # same ring slot, one lap later
+    s = a.summary(10.5)["10s"]
+    assert (s["samples"], s["mean_hr"], s["max_hr"], s["rr_count"]) == (1, 60.0, 60.0, 1)
+
+
+def test_empty_window():
+    a = HeartRateAnalytics(SMALL)
+    s = a.summary(100.0)
+    assert s["10s"] == {"samples": 0, "mean_hr": None, "min_hr": None, "max_hr": None,
+                        "rr_count": 0, "sdnn_ms": None, "rmssd_ms": None}
+    assert s["latest_hr"] is None and s["resting_hr"] is None
+
+
+def test_single_sample():
+    a = HeartRateAnalytics(SMALL)
+    a.add(3.0, 72, (ticks(800),))
+    s = a.summary(3.0)["10s"]
+    assert (s["samples"], s["mean_hr"], s["min_hr"], s["max_hr"]) == (1, 72.0, 72.0, 72.0)
+    assert s["rr_count"] == 1
+    assert s["sdnn_ms"] == pytest.approx(0.0)
+    assert s["rmssd_ms"] is None
+
+
+def test_rr_diffs_restart_after_gap():
+    a = HeartRateAnalytics(SMALL)
+    a.add(1.0, 60, (ticks(1000),))
+    a.add(1.0 + RR_GAP_RESET + 1, 60, (ticks(500),))
+    assert a.summary(7.0)["10s"]["rmssd_ms"] is None
+    a.add(8.0, 60, (ticks(600),))
+    assert a.summary(8.0)["10s"]["rmssd_ms"] == pytest.approx(100.0, abs=1.0)
+
+
+def test_hub_falls_back_to_latest_hr():
+    hub = HeartRateAnalyticsHub(SMALL, clock=lambda: 1.0)
+    assert hub.heart_rate_for_analysis("aa") is None
+    hub.device("aa").add(0.5, 70)
+    assert hub.heart_rate_for_analysis("aa") == 70
@@ -0,0 +1,125 @@
+import random
+
+import numpy as np
+import pytest
+
+from hr_parser import (FLAG_CONTACT_DETECTED, FLAG_CONTACT_SUPPORTED, FLAG_ENERGY_EXPENDED, FLAG_HR_UINT16,
+                       FLAG_RR_INTERVALS, build_hr_measurement, pack_packets, parse_hr_batch,
+                       parse_hr_measurement)
+
+
+def batch_rows(batch):
+    """The batch result as per-packet tuples shaped like parse_hr_measurement's."""
+    rows = []
+    for i in range(len(batch.heart_rate)):
+        contact = int(batch.sensor_contact[i])
+        energy = int(batch.energy_expended[i])
+        rr = tuple(batch.rr[batch.rr_offsets[i]:batch.rr_offsets[i + 1]].tolist())
+        rows.append((int(batch.heart_rate[i]), None if contact < 0 else bool(contact),
+                     None if energy < 0 else energy, rr))
+    return rows
+
+
+def test_uint8_heart_rate():
+    packet = build_hr_measurement(72)
+    assert packet == bytes([0x00, 72])
+    assert tuple(parse_hr_measurement(packet)) == (72, None, None, ())
+
+
+def test_uint16_heart_rate():
+    packet = build_hr_measurement(300)
+    assert packet[0] & FLAG_HR_UINT16
+    assert parse_hr_measurement(packet).heart_rate == 300
+    # a small value may still be sent in the wide format
+    forced = build_hr_measurement(60, force_uint16=True)
+    assert forced == bytes([FLAG_HR_UINT16, 60, 0])
+    assert parse_hr_measurement(forced).heart_rate == 60
+
+
+def test_energy_expended():
+    packet = build_hr_measurement(80, energy_expended=0x1234)
+    assert packet == bytes([FLAG_ENERGY_EXPENDED, 80, 0x34, 0x12])
+    assert parse_hr_measurement(packet).energy_expended == 0x1234
+    assert parse_hr_measurement(build_hr_measurement(300, energy_expended=7)).energy_expended == 7
+
+
+def test_multiple_rr_intervals():
+    rr = (800, 1024, 65535, 1)
+    packet = build_hr_measurement(64, energy_expended=5, rr_intervals=rr)
+    m = parse_hr_measurement(packet)
+    assert m.rr_intervals == rr
+    assert m.energy_expended == 5
+    # a trailing odd byte is not half an interval
+    assert parse_hr_measurement(packet + b"\x07").rr_intervals == rr
+
+
+@pytest.mark.parametrize("contact, flags", [
+    (None, 0),
+    (False, FLAG_CONTACT_SUPPORTED),
+    (True, FLAG_CONTACT_SUPPORTED | FLAG_CONTACT_DETECTED),
+])
+def test_sensor_contact(contact, flags):
+    packet = build_hr_measurement(70, sensor_contact=contact)
+    assert packet[0] == flags
+    assert parse_hr_measurement(packet).sensor_contact is contact
+
+
+def test_contact_detected_without_support_is_unknown():
+    assert parse_hr_measurement(bytes([FLAG_CONTACT_DETECTED, 70])).sensor_contact is None
+
+
+@pytest.mark.parametrize("packet", [
+    b"",
+    bytes([0x00]),
+    bytes([FLAG_HR_UINT16, 0x2C]),
+    bytes([FLAG_ENERGY_EXPENDED, 70, 0x01]),
+    bytes([FLAG_HR_UINT16 | FLAG_ENERGY_EXPENDED, 0x2C, 0x01, 0x01]),
+])
+def test_truncated_packets(packet):
+    with pytest.raises(ValueError):
+        parse_hr_measurement(packet)
+    with pytest.raises(ValueError):
+        parse_hr_batch(*pack_packets([build_hr_measurement(70), packet]))
+
+
+def test_rr_flag_with_no_intervals():
+    assert parse_hr_measurement(bytes([FLAG_RR_INTERVALS, 70])).rr_intervals == ()
+
+
+def test_parses_memoryview_and_bytearray():
+    packet = build_hr_measurement(90, rr_intervals=(900,))
+    assert parse_hr_measurement(memoryview(packet)) == parse_hr_measurement(bytearray(packet))
+
+
+def random_fields(n, seed):
+    rng = random.Random(seed)
+    return [dict(
+        heart_rate=rng.randint(30, 300),
+        sensor_contact=rng.choice([None, True, False]),
+        energy_expended=rng.choice([None, rng.randint(0, 65535)]),
+        rr_intervals=tuple(rng.randint(300, 2000) for _ in range(rng.choice([0, 0, 1, 2, 4]))),
+        force_uint16=rng.random() < 0.2,
+    ) for _ in range(n)]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_round_trip_and_batch_match_single(seed):
+    fields = random_fields(2000, seed)
+    packets = [build_hr_measurement(**f) for f in fields]
+    single = [tuple(parse_hr_measurement(p)) for p in packets]
+    assert single == [(f["heart_rate"], f["sensor_contact"], f["energy_expended"], f["rr_intervals"])
+                      for f in fields]
+    assert batch_rows(parse_hr_batch(*pack_packets(packets))) == single
+
+
+def test_empty_batch():
+    batch = parse_hr_batch(*pack_packets([]))
+    assert len(batch.heart_rate) == 0 and len(batch.rr) == 0
+    assert batch.rr_offsets.tolist() == [0]
+
+
+def test_batch_views_buffer():
+    buffer, offsets = pack_packets([build_hr_measurement(70, rr_intervals=(1000, 1001))])
+    batch = parse_hr_batch(bytearray(buffer), offsets)
+    assert batch.rr.dtype == np.uint16
+    assert batch_rows(batch) == [(70, None, None, (1000, 1001))]
@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+import pytest
+
+from log_store import LogStore
+
+TODAY = date(2026, 3, 10)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LogStore(str(tmp_path / "logs.sqlite"))
+    yield store
+    store.close()
+
+
+def _log(store, *offsets):
+    store.append("food_log", [{"Date": (TODAY + timedelta(days=o)).isoformat(), "Calories": 100.0}
+                              for o in offsets])
+
+
+def test_streak_ends_today_or_yesterday(store):
+    _log(store, -2, -1, 0)
+    assert store.streak("food_log", today=TODAY) == (3, 3)
+    assert store.streak("food_log", today=TODAY + timedelta(days=1)) == (3, 3)
+    assert store.streak("food_log", today=TODAY + timedelta(days=2)) == (0, 3)
+
+
+def test_future_entry_keeps_current_streak(store):
+    _log(store, -2, -1, 0, 2)
+    assert store.streak("food_log", today=TODAY) == (3, 3)
+    # a future entry that joins the run still only counts up to today
+    _log(store, 1)
+    assert store.streak("food_log", today=TODAY) == (3, 5)
+
+
+def test_streak_with_only_future_entries(store):
+    _log(store, 3, 4)
+    assert store.streak("food_log", today=TODAY) == (0, 2)
+    assert store.streak("water_log", today=TODAY) == (0, 0)
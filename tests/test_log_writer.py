@@ -0,0 +1,119 @@
+import multiprocessing as mp
+import threading
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+
+from log_store import LogStore
+
+THREADS = 8
+PROCESSES = 3
+ROWS_PER_WRITER = 60
+START = date(2026, 1, 1)
+
+
+def _rows(writer, n):
+    """A writer's rows: food most days, water and exercise on fewer, with
+    days in a scrambled order so bitmap origins move back mid-run."""
+    w = int(writer[1:]) + (100 if writer[0] == "p" else 0)
+    for i in range(n):
+        day = (START + timedelta(days=(i * 7 + w * 3) % 40)).isoformat()
+        if i % 5 == 4:
+            yield "exercise_log", {"Date": day, "Writer": writer, "Seq": i, "Calories Burnt": 10.0 + w}
+        elif i % 3 == 2:
+            yield "water_log", {"Date": day, "Writer": writer, "Seq": i, "Effective_Hydration_ml": 250.0}
+        else:
+            yield "food_log", {"Date": day, "Writer": writer, "Seq": i,
+                               "Calories": 1.0 + w, "Protein": 0.5, "Carbs": 0.25, "Fats": 0.125}
+
+
+def _write(path, writer, n, store=None):
+    # threads share one store (and its group commit); processes open their own
+    own = store is None
+    if own:
+        store = LogStore(path)
+    for kind, row in _rows(writer, n):
+        store.append(kind, row)
+    if own:
+        store.close()
+
+
+def _naive_runs(days):
+    """(run ending at the latest day, longest run) of a set of dates."""
+    longest = run = 0
+    prev = None
+    for d in sorted(days):
+        run = run + 1 if prev is not None and (d - prev).days == 1 else 1
+        longest = max(longest, run)
+        prev = d
+    return run, longest
+
+
+@pytest.fixture
+def stressed(tmp_path):
+    path = str(tmp_path / "logs.sqlite")
+    store = LogStore(path)
+    writers = [f"t{i}" for i in range(THREADS)] + [f"p{i}" for i in range(PROCESSES)]
+    ctx = mp.get_context("spawn")
+    procs = [ctx.Process(target=_write, args=(path, w, ROWS_PER_WRITER)) for w in writers[THREADS:]]
+    for p in procs:
+        p.start()
+    pool = [threading.Thread(target=_write, args=(path, w, ROWS_PER_WRITER, store)) for w in writers[:THREADS]]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    for p in procs:
+        p.join(120)
+        assert p.exitcode == 0
+    expected = defaultdict(list)
+    for w in writers:
+        for kind, row in _rows(w, ROWS_PER_WRITER):
+            expected[kind].append(row)
+    yield store, expected
+    store.close()
+
+
+def test_concurrent_appends(stressed):
+    store, expected = stressed
+    history = {kind: store.history(kind) for kind in expected}
+
+    # every row exactly once, intact
+    for kind, rows in expected.items():
+        df = history[kind]
+        assert store.count(kind) == len(rows) == len(df)
+        got = sorted(zip(df["Writer"], df["Seq"], df["Date"]))
+        assert got == sorted((r["Writer"], r["Seq"], r["Date"]) for r in rows)
+
+    # daily_totals against a recompute from the stored rows
+    naive = defaultdict(lambda: defaultdict(float))
+    for df, fields in ((history["food_log"], {"Calories": "eaten", "Protein": "protein", "Carbs": "carbs",
+                                              "Fats": "fats"}),
+                       (history["exercise_log"], {"Calories Burnt": "burnt"}),
+                       (history["water_log"], {"Effective_Hydration_ml": "hydration"})):
+        for col, total in fields.items():
+            for day, value in df.groupby("Date")[col].sum().items():
+                naive[day][total] += value
+    daily = store.daily().set_index("day")
+    assert sorted(daily.index) == sorted(naive)
+    for day, sums in naive.items():
+        for total, value in sums.items():
+            assert daily.loc[day, total] == pytest.approx(value)
+    rebuilt = store.daily()
+    store.rebuild_totals()
+    assert store.daily().equals(rebuilt)
+
+    # day bitmaps against the distinct logged days
+    conn = store._connect()
+    for kind in ("food_log", "water_log", "exercise_log"):
+        days = {date.fromisoformat(d) for d in history[kind]["Date"]}
+        origin, bits, last_run, longest = store._bitmap(conn, kind)
+        assert origin == min(days)
+        assert bits == sum(1 << (d - origin).days for d in days)
+        assert (last_run, longest) == _naive_runs(days)
+        assert store.streak(kind, today=max(days)) == _naive_runs(days)
+    first, counts = store.activity()
+    assert first == START
+    assert counts.sum() == sum(len(set(history[k]["Date"])) for k in ("food_log", "water_log", "exercise_log"))
+
@@ -0,0 +1,70 @@
+import os
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from meal_planner import (CALORIE_TOLERANCE, MACRO_TOLERANCE, MAX_REPEATS, MealPlanner, day_targets, load_meals,
+                          unreachable)
+from new_backend import compute_profile
+
+MEALS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "meals_dataset.csv")
+PEOPLE = [("Male", 80, 180, "Very Active"), ("Male", 70, 172, "Lightly Active"),
+          ("Female", 55, 160, "Sedentary (Office)"), ("Female", 68, 168, "Moderately Active")]
+TOLERANCE = np.array([CALORIE_TOLERANCE] + [MACRO_TOLERANCE] * 3)
+
+
+@pytest.fixture(scope="module")
+def planner():
+    return MealPlanner(load_meals(MEALS))
+
+
+def targets_for(person, goal):
+    gender, weight, height, activity = person
+    return day_targets(compute_profile("test", 30, gender, height, weight, activity, goal, 2500))
+
+
+def within(plan, targets):
+    totals = np.array([[d["totals"][k] for k in ("calories", "protein_g", "carbs_g", "fat_g")] for d in plan["days"]])
+    # totals are rounded to 0.1 in the plan
+    return (np.abs(totals - targets) <= TOLERANCE * targets + 0.05).all(axis=1)
+
+
+@pytest.mark.parametrize("person", PEOPLE)
+@pytest.mark.parametrize("exclude", [(), ("street-food", "dessert")])
+def test_feasible_week_meets_every_day(planner, person, exclude):
+    targets = targets_for(person, "Maintain")
+    plan = planner.solve(targets, exclude=exclude)
+    assert all(plan["met"])
+    assert within(plan, targets).all()
+    assert plan["notes"] == []
+
+
+def test_variety_limits(planner):
+    plan = planner.solve(targets_for(PEOPLE[0], "Maintain"))
+    uses = Counter(m["meal"] for d in plan["days"] for m in d["meals"].values())
+    assert max(uses.values()) <= MAX_REPEATS
+    for d in plan["days"]:
+        names = [m["meal"] for m in d["meals"].values()]
+        assert len(names) == len(set(names)) == 4
+
+
+def test_unreachable_protein_is_explained(planner):
+    # no mix of these meals gets 40% of energy from protein
+    targets = targets_for(PEOPLE[0], "Weight Loss")
+    plan = planner.solve(targets)
+    assert all(plan["calories_met"])
+    assert not any(plan["met"])
+    assert any(n.startswith("Protein") and "closest these meals get" in n for n in plan["notes"])
+
+
+def test_unreachable():
+    # day sums: (2, 0.6), (4, 0.4), (4, 0.8), (6, 0.6)
+    slots = [np.array([[1.0, 0.1], [3.0, 0.3]]), np.array([[1.0, 0.5], [3.0, 0.3]])]
+    assert not unreachable(slots, np.array([3.5, 0.7]), np.array([4.5, 0.9]), (0, 1))
+    # each bound alone is within reach, but not both: past 4.6 kcal the most
+    # protein any mix gets is below 0.75
+    lo, hi = np.array([4.6, 0.75]), np.array([5.5, 0.85])
+    assert not unreachable(slots, lo, hi, (0,))
+    assert not unreachable(slots, lo, hi, (1,))
+    assert unreachable(slots, lo, hi, (0, 1))
@@ -0,0 +1,69 @@
+import threading
+
+import user_store
+from user_store import UserStore
+
+
+def test_eviction_closes_idle_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(user_store, "MAX_OPEN_STORES", 2)
+    users = UserStore(str(tmp_path))
+    a = users.log_store("a")
+    a.append("water_log", {"Date": "2024-01-01", "Effective_Hydration_ml": 250})
+    assert a._conns
+    users.log_store("b")
+    users.log_store("c")
+    assert not a._conns          # closed on eviction
+    assert users.log_store("a") is not a
+
+
+def test_eviction_waits_for_release_while_another_thread_reads(tmp_path, monkeypatch):
+    monkeypatch.setattr(user_store, "MAX_OPEN_STORES", 2)
+    users = UserStore(str(tmp_path))
+    with users.checkout("a") as store:
+        store.append("water_log", {"Date": "2024-01-01", "Effective_Hydration_ml": 250})
+
+    reading, stop = threading.Event(), threading.Event()
+    errors, reads = [], []
+
+    def reader():
+        try:
+            with users.checkout("a", create=False) as held:
+                while not stop.is_set():
+                    reads.append(held.totals("2024-01-01")["hydration"])
+                    reading.set()
+        except Exception as e:  # the failure this test is about: "Cannot operate on a closed database"
+            errors.append(e)
+        finally:
+            reading.set()
+
+    t = threading.Thread(target=reader)
+    t.start()
+    reading.wait(5)
+    held = users._stores["a"]
+    for user_id in ("b", "c", "d", "e"):
+        with users.checkout(user_id) as other:
+            other.append("water_log", {"Date": "2024-01-01", "Effective_Hydration_ml": 100})
+    assert "a" not in users._stores      # evicted from the LRU...
+    n = len(reads)
+    while len(reads) < n + 20 and t.is_alive():
+        pass
+    assert held._conns                    # ...but still open for its reader
+    stop.set()
+    t.join(5)
+
+    assert not errors
+    assert set(reads) == {250.0}
+    assert not held._conns                # closed by the reader's release
+    assert not users._holds and not users._retired
+    with users.checkout("a", create=False) as store:
+        assert store is not held and store.totals("2024-01-01")["hydration"] == 250.0
+
+
+def test_delete_user_while_held(tmp_path):
+    users = UserStore(str(tmp_path))
+    with users.checkout("a") as store:
+        store.append("water_log", {"Date": "2024-01-01", "Effective_Hydration_ml": 250})
+        users.delete_user("a")
+        assert store._conns
+    assert not store._conns
+    assert users.log_store("a", create=False) is None